@@ -0,0 +1,3 @@
+from .outbox import AlertOutbox
+from .detection_store import DetectionStore, write_json_atomic
+from .watchlist_index import WatchListIndex, normalize_plate, edit_distance
@@ -0,0 +1,86 @@
+#Import All the Required Libraries
+import json
+import os
+import sqlite3
+import threading
+import time
+
+class DetectionStore:
+    """Append-only SQLite log of detection records
+
+    Every change (new detection, status update, removal) is one INSERT, so the cost of
+    persisting an alert does not grow with the detection history. The current view
+    is the latest row per plate.
+    """
+    def __init__(self, db_path="detection_history.db"):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS detection_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                plate TEXT NOT NULL,
+                op TEXT NOT NULL,
+                recorded_at REAL NOT NULL,
+                data TEXT
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_detection_log_plate ON detection_log (plate, seq)")
+        self.conn.commit()
+
+    def append(self, plate, data):
+        """Record the current detection data for plate"""
+        self._write(plate, 'upsert', json.dumps(data))
+
+    def remove(self, plate):
+        """Record that plate's detection was removed"""
+        self._write(plate, 'delete', None)
+
+    def _write(self, plate, op, data):
+        with self.lock:
+            self.conn.execute("INSERT INTO detection_log (plate, op, recorded_at, data) VALUES (?, ?, ?, ?)",
+                              (plate, op, time.time(), data))
+            self.conn.commit()
+
+    def load_latest(self):
+        """Return {plate: detection_data} using the latest entry per plate"""
+        with self.lock:
+            rows = self.conn.execute("""
+                SELECT plate, op, data FROM detection_log
+                WHERE seq IN (SELECT MAX(seq) FROM detection_log GROUP BY plate)
+                ORDER BY seq""").fetchall()
+        return {plate: json.loads(data) for plate, op, data in rows if op == 'upsert'}
+
+    def history(self, plate):
+        """Return every recorded version of a plate's detection, oldest first"""
+        with self.lock:
+            rows = self.conn.execute("SELECT op, recorded_at, data FROM detection_log WHERE plate = ? ORDER BY seq",
+                                     (plate,)).fetchall()
+        return [{'op': op, 'recorded_at': recorded_at, 'data': json.loads(data) if data else None}
+                for op, recorded_at, data in rows]
+
+    def is_empty(self):
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM detection_log LIMIT 1").fetchone() is None
+
+    def import_legacy(self, detected_plates_data):
+        """Seed an empty store from detected_plates_data of an older settings file"""
+        if not detected_plates_data or not self.is_empty():
+            return 0
+        for plate, data in detected_plates_data.items():
+            self.append(plate, data)
+        return len(detected_plates_data)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+def write_json_atomic(path, data, indent=2):
+    """Write JSON to a temp file and rename it over path, so a crash never leaves a half-written file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,281 @@
+#Import All the Required Libraries
+import base64
+import json
+import os
+import random
+import smtplib
+import threading
+import time
+import uuid
+import requests
+
+class SMTPSession:
+    """Keeps one authenticated SMTP connection open across alerts"""
+    def __init__(self, idle_timeout=60):
+        self.idle_timeout = idle_timeout
+        self.server = None
+        self.config_key = None
+        self.last_used = 0
+
+    def send(self, email_config, recipient, message):
+        server = self.connect(email_config)
+        try:
+            server.sendmail(email_config['email'], [recipient], message)
+        except Exception:
+            # Drop the connection so the retry starts from a fresh handshake
+            self.close()
+            raise
+        self.last_used = time.time()
+
+    def connect(self, email_config):
+        config_key = (email_config.get('smtp_server'), email_config.get('smtp_port'),
+                      email_config.get('email'), email_config.get('password'))
+        if self.server is not None and (config_key != self.config_key or
+                                        time.time() - self.last_used > self.idle_timeout):
+            self.close()
+        if self.server is None:
+            if not all([email_config.get('smtp_server'), email_config.get('email')]):
+                raise Exception("Email configuration incomplete")
+            server = smtplib.SMTP(email_config['smtp_server'], email_config.get('smtp_port', 587), timeout=30)
+            if email_config.get('use_tls', True):
+                server.starttls()
+            if email_config.get('password'):
+                server.login(email_config['email'], email_config['password'])
+            self.server = server
+            self.config_key = config_key
+            self.last_used = time.time()
+        return self.server
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+            self.server = None
+
+class TelegramSession:
+    """Sends Telegram messages over one pooled requests.Session"""
+    def __init__(self, api_base="https://api.telegram.org"):
+        self.api_base = api_base.rstrip('/')
+        self.session = requests.Session()
+
+    def send_message(self, telegram_config, chat_id, text):
+        self.call(telegram_config, "sendMessage", data={'chat_id': chat_id, 'text': text, 'parse_mode': 'HTML'})
+
+    def send_photo(self, telegram_config, chat_id, image_png):
+        files = {'photo': ('plate.png', image_png, 'image/png')}
+        self.call(telegram_config, "sendPhoto", data={'chat_id': chat_id, 'caption': "Detected license plate"},
+                  files=files, timeout=15)
+
+    def call(self, telegram_config, method, data, files=None, timeout=10):
+        bot_token = telegram_config.get('bot_token', '')
+        if not bot_token:
+            raise Exception("Telegram bot token not configured")
+        response = self.session.post(f"{self.api_base}/bot{bot_token}/{method}", data=data,
+                                     files=files, timeout=timeout)
+        result = response.json()
+        if not result.get('ok'):
+            raise Exception(f"Telegram API error: {result.get('description', 'Unknown error')}")
+
+    def close(self):
+        self.session.close()
+
+class AlertOutbox:
+    """Non-blocking alert dispatcher with a persistent retry queue
+
+    Alerts are written to spool_dir before enqueue returns and deleted once delivered,
+    so alerts pending at a crash are resent on the next start. A background thread
+    sends them in batches over reused SMTP/Telegram sessions and retries failures
+    with exponential backoff. observe(stage, seconds, **labels), if given, receives the
+    duration of every send attempt as stage 'alert_send' with channel and outcome labels.
+    """
+    def __init__(self, spool_dir="alert_outbox", get_email_config=None, get_telegram_config=None,
+                 log=print, telegram_api_base="https://api.telegram.org", max_attempts=8,
+                 base_delay=2.0, max_delay=300.0, batch_window=0.5, on_delivered=None, observe=None):
+        self.spool_dir = spool_dir
+        self.failed_dir = os.path.join(spool_dir, "failed")
+        self.get_email_config = get_email_config or (lambda: {})
+        self.get_telegram_config = get_telegram_config or (lambda: {})
+        self.log = log
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.batch_window = batch_window
+        self.on_delivered = on_delivered
+        self.observe = observe
+        self.smtp = SMTPSession()
+        self.telegram = TelegramSession(telegram_api_base)
+        self.pending = {}
+        self.delivered_count = 0
+        self.failed_count = 0
+        self.condition = threading.Condition()
+        self.thread = None
+        self.running = False
+        os.makedirs(self.failed_dir, exist_ok=True)
+        self.load_spool()
+
+    def load_spool(self):
+        """Pick up alerts left on disk by a previous run"""
+        for name in sorted(os.listdir(self.spool_dir)):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.spool_dir, name), 'r') as f:
+                    alert = json.load(f)
+                alert['next_attempt'] = 0
+                self.pending[alert['id']] = alert
+            except Exception as e:
+                self.log(f"Skipping unreadable outbox entry {name}: {str(e)}")
+        if self.pending:
+            self.log(f"Alert outbox: resuming {len(self.pending)} pending alert(s)")
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="alert-outbox", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=5):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout)
+        self.smtp.close()
+        self.telegram.close()
+
+    def enqueue_email(self, recipient, message, subject="", meta=None):
+        """Queue an email; message is the full MIME message as a string"""
+        return self.enqueue({'channel': 'email', 'recipient': recipient, 'message': message,
+                             'subject': subject, 'meta': meta or {}})
+
+    def enqueue_telegram(self, chat_id, text, image_png=None, meta=None):
+        """Queue a Telegram message with an optional PNG photo (bytes)"""
+        image = base64.b64encode(image_png).decode('ascii') if image_png is not None else None
+        return self.enqueue({'channel': 'telegram', 'recipient': str(chat_id), 'message': text,
+                             'image_png': image, 'meta': meta or {}})
+
+    def enqueue(self, alert):
+        alert.update({'id': uuid.uuid4().hex, 'attempts': 0, 'next_attempt': 0,
+                      'created': time.time(), 'last_error': None})
+        self.write_spool(alert)
+        with self.condition:
+            self.pending[alert['id']] = alert
+            self.condition.notify_all()
+        return alert['id']
+
+    def pending_count(self):
+        with self.condition:
+            return len(self.pending)
+
+    def wait_until_empty(self, timeout=None):
+        """Block until every queued alert was delivered or given up on"""
+        deadline = None if timeout is None else time.time() + timeout
+        with self.condition:
+            while self.pending:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.condition.wait(remaining if remaining is not None else 0.5)
+        return True
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.due_alerts():
+                    self.condition.wait(self.next_wakeup())
+                if not self.running:
+                    return
+            # Give a burst a moment to arrive so it goes out over one session
+            time.sleep(self.batch_window)
+            with self.condition:
+                batch = self.due_alerts()
+            self.send_batch(batch)
+
+    def due_alerts(self):
+        now = time.time()
+        return [alert for alert in self.pending.values() if alert['next_attempt'] <= now]
+
+    def next_wakeup(self):
+        if not self.pending:
+            return None
+        return max(0.05, min(alert['next_attempt'] for alert in self.pending.values()) - time.time())
+
+    def send_batch(self, batch):
+        email_config = self.get_email_config()
+        telegram_config = self.get_telegram_config()
+        for alert in sorted(batch, key=lambda a: a['channel']):
+            started = time.perf_counter()
+            try:
+                if alert['channel'] == 'email':
+                    self.smtp.send(email_config, alert['recipient'], alert['message'])
+                else:
+                    self.send_telegram(telegram_config, alert)
+            except Exception as e:
+                self.observe_send(alert, started, 'failed')
+                self.retry_later(alert, e)
+                continue
+            self.observe_send(alert, started, 'delivered')
+            self.mark_delivered(alert)
+
+    def send_telegram(self, telegram_config, alert):
+        """Send the text, then the photo; once the text is out that is spooled, so retries only resend the photo"""
+        image = base64.b64decode(alert['image_png']) if alert.get('image_png') else None
+        if not alert.get('text_sent'):
+            self.telegram.send_message(telegram_config, alert['recipient'], alert['message'])
+            if image is None:
+                return
+            alert['text_sent'] = True
+            self.write_spool(alert)
+        self.telegram.send_photo(telegram_config, alert['recipient'], image)
+
+    def observe_send(self, alert, started, outcome):
+        if self.observe is not None:
+            self.observe('alert_send', time.perf_counter() - started, channel=alert['channel'], outcome=outcome)
+
+    def mark_delivered(self, alert):
+        self.remove_spool(alert)
+        with self.condition:
+            self.pending.pop(alert['id'], None)
+            self.delivered_count += 1
+            self.condition.notify_all()
+        self.log(f"Alert delivered via {alert['channel']} to {alert['recipient']}")
+        if self.on_delivered is not None:
+            self.on_delivered(alert)
+
+    def retry_later(self, alert, error):
+        alert['attempts'] += 1
+        alert['last_error'] = str(error)
+        if alert['attempts'] >= self.max_attempts:
+            # Park it in failed/ so it is kept for inspection but not retried forever
+            os.replace(self.spool_path(alert), os.path.join(self.failed_dir, f"{alert['id']}.json"))
+            with self.condition:
+                self.pending.pop(alert['id'], None)
+                self.failed_count += 1
+                self.condition.notify_all()
+            self.log(f"Giving up on {alert['channel']} alert to {alert['recipient']} "
+                     f"after {alert['attempts']} attempts: {str(error)}")
+            return
+        delay = min(self.max_delay, self.base_delay * (2 ** (alert['attempts'] - 1)))
+        alert['next_attempt'] = time.time() + delay * random.uniform(0.8, 1.2)
+        self.write_spool(alert)
+        self.log(f"{alert['channel'].capitalize()} alert to {alert['recipient']} failed "
+                 f"(attempt {alert['attempts']}), retrying in {delay:.0f}s: {str(error)}")
+
+    def spool_path(self, alert):
+        return os.path.join(self.spool_dir, f"{alert['id']}.json")
+
+    def write_spool(self, alert):
+        path = self.spool_path(alert)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(alert, f)
+        os.replace(tmp_path, path)
+
+    def remove_spool(self, alert):
+        try:
+            os.remove(self.spool_path(alert))
+        except FileNotFoundError:
+            pass
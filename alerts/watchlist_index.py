@@ -0,0 +1,117 @@
+#Import All the Required Libraries
+import re
+
+# Characters OCR commonly confuses are folded onto one canonical character before
+# indexing, so "DL2CAT4762" and "DL2CAT47G2" are distance 0 from each other
+OCR_CONFUSIONS = str.maketrans({
+    '0': 'O', 'Q': 'O', 'D': 'O',
+    '1': 'I', 'L': 'I',
+    '5': 'S',
+    '8': 'B',
+    '2': 'Z',
+    '6': 'G'
+})
+
+def normalize_plate(plate):
+    """Uppercase, strip separators and fold OCR-confusable characters"""
+    return re.sub(r'[^A-Z0-9]', '', plate.upper()).translate(OCR_CONFUSIONS)
+
+def edit_distance(a, b, max_distance=None):
+    """Levenshtein distance; stops early and returns max_distance + 1 once it is exceeded"""
+    if a == b:
+        return 0
+    if max_distance is not None and abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+def deletion_variants(key, max_distance):
+    """All strings reachable from key by deleting up to max_distance characters"""
+    variants = {key}
+    frontier = {key}
+    for _ in range(max_distance):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        variants |= frontier
+    return variants
+
+class WatchListIndex:
+    """Symmetric-deletion index over normalized watch-list plates for fuzzy lookup
+
+    Two plates within edit distance k always share a string obtained by deleting at most
+    k characters from each, so a lookup only checks the handful of plates filed under the
+    probe's deletion variants instead of scanning the whole watch list.
+    """
+    def __init__(self, plates=(), max_distance=1):
+        self.max_distance = max_distance
+        self.by_key = {}
+        self.deletes = {}
+        for plate in plates:
+            self.add(plate)
+
+    def __len__(self):
+        return sum(len(plates) for plates in self.by_key.values())
+
+    def __contains__(self, plate):
+        return plate in self.by_key.get(normalize_plate(plate), ())
+
+    def add(self, plate):
+        key = normalize_plate(plate)
+        if not key:
+            return
+        if key not in self.by_key:
+            self.by_key[key] = set()
+            for variant in deletion_variants(key, self.max_distance):
+                self.deletes.setdefault(variant, set()).add(key)
+        self.by_key[key].add(plate)
+
+    def remove(self, plate):
+        key = normalize_plate(plate)
+        plates = self.by_key.get(key)
+        if not plates or plate not in plates:
+            return
+        plates.discard(plate)
+        if plates:
+            return
+        del self.by_key[key]
+        for variant in deletion_variants(key, self.max_distance):
+            keys = self.deletes.get(variant)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.deletes[variant]
+
+    def candidates(self, plate, max_distance=None):
+        """Return [(watch_plate, distance)] within max_distance, closest first"""
+        max_distance = self.max_distance if max_distance is None else max_distance
+        key = normalize_plate(plate)
+        if not key:
+            return []
+        if max_distance <= self.max_distance:
+            keys = set()
+            for variant in deletion_variants(key, max_distance):
+                keys.update(self.deletes.get(variant, ()))
+        else:
+            # Wider than the index was built for: fall back to a full scan
+            keys = self.by_key.keys()
+        found = []
+        for candidate_key in keys:
+            distance = edit_distance(key, candidate_key, max_distance)
+            if distance <= max_distance:
+                found.extend((p, distance) for p in self.by_key[candidate_key])
+        found.sort(key=lambda item: (item[1], item[0] != plate, item[0]))
+        return found
+
+    def match(self, plate, max_distance=None):
+        """Return (watch_plate, distance) for the best watch-list match, or None"""
+        # Exact hit is the common case and needs no variant lookups
+        if plate in self.by_key.get(normalize_plate(plate), ()):
+            return plate, 0
+        candidates = self.candidates(plate, max_distance)
+        return candidates[0] if candidates else None
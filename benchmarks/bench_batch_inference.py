@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark YOLO throughput of the detectors at different batch sizes
+
+Usage:
+    python -m benchmarks.bench_batch_inference --model yolo11n.pt --video input_videos/video4.mp4
+"""
+
+import argparse
+import time
+import numpy as np
+from detections import CarDetection
+from utils import read_video
+
+BATCH_SIZES = [1, 4, 8, 16]
+
+def load_frames(video_path, num_frames, width=1280, height=720):
+    """Take frames from a video, or generate noise frames when no video is given"""
+    if video_path:
+        frames = read_video(video_path)[:num_frames]
+        if frames:
+            return frames
+        print(f"Could not read frames from {video_path}, using synthetic frames")
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(num_frames)]
+
+def benchmark_batch_sizes(model_path, frames, batch_sizes=BATCH_SIZES, device='cpu', warmup=1):
+    """Return a list of (batch_size, frames_per_second) tuples"""
+    detector = CarDetection(model_path=model_path, batch_size=1, device=device)
+    results = []
+    for batch_size in batch_sizes:
+        detector.batch_size = batch_size
+        # Warm up so model fusing and first-call allocations aren't measured
+        for _ in range(warmup):
+            detector.detect_frames(frames[:batch_size])
+        start_time = time.perf_counter()
+        detector.detect_frames(frames)
+        elapsed_time = time.perf_counter() - start_time
+        results.append((batch_size, len(frames) / elapsed_time if elapsed_time > 0 else 0.0))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="YOLO batch-size throughput benchmark")
+    parser.add_argument("--model", default="yolo11n.pt", help="YOLO weights to benchmark")
+    parser.add_argument("--video", default=None, help="Optional video to take frames from")
+    parser.add_argument("--frames", type=int, default=64, help="Number of frames per run")
+    parser.add_argument("--device", default="cpu", help="Inference device (default: cpu)")
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.frames)
+    print(f"Benchmarking {args.model} on {len(frames)} frames ({args.device})")
+    baseline = None
+    for batch_size, fps in benchmark_batch_sizes(args.model, frames, device=args.device):
+        baseline = baseline or fps
+        print(f"  batch={batch_size:>2}  {fps:7.2f} frames/sec  ({fps / baseline:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Benchmark the full pipeline (decode, detection, OCR, dedup, alerting) on synthetic traffic
+
+Each scenario renders a video with benchmarks.synthetic_traffic, runs it through
+PlateAlertEngine in a fresh process, and reports frames/sec, OCR calls per frame, the
+memory high-water mark, per-stage time and how many of the rendered plates were read.
+Alerts go through the real outbox to a local sink instead of Telegram. Without --model
+the stub detector and OCR from benchmarks.stub_models are used, so it runs offline on CPU.
+Results are written as JSON; --compare prints the change against an earlier run.
+
+Usage:
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --scenario heavy --frames 600 --compare benchmarks/results/old.json
+    python -m benchmarks.bench_pipeline --model models/best.pt
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import cv2
+import numpy as np
+from benchmarks.synthetic_traffic import generate_traffic_video
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Average number of cars on screen per scenario
+SCENARIOS = {
+    'light': {'density': 2},
+    'medium': {'density': 5},
+    'heavy': {'density': 10}
+}
+
+class LocalTelegramSink:
+    """Stands in for the outbox's Telegram session: accepts every alert without any network"""
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, telegram_config, chat_id, text):
+        self.sent.append((chat_id, time.time()))
+
+    def send_photo(self, telegram_config, chat_id, image_png):
+        pass
+
+    def close(self):
+        pass
+
+def peak_rss_mb():
+    """This process's resident memory high-water mark in MB, or None where it is not available"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return round(peak / (1024.0 * 1024.0 if sys.platform == 'darwin' else 1024.0), 1)
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except Exception:
+        return None
+
+# Real weights and OCR loaded by this process, reused by every run in it
+_loaded_models = {}
+
+def load_models(engine, model_path):
+    """Give engine the plate model and OCR: the stubs without model_path, else YOLO and PaddleOCR loaded once"""
+    from detections.plate_ocr import PlateOCRQueue
+    from benchmarks.stub_models import SyntheticPlateDetector, TemplatePlateOCR
+    if not model_path:
+        engine.model = SyntheticPlateDetector()
+        engine.ocr = TemplatePlateOCR()
+    elif model_path in _loaded_models:
+        engine.model, engine.ocr = _loaded_models[model_path]
+        engine.model_path = model_path
+    else:
+        engine.load_model(model_path)
+        _loaded_models[model_path] = (engine.model, engine.ocr)
+    engine.ocr_queue = PlateOCRQueue(engine.ocr)
+
+def run_scenario(config):
+    """Run one video through a fresh engine and return its measurements
+
+    config holds name, video_path, plates (the texts a perfect run reads), workdir, model,
+    verbose and settings (engine attributes to set, e.g. frame_skip or detection_conf).
+    """
+    # Imported here: the parent process only generates videos, each scenario loads the engine itself
+    from pipeline.engine import PlateAlertEngine
+    from alerts.watchlist_index import WatchListIndex
+
+    workdir = config['workdir']
+    log = print if config['verbose'] else (lambda message: None)
+    engine = PlateAlertEngine(settings_path=os.path.join(workdir, 'settings.json'),
+                              store_path=os.path.join(workdir, f"{config['name']}_history.db"),
+                              spool_dir=os.path.join(workdir, f"{config['name']}_outbox"),
+                              log=log, progress_interval=10 ** 9, cache_path=None, metrics_log_interval=None)
+    for name, value in config.get('settings', {}).items():
+        setattr(engine, name, value)
+    load_models(engine, config['model'])
+
+    # Every other labelled plate is on the watch list and alerts over the (local) Telegram channel
+    truth_plates = list(config['plates'])
+    engine.watch_list = set(truth_plates[::2])
+    engine.watchlist_index = WatchListIndex(engine.watch_list, max_distance=engine.watchlist_max_distance)
+    engine.alert_contacts = {plate: {'contact': 'benchmark', 'type': 'Telegram'} for plate in engine.watch_list}
+    engine.telegram_config = {'bot_token': 'benchmark', 'enabled': True}
+    sink = LocalTelegramSink()
+    engine.alert_outbox.telegram = sink
+
+    engine.start()
+    start_time = time.perf_counter()
+    summary = engine.process_video(config['video_path'])
+    elapsed = time.perf_counter() - start_time
+    engine.alert_outbox.wait_until_empty(30)
+    detected = set(engine.stream.detected_plates)
+    alert_latency = engine.alert_latency.percentiles()
+    engine.close()
+
+    frames = summary['frames']
+    correct = detected & set(truth_plates)
+    return {
+        'scenario': config['name'],
+        'detector': config['model'] or 'synthetic-stub',
+        'frames': frames,
+        'frames_inferred': summary['frames_inferred'],
+        'seconds': round(elapsed, 3),
+        'fps_read': round(frames / elapsed, 2) if elapsed > 0 else 0.0,
+        'fps_processed': round(summary['frames_inferred'] / elapsed, 2) if elapsed > 0 else 0.0,
+        'ocr_calls': engine.ocr_queue.ocr_calls,
+        'ocr_calls_per_frame': round(engine.ocr_queue.ocr_calls / frames, 4) if frames else 0.0,
+        'peak_rss_mb': peak_rss_mb(),
+        'plates_rendered': len(truth_plates),
+        'plates_read': len(correct),
+        'plate_recall': round(len(correct) / len(truth_plates), 4) if truth_plates else 0.0,
+        'plate_precision': round(len(correct) / len(detected), 4) if detected else 0.0,
+        'false_plates': sorted(detected - set(truth_plates)),
+        'alerts_expected': len(engine.watch_list),
+        'alerts_delivered': len(sink.sent),
+        'alert_latency_p95_s': round(alert_latency['p95'], 3) if alert_latency['count'] else None,
+        'stages': {stage: {'calls': stats['count'],
+                           'total_s': round(stats['avg'] * stats['count'], 4),
+                           'avg_ms': round(stats['avg'] * 1000, 3),
+                           'p95_ms': round(stats['p95'] * 1000, 3),
+                           'max_ms': round(stats['max'] * 1000, 3)}
+                   for stage, stats in sorted(engine.metrics.stage_stats().items())}
+    }
+
+def run_isolated(config):
+    """Run a scenario in its own process so its memory high-water mark is its own"""
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(run_scenario, (config,))
+
+def print_result(result):
+    rss = f"{result['peak_rss_mb']:.0f} MB" if result['peak_rss_mb'] is not None else "n/a"
+    print(f"[{result['scenario']}] {result['frames']} frames in {result['seconds']:.2f}s: "
+          f"{result['fps_read']:.1f} FPS read, {result['fps_processed']:.1f} FPS processed, "
+          f"{result['ocr_calls_per_frame']:.3f} OCR calls/frame, peak RSS {rss}")
+    print(f"[{result['scenario']}] plates read {result['plates_read']}/{result['plates_rendered']} "
+          f"({result['plate_recall']:.0%}), {len(result['false_plates'])} false, "
+          f"alerts {result['alerts_delivered']}/{result['alerts_expected']}")
+    for stage, stats in result['stages'].items():
+        print(f"    {stage:<14} {stats['calls']:>6} calls  avg {stats['avg_ms']:8.3f} ms  "
+              f"p95 <= {stats['p95_ms']:8.3f} ms  total {stats['total_s']:.3f}s")
+
+def compare_results(previous, current):
+    """Print the change of the headline numbers of every scenario present in both runs"""
+    before = {result['scenario']: result for result in previous['results']}
+    print(f"Compared with {previous['meta'].get('commit')} ({previous['meta'].get('timestamp')}):")
+    for result in current['results']:
+        old = before.get(result['scenario'])
+        if old is None:
+            continue
+        changes = []
+        for key in ('fps_processed', 'ocr_calls_per_frame', 'peak_rss_mb', 'plate_recall'):
+            if old.get(key) and result.get(key) is not None:
+                changes.append(f"{key} {old[key]} -> {result[key]} ({(result[key] - old[key]) / old[key]:+.1%})")
+        print(f"  [{result['scenario']}] " + ", ".join(changes))
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-pipeline benchmark on synthetic traffic video")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable; default: all)")
+    parser.add_argument("--frames", type=int, default=300, help="Frames per synthetic video")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--model", default=None, help="Real YOLO plate weights (with PaddleOCR) instead of the stubs")
+    parser.add_argument("--frame-skip", type=int, default=2, help="Frame skip when adaptive sampling is off")
+    parser.add_argument("--no-adaptive", action="store_true", help="Turn adaptive frame sampling off")
+    parser.add_argument("--workdir", default=None, help="Where videos and stores go (default: a temp dir)")
+    parser.add_argument("--output", default=None, help="JSON results (default: benchmarks/results/pipeline-<commit>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier JSON results to compare with")
+    parser.add_argument("--verbose", action="store_true", help="Show the engine's log")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="plate_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    commit = git_commit()
+    report = {
+        'meta': {
+            'commit': commit,
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'opencv': cv2.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'frames': args.frames,
+            'size': [args.width, args.height],
+            'seed': args.seed,
+            'adaptive_sampling': not args.no_adaptive,
+            'frame_skip': args.frame_skip
+        },
+        'results': []
+    }
+    for name in args.scenario or list(SCENARIOS):
+        video_path = os.path.join(workdir, f"{name}.avi")
+        truth_path = os.path.join(workdir, f"{name}.json")
+        print(f"[{name}] Rendering {args.frames} frames at {args.width}x{args.height}...")
+        truth = generate_traffic_video(video_path, frames=args.frames, width=args.width, height=args.height,
+                                       seed=args.seed, **SCENARIOS[name])
+        with open(truth_path, 'w') as f:
+            json.dump(truth, f)
+        result = run_isolated({'name': name, 'video_path': video_path,
+                               'plates': [plate['text'] for plate in truth['plates']],
+                               'workdir': workdir, 'model': args.model, 'verbose': args.verbose,
+                               'settings': {'adaptive_sampling': not args.no_adaptive,
+                                            'frame_skip': args.frame_skip}})
+        result['density'] = SCENARIOS[name]['density']
+        print_result(result)
+        report['results'].append(result)
+
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results',
+                                         f"pipeline-{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare_results(json.load(f), report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Stand-in plate detector and OCR for benchmarking the pipeline without weights or a GPU
+
+SyntheticPlateDetector finds the white plates of benchmarks.synthetic_traffic videos with
+a threshold and contours, and answers predict()/track() with results shaped like
+ultralytics' (boxes.xyxy, .cls, .conf, .id). TemplatePlateOCR reads their text by
+matching each glyph against the font the generator renders with, and answers predict()
+like PaddleOCR 3.x. Both are cheap, deterministic and run on CPU with OpenCV only.
+"""
+
+import cv2
+import numpy as np
+from pipeline.tracker import IoUTracker
+from benchmarks.synthetic_traffic import PLATE_FONT, PLATE_LETTERS
+
+class ResultArray:
+    """numpy array with the .cpu() / .numpy() / .int() / .tolist() calls the engine makes on tensors"""
+    def __init__(self, values, dtype=np.float32):
+        self.values = np.asarray(values, dtype=dtype)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.values
+
+    def int(self):
+        return ResultArray(self.values, dtype=np.int64)
+
+    def tolist(self):
+        return self.values.tolist()
+
+class ResultBoxes:
+    def __init__(self, boxes, confidences, track_ids=None):
+        self.xyxy = ResultArray(np.reshape(boxes, (-1, 4)))
+        self.cls = ResultArray(np.zeros(len(boxes)))
+        self.conf = ResultArray(confidences)
+        self.id = ResultArray(track_ids, dtype=np.int64) if track_ids is not None else None
+
+class DetectionResult:
+    def __init__(self, boxes, names):
+        self.boxes = boxes
+        self.names = names
+
+class SyntheticPlateDetector:
+    """Finds bright, plate-shaped rectangles; a drop-in for the YOLO plate model on synthetic video"""
+    names = {0: 'license_plate'}
+
+    def __init__(self, threshold=220, min_area=600, aspect_range=(2.5, 6.5)):
+        self.threshold = threshold
+        self.min_area = min_area
+        self.aspect_range = aspect_range
+        self.tracker = IoUTracker()
+
+    def find_plates(self, frame):
+        """([x1, y1, x2, y2] boxes, confidences) of the plates in one BGR frame
+        
+        Plates cut by the frame edge are left out, like a car that has not fully entered.
+        """
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        _, bright = cv2.threshold(gray, self.threshold, 255, cv2.THRESH_BINARY)
+        # Close the gaps the dark text leaves so each plate is one blob
+        bright = cv2.morphologyEx(bright, cv2.MORPH_CLOSE, np.ones((5, 9), np.uint8))
+        contours, _ = cv2.findContours(bright, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        boxes, confidences = [], []
+        for contour in contours:
+            x, y, width, height = cv2.boundingRect(contour)
+            if x == 0 or y == 0 or x + width >= frame.shape[1] or y + height >= frame.shape[0]:
+                continue
+            if width * height < self.min_area or not self.aspect_range[0] <= width / height <= self.aspect_range[1]:
+                continue
+            fill = cv2.contourArea(contour) / float(width * height)
+            if fill < 0.8:
+                continue
+            boxes.append([x, y, x + width, y + height])
+            confidences.append(min(0.99, fill))
+        return boxes, confidences
+
+    def predict(self, frames, conf=0.5, **kwargs):
+        results = []
+        for frame in (frames if isinstance(frames, (list, tuple)) else [frames]):
+            boxes, confidences = self.find_plates(frame)
+            keep = [index for index, confidence in enumerate(confidences) if confidence >= conf]
+            results.append(DetectionResult(ResultBoxes([boxes[i] for i in keep], [confidences[i] for i in keep]),
+                                           self.names))
+        return results
+
+    def track(self, frame, persist=True, conf=0.5, **kwargs):
+        if not persist:
+            self.tracker.reset()
+        result = self.predict([frame], conf=conf)[0]
+        boxes = result.boxes.xyxy.numpy().tolist()
+        result.boxes.id = ResultArray(self.tracker.update(boxes), dtype=np.int64)
+        return [result]
+
+class TemplatePlateOCR:
+    """Reads synthetic plates by matching each glyph with the generator's font"""
+    def __init__(self, alphabet=PLATE_LETTERS + '0123456789', glyph_size=(16, 24)):
+        self.glyph_size = glyph_size
+        self.templates = {char: self.render_glyph(char) for char in alphabet}
+
+    def render_glyph(self, char):
+        canvas = np.full((60, 60), 255, dtype=np.uint8)
+        cv2.putText(canvas, char, (10, 45), PLATE_FONT, 0.8, 0, 2, cv2.LINE_AA)
+        return self.normalize_glyph(cv2.threshold(canvas, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1])
+
+    def normalize_glyph(self, binary):
+        points = cv2.findNonZero(binary)
+        x, y, width, height = cv2.boundingRect(points)
+        glyph = cv2.resize(binary[y:y + height, x:x + width], self.glyph_size, interpolation=cv2.INTER_AREA)
+        return glyph.astype(np.float32) / 255.0
+
+    def read(self, crop):
+        """(text, score) of one plate crop; score is the mean glyph match"""
+        gray = crop if crop.ndim == 2 else cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+        # The crop has some car around the plate; keep the biggest bright area
+        _, bright = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY)
+        bright = cv2.morphologyEx(bright, cv2.MORPH_CLOSE, np.ones((5, 9), np.uint8))
+        contours, _ = cv2.findContours(bright, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            return "", 0.0
+        x, y, width, height = cv2.boundingRect(max(contours, key=cv2.contourArea))
+        plate = gray[y:y + height, x:x + width]
+        _, ink = cv2.threshold(plate, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(ink)
+        glyphs = sorted((stats[i] for i in range(1, count)
+                         if stats[i][3] >= 0.35 * height and stats[i][1] > 0 and stats[i][1] + stats[i][3] < height),
+                        key=lambda stat: stat[0])
+        text, scores = "", []
+        for gx, gy, gwidth, gheight, _ in glyphs:
+            glyph = self.normalize_glyph(ink[gy:gy + gheight, gx:gx + gwidth])
+            char, score = max(((char, 1.0 - float(np.abs(glyph - template).mean()))
+                               for char, template in self.templates.items()), key=lambda item: item[1])
+            text += char
+            scores.append(score)
+        return text, float(np.mean(scores)) if scores else 0.0
+
+    def predict(self, crops):
+        results = []
+        for crop in crops:
+            text, score = self.read(crop)
+            results.append({'rec_texts': [text] if text else [], 'rec_scores': [score] if text else []})
+        return results
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Sweep pipeline settings over a labelled clip set and find the accuracy/speed Pareto frontier
+
+Every combination of the grid (any of the engine's TUNABLE_SETTINGS: frame_skip,
+detection_conf, frame_size, crop_padding, ocr_crop_height, dedup_similarity,
+adaptive_sampling, car_plate_conf) is run on every clip. Plate-level precision and recall come from the
+clip labels, next to the throughput and the alert latency. Per camera, the settings no
+other settings beat on F1, FPS and alert latency at once form the Pareto frontier. The
+pick for each camera is the frontier point with the best F1 that reaches --min-fps,
+written as a camera_settings block for the settings file.
+
+adaptive_sampling is off unless --adaptive or the grid turns it on, because frame_skip
+only takes effect without it; every suggested block carries it, so the engine runs what
+was measured. The block only applies to clip cameras that are engine camera keys (vid1,
+video4); the synthetic clips' cameras are not, and the sweep warns about both.
+
+A clip set is a JSON manifest; video paths are relative to it:
+    {"clips": [{"video": "cam1/clip1.mp4", "camera": "vid1", "plates": ["KA05MH4821", ...]}]}
+Without --clips, labelled synthetic clips are rendered (see benchmarks.synthetic_traffic).
+
+Usage:
+    python -m benchmarks.sweep_pipeline
+    python -m benchmarks.sweep_pipeline --clips clips/manifest.json --model models/best.pt \\
+        --grid frame_skip=1,2,3 --grid detection_conf=0.3,0.5 --grid frame_size=1020x600,768x452
+    python -m benchmarks.sweep_pipeline --grid adaptive_sampling=true,false
+"""
+
+import argparse
+import itertools
+import json
+import os
+import tempfile
+import time
+from benchmarks.bench_pipeline import run_scenario, git_commit
+from benchmarks.synthetic_traffic import generate_traffic_video
+
+DEFAULT_GRID = {
+    'frame_skip': [1, 2, 3],
+    'detection_conf': [0.3, 0.5, 0.7],
+    'frame_size': [[1020, 600], [768, 452]]
+}
+
+# What the frontier maximises ('max') or minimises ('min')
+OBJECTIVES = {'f1': 'max', 'fps': 'max', 'alert_latency_p95_s': 'min'}
+
+def parse_value(text):
+    """'3' -> 3, '0.5' -> 0.5, '1020x600' -> [1020, 600], 'true' -> True"""
+    if text.lower() in ('true', 'false'):
+        return text.lower() == 'true'
+    if 'x' in text:
+        return [int(part) for part in text.split('x')]
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+def parse_grid(entries):
+    """{name: [values]} from 'name=v1,v2' entries, on top of DEFAULT_GRID"""
+    grid = dict(DEFAULT_GRID)
+    for entry in entries or []:
+        name, values = entry.split('=', 1)
+        grid[name.strip()] = [parse_value(value.strip()) for value in values.split(',')]
+    return grid
+
+def grid_settings(grid):
+    """Every combination of the grid as a settings dict"""
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def sweep_warnings(cameras, camera_keys, combinations):
+    """Reasons the sweep's camera_settings would not do in the engine what was measured"""
+    warnings = []
+    unknown = sorted(camera for camera in cameras if camera not in camera_keys)
+    if unknown:
+        warnings.append(f"camera(s) {', '.join(unknown)} are not engine camera keys ({', '.join(camera_keys)}); "
+                        f"their suggested camera_settings will never be applied")
+    skips = {settings['frame_skip'] for settings in combinations
+             if 'frame_skip' in settings and settings.get('adaptive_sampling')}
+    if len(skips) > 1:
+        warnings.append("frame_skip has no effect while adaptive sampling is on; "
+                        "those runs differ only by noise")
+    return warnings
+
+def load_clips(manifest_path):
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    return [{'video': os.path.join(base, clip['video']), 'camera': clip.get('camera', 'default'),
+             'plates': clip['plates']} for clip in manifest['clips']]
+
+def synthetic_clips(workdir, frames, seed):
+    """Render one labelled clip per traffic density, each as its own camera"""
+    clips = []
+    for camera, density in (('synthetic-light', 2), ('synthetic-medium', 5), ('synthetic-heavy', 10)):
+        video_path = os.path.join(workdir, f"{camera}.avi")
+        truth = generate_traffic_video(video_path, frames=frames, density=density, seed=seed)
+        clips.append({'video': video_path, 'camera': camera, 'plates': [plate['text'] for plate in truth['plates']]})
+    return clips
+
+def score_runs(runs):
+    """Sum the clip runs of one camera and settings into precision, recall, F1, FPS and latency"""
+    true_positives = sum(run['plates_read'] for run in runs)
+    labelled = sum(run['plates_rendered'] for run in runs)
+    detected = true_positives + sum(len(run['false_plates']) for run in runs)
+    precision = true_positives / detected if detected else 0.0
+    recall = true_positives / labelled if labelled else 0.0
+    seconds = sum(run['seconds'] for run in runs)
+    latencies = [run['alert_latency_p95_s'] for run in runs if run['alert_latency_p95_s'] is not None]
+    return {
+        'precision': round(precision, 4),
+        'recall': round(recall, 4),
+        'f1': round(2 * precision * recall / (precision + recall), 4) if precision + recall else 0.0,
+        'fps': round(sum(run['frames'] for run in runs) / seconds, 2) if seconds > 0 else 0.0,
+        'ocr_calls_per_frame': round(sum(run['ocr_calls'] for run in runs) / max(1, sum(run['frames'] for run in runs)), 4),
+        # The slowest clip's p95; None when no clip raised an alert
+        'alert_latency_p95_s': max(latencies) if latencies else None
+    }
+
+def dominates(a, b, objectives=OBJECTIVES):
+    """True if a is at least as good as b on every objective and better on one"""
+    better = False
+    for key, direction in objectives.items():
+        value_a, value_b = a.get(key), b.get(key)
+        if value_a is None or value_b is None:
+            continue
+        if direction == 'min':
+            value_a, value_b = -value_a, -value_b
+        if value_a < value_b:
+            return False
+        if value_a > value_b:
+            better = True
+    return better
+
+def pareto_frontier(points, objectives=OBJECTIVES):
+    """The points no other point dominates, fastest first"""
+    frontier = [point for point in points
+                if not any(dominates(other, point, objectives) for other in points if other is not point)]
+    return sorted(frontier, key=lambda point: -point['fps'])
+
+def pick_settings(frontier, min_fps):
+    """Frontier point with the best F1 reaching min_fps, else the fastest one"""
+    fast_enough = [point for point in frontier if point['fps'] >= min_fps]
+    if not fast_enough:
+        return frontier[0] if frontier else None
+    return max(fast_enough, key=lambda point: (point['f1'], point['fps']))
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy-versus-speed sweep of pipeline settings")
+    parser.add_argument("--clips", default=None, help="Labelled clip manifest (default: synthetic clips)")
+    parser.add_argument("--grid", action="append", metavar="NAME=V1,V2",
+                        help="Values of one setting (repeatable), e.g. detection_conf=0.4,0.6 or frame_size=1020x600")
+    parser.add_argument("--model", default=None, help="Real YOLO plate weights (with PaddleOCR) instead of the stubs")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Keep adaptive frame sampling on (by default off, so frame_skip takes effect)")
+    parser.add_argument("--min-fps", type=float, default=25.0, help="Throughput the picked settings must reach")
+    parser.add_argument("--frames", type=int, default=200, help="Frames per synthetic clip")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=None, help="Where clips, stores and outboxes go (default: a temp dir)")
+    parser.add_argument("--output", default=None, help="JSON results (default: benchmarks/results/sweep-<commit>.json)")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="plate_sweep_")
+    os.makedirs(workdir, exist_ok=True)
+    clips = load_clips(args.clips) if args.clips else synthetic_clips(workdir, args.frames, args.seed)
+    grid = parse_grid(args.grid)
+    combinations = [dict({'adaptive_sampling': args.adaptive}, **settings) for settings in grid_settings(grid)]
+    from pipeline.engine import LOCATION_MAPPING
+    warnings = sweep_warnings({clip['camera'] for clip in clips}, list(LOCATION_MAPPING), combinations)
+    for warning in warnings:
+        print(f"Warning: {warning}")
+    print(f"Sweeping {len(combinations)} settings over {len(clips)} clips ({len(combinations) * len(clips)} runs)")
+
+    points = []
+    for run_index, settings in enumerate(combinations):
+        runs_by_camera = {}
+        for clip_index, clip in enumerate(clips):
+            run = run_scenario({'name': f"run{run_index}_clip{clip_index}", 'video_path': clip['video'],
+                                'plates': clip['plates'], 'workdir': workdir, 'model': args.model,
+                                'verbose': False, 'settings': settings})
+            runs_by_camera.setdefault(clip['camera'], []).append(run)
+        for camera, runs in runs_by_camera.items():
+            point = dict(score_runs(runs), camera=camera, settings=settings)
+            points.append(point)
+            print(f"  {camera:<18} {json.dumps(settings)}: P {point['precision']:.2f} R {point['recall']:.2f} "
+                  f"F1 {point['f1']:.2f} | {point['fps']:.1f} FPS")
+
+    report = {
+        'meta': {'commit': git_commit(), 'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"), 'model': args.model,
+                 'adaptive_sampling': args.adaptive, 'min_fps': args.min_fps, 'clips': clips},
+        'grid': grid,
+        'warnings': warnings,
+        'points': points,
+        'frontier': {},
+        'camera_settings': {}
+    }
+    for camera in sorted({point['camera'] for point in points}):
+        frontier = pareto_frontier([point for point in points if point['camera'] == camera])
+        report['frontier'][camera] = frontier
+        print(f"Pareto frontier for {camera}:")
+        for point in frontier:
+            latency = point['alert_latency_p95_s']
+            print(f"    F1 {point['f1']:.2f} (P {point['precision']:.2f}, R {point['recall']:.2f}) at "
+                  f"{point['fps']:.1f} FPS, alert p95 {f'{latency:.2f}s' if latency is not None else 'n/a'}: "
+                  f"{json.dumps(point['settings'])}")
+        picked = pick_settings(frontier, args.min_fps)
+        if picked is not None:
+            report['camera_settings'][camera] = picked['settings']
+
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results',
+                                         f"sweep-{report['meta']['commit'] or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+    print("Suggested camera_settings for the settings file:")
+    print(json.dumps(report['camera_settings'], indent=2))
+    for warning in warnings:
+        print(f"Warning: {warning}")
+
+if __name__ == "__main__":
+    main()
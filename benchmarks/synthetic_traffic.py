@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Synthetic traffic videos with rendered licence plates of known text
+
+Cars are flat-coloured boxes driving across a road in several lanes, each with a white
+plate and black text, so a benchmark knows exactly which plates a run should read.
+
+Usage:
+    python -m benchmarks.synthetic_traffic output.avi --frames 300 --density 4
+"""
+
+import argparse
+import json
+import random
+import string
+import cv2
+import numpy as np
+
+# Letters that clean_plate_text never rewrites into digits, so the rendered text is the expected text
+PLATE_LETTERS = ''.join(c for c in string.ascii_uppercase if c not in 'OISZBGQ')
+PLATE_FONT = cv2.FONT_HERSHEY_SIMPLEX
+PLATE_SIZE = (190, 40)
+CAR_SIZE = (220, 120)
+
+def random_plate(rng):
+    """Plate text like 'KA05MH4821' matching the engine's Indian plate pattern"""
+    return (''.join(rng.choice(PLATE_LETTERS) for _ in range(2)) + f"{rng.randint(1, 99):02d}" +
+            ''.join(rng.choice(PLATE_LETTERS) for _ in range(2)) + f"{rng.randint(0, 9999):04d}")
+
+def render_plate(text, size=PLATE_SIZE, scale=0.8):
+    """White plate with the text centred in black, one character every pitch pixels"""
+    width, height = size
+    plate = np.full((height, width, 3), 255, dtype=np.uint8)
+    pitch = (width - 10) // max(len(text), 1)
+    _, text_height = cv2.getTextSize(text, PLATE_FONT, scale, 2)[0]
+    for index, char in enumerate(text):
+        char_width = cv2.getTextSize(char, PLATE_FONT, scale, 2)[0][0]
+        # Each character centred in its own cell so neighbours never touch
+        x = 5 + index * pitch + (pitch - char_width) // 2
+        cv2.putText(plate, char, (x, (height + text_height) // 2), PLATE_FONT, scale, (0, 0, 0), 2, cv2.LINE_AA)
+    cv2.rectangle(plate, (0, 0), (width - 1, height - 1), (40, 40, 40), 1)
+    return plate
+
+def road_background(width, height, lanes):
+    background = np.full((height, width, 3), 85, dtype=np.uint8)
+    lane_height = height // lanes
+    for lane in range(1, lanes):
+        y = lane * lane_height
+        for x in range(0, width, 80):
+            cv2.rectangle(background, (x, y - 2), (x + 40, y + 2), (200, 200, 200), -1)
+    return background
+
+def plan_cars(rng, frames, width, lanes, density, speed_range):
+    """Cars with lane, direction, speed and first frame, about density of them on screen at once"""
+    cars = []
+    for lane in range(lanes):
+        next_frame = rng.randint(0, 30)
+        while next_frame < frames:
+            speed = rng.uniform(*speed_range)
+            crossing_frames = int((width + CAR_SIZE[0]) / speed)
+            cars.append({'text': random_plate(rng), 'lane': lane, 'speed': speed,
+                         'direction': 1 if lane % 2 == 0 else -1, 'first_frame': next_frame,
+                         'last_frame': min(frames - 1, next_frame + crossing_frames),
+                         'color': tuple(rng.randint(30, 160) for _ in range(3))})
+            # Space the cars of a lane so that about density cars are on screen over all lanes
+            next_frame += max(CAR_SIZE[0] // int(speed) + 1, int(crossing_frames * lanes / max(density, 1)))
+    return cars
+
+def generate_traffic_video(path, frames=300, width=1280, height=720, fps=25, density=4, lanes=4,
+                           speed_range=(6, 14), noise=4, seed=0):
+    """Write a synthetic traffic video to path and return its ground truth
+
+    Ground truth is {'frames', 'fps', 'size', 'plates': [{'text', 'first_frame', 'last_frame'}],
+    'boxes': {frame_index: [[x1, y1, x2, y2, text], ...]}} with 1-based frame indices like the
+    decoders; boxes are those of the plates fully inside the frame (4 px from the edge).
+    """
+    rng = random.Random(seed)
+    noise_rng = np.random.default_rng(seed)
+    lanes = max(1, min(lanes, height // CAR_SIZE[1]))
+    cars = plan_cars(rng, frames, width, lanes, density, speed_range)
+    plates = {car['text']: render_plate(car['text']) for car in cars}
+    background = road_background(width, height, lanes)
+    lane_height = height // lanes
+    car_width, car_height = CAR_SIZE
+    plate_width, plate_height = PLATE_SIZE
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, (width, height))
+    if not writer.isOpened():
+        raise Exception(f"Could not create video: {path}")
+    boxes = {}
+    try:
+        for frame_index in range(frames):
+            frame = background.copy()
+            visible = []
+            for car in cars:
+                if not car['first_frame'] <= frame_index <= car['last_frame']:
+                    continue
+                travelled = int((frame_index - car['first_frame']) * car['speed'])
+                x = -car_width + travelled if car['direction'] > 0 else width - travelled
+                y = car['lane'] * lane_height + (lane_height - car_height) // 2
+                draw_clipped(frame, x, y, np.full((car_height, car_width, 3), car['color'], dtype=np.uint8))
+                plate_x = x + (car_width - plate_width) // 2
+                plate_y = y + car_height - plate_height - 8
+                draw_clipped(frame, plate_x, plate_y, plates[car['text']])
+                if 4 <= plate_x and plate_x + plate_width <= width - 4:
+                    visible.append([plate_x, plate_y, plate_x + plate_width, plate_y + plate_height, car['text']])
+            if noise:
+                frame = cv2.add(frame, noise_rng.integers(0, noise, frame.shape, dtype=np.uint8))
+            writer.write(frame)
+            boxes[frame_index + 1] = visible
+    finally:
+        writer.release()
+
+    seen = {box[4] for frame_boxes in boxes.values() for box in frame_boxes}
+    return {
+        'frames': frames,
+        'fps': fps,
+        'size': [width, height],
+        'plates': [{'text': car['text'], 'first_frame': car['first_frame'] + 1, 'last_frame': car['last_frame'] + 1}
+                   for car in cars if car['text'] in seen],
+        'boxes': boxes
+    }
+
+def draw_clipped(frame, x, y, image):
+    """Paste image at (x, y), clipped to the frame"""
+    height, width = image.shape[:2]
+    x1, y1 = max(0, x), max(0, y)
+    x2, y2 = min(frame.shape[1], x + width), min(frame.shape[0], y + height)
+    if x1 < x2 and y1 < y2:
+        frame[y1:y2, x1:x2] = image[y1 - y:y2 - y, x1 - x:x2 - x]
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic traffic video with known plates")
+    parser.add_argument("output", help="Video to write (.avi, MJPG)")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--density", type=float, default=4, help="Average number of cars on screen")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    truth = generate_traffic_video(args.output, frames=args.frames, width=args.width, height=args.height,
+                                   density=args.density, seed=args.seed)
+    truth_path = args.output.rsplit('.', 1)[0] + '.json'
+    with open(truth_path, 'w') as f:
+        json.dump(truth, f)
+    print(f"Wrote {args.output} ({args.frames} frames, {len(truth['plates'])} plates) and {truth_path}")
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,3 @@
 from .car_detection import CarDetection
-from .licence_plate_detection import LicencePlateDetection
\ No newline at end of file
+from .licence_plate_detection import LicencePlateDetection
+from .plate_ocr import PlateOCRQueue, preprocess_plate_crop, parse_ocr_result, plate_sharpness
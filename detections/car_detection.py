@@ -1,29 +1,66 @@
 #Import All the Required Libraries
 import cv2
-import pickle
+import os
 from ultralytics import YOLO
+from pipeline.detection_archive import DetectionArchive, write_detection_archive
 
 class CarDetection:
-    def __init__(self, model_path):
+    # Inference parameters; they are part of the detection cache key
+    PREDICT_PARAMS = {'iou': 0.1, 'conf': 0.30}
+
+    def __init__(self, model_path, batch_size=8, device=None):
         self.model = YOLO(model_path)
+        self.model_path = model_path
+        # Number of frames handed to YOLO per predict call
+        self.batch_size = max(1, int(batch_size))
+        self.device = device
+        self.cache_view = None
+
+    def use_cache(self, cache, video_path):
+        """Take car boxes of video_path from a DetectionCache; frames missing from it are detected and stored"""
+        self.cache_view = cache.view(video_path, [self.model_path], {'detector': 'car', **self.PREDICT_PARAMS})
 
-    def detect_frames(self, frames, read_from_stub=False, stub_path=None):
-        car_detections = []
-        if read_from_stub and stub_path is not None:
-            with open(stub_path, 'rb') as f:
-                car_detections = pickle.load(f)
-            return car_detections
-        for frame in frames:
-            car_list = self.detect_frame(frame)
-            car_detections.append(car_list)
+    def detect_frames(self, frames, read_from_stub=False, stub_path=None, start_index=0):
+        """Car boxes per frame; start_index is the video frame index of frames[0], for the cache"""
+        if read_from_stub and stub_path is not None and os.path.exists(stub_path):
+            return self.load_stub(stub_path)
+        scored_detections = []
+        for start in range(0, len(frames), self.batch_size):
+            batch = frames[start:start + self.batch_size]
+            if self.cache_view is not None:
+                scored_detections.extend(self.cache_view.detect(batch, start_index + start, self.detect_batch, 6))
+            else:
+                scored_detections.extend(self.detect_batch(batch))
         if stub_path is not None:
-            with open(stub_path, 'wb') as f:
-                pickle.dump(car_detections, f)
-        return car_detections
+            self.save_stub(scored_detections, stub_path)
+        return [[row[:4] for row in rows] for rows in scored_detections]
+
+    def load_stub(self, stub_path):
+        """Open a stub as a DetectionArchive: stub[i] maps frame i's boxes without loading the rest"""
+        return DetectionArchive(stub_path)
+
+    def save_stub(self, car_detections, stub_path):
+        """Write per-frame car boxes ([x1, y1, x2, y2] or scored rows) as a DetectionArchive"""
+        write_detection_archive(stub_path, car_detections)
 
+    def detect_batch(self, frames):
+        """Scored car rows [x1, y1, x2, y2, conf, class_id] per frame"""
+        return [self.parse_scored_results(results) for results in self.predict(frames)]
+
+    def predict(self, frames):
+        """Run YOLO on a list of frames in a single call, one Results object per frame"""
+        kwargs = dict(self.PREDICT_PARAMS, verbose=False)
+        if self.device is not None:
+            kwargs['device'] = self.device
+        return self.model.predict(list(frames), **kwargs)
 
     def detect_frame(self, frame):
-        results = self.model.predict(frame, iou = 0.1, conf = 0.30)[0]
+        return self.parse_results(self.predict([frame])[0])
+
+    def parse_results(self, results):
+        return [row[:4] for row in self.parse_scored_results(results)]
+
+    def parse_scored_results(self, results):
         id_name_dict = results.names
         car_list = []
         for box in results.boxes:
@@ -31,7 +68,7 @@ class CarDetection:
             cls_id = int(box.cls.tolist()[0])
             cls_name = id_name_dict[cls_id]
             if cls_name == "car":
-                car_list.append(result)
+                car_list.append(result + [float(box.conf.tolist()[0]), cls_id])
         return car_list
 
     def draw_bboxes(self, video_frames, car_detections):
@@ -43,4 +80,4 @@ class CarDetection:
                             0.9, (0,255,0), 2)
                 cv2.rectangle(frame, (int(x1), int(y1)), (int(x2), int(y2)), (255,255,0), 2)
             output_video_frames.append(frame)
-        return output_video_frames
\ No newline at end of file
+        return output_video_frames
@@ -0,0 +1,42 @@
+#Import All the Required Libraries
+import cv2
+import numpy as np
+from pipeline.tracker import box_iou
+
+def letterbox(image, size=320, color=(114, 114, 114)):
+    """Resize image to fit a size x size square, keeping its aspect ratio, and pad the rest
+
+    Returns (square image, scale, (pad_x, pad_y)) so boxes can be mapped back.
+    """
+    height, width = image.shape[:2]
+    scale = min(size / float(width), size / float(height))
+    new_width = max(1, int(round(width * scale)))
+    new_height = max(1, int(round(height * scale)))
+    resized = cv2.resize(image, (new_width, new_height),
+                         interpolation=cv2.INTER_LINEAR if scale > 1 else cv2.INTER_AREA)
+    pad_x = (size - new_width) // 2
+    pad_y = (size - new_height) // 2
+    square = np.full((size, size, image.shape[2]), color, dtype=image.dtype)
+    square[pad_y:pad_y + new_height, pad_x:pad_x + new_width] = resized
+    return square, scale, (pad_x, pad_y)
+
+def unletterbox_box(box, scale, pad, offset=(0, 0)):
+    """Map a box from letterboxed crop coordinates back to frame coordinates"""
+    pad_x, pad_y = pad
+    offset_x, offset_y = offset
+    x1, y1, x2, y2 = box
+    return [int(round((x1 - pad_x) / scale)) + offset_x,
+            int(round((y1 - pad_y) / scale)) + offset_y,
+            int(round((x2 - pad_x) / scale)) + offset_x,
+            int(round((y2 - pad_y) / scale)) + offset_y]
+
+def merge_overlapping_plates(plates, iou_threshold=0.5):
+    """Drop (box, conf, car_box) plates that overlap a more confident one
+
+    Overlapping car boxes can contain the same plate, which must only be reported once.
+    """
+    kept = []
+    for plate in sorted(plates, key=lambda plate: plate[1], reverse=True):
+        if all(box_iou(plate[0], other[0]) < iou_threshold for other in kept):
+            kept.append(plate)
+    return kept
@@ -2,25 +2,68 @@
 import cv2
 from ultralytics import YOLO
 from paddleocr import PaddleOCR
+from .plate_ocr import PlateOCRQueue
 
 class LicencePlateDetection:
-    def __init__(self, model_path):
+    # Inference parameters; they are part of the detection cache key
+    PREDICT_PARAMS = {}
+
+    def __init__(self, model_path, batch_size=8, device=None, ocr_batch_size=32):
         self.model = YOLO(model_path)
+        self.model_path = model_path
         self.ocr = PaddleOCR(use_angle_cls=True, lang='en')  # PaddleOCR instance
-    def detect_frames(self, frames):
+        # Plate crops from a whole batch of frames are recognized together
+        self.ocr_queue = PlateOCRQueue(self.ocr, max_batch_size=ocr_batch_size)
+        # Number of frames handed to YOLO per predict call
+        self.batch_size = max(1, int(batch_size))
+        self.device = device
+        self.cache_view = None
+
+    def use_cache(self, cache, video_path):
+        """Take plate boxes of video_path from a DetectionCache; OCR still runs on the cached boxes"""
+        self.cache_view = cache.view(video_path, [self.model_path], {'detector': 'licence_plate', **self.PREDICT_PARAMS})
+
+    def detect_frames(self, frames, start_index=0):
+        """Plate boxes and texts per frame; start_index is the video frame index of frames[0], for the cache"""
         licence_plate_detections = []
         licence_plate_texts = []
-        for frame in frames:
-            bbox_list, text_list = self.detect_frame(frame)
-            licence_plate_detections.append(bbox_list)
-            licence_plate_texts.append(text_list)
+        for start in range(0, len(frames), self.batch_size):
+            batch = frames[start:start + self.batch_size]
+            if self.cache_view is not None:
+                box_lists = self.cache_view.detect(batch, start_index + start, self.detect_batch, 4)
+            else:
+                box_lists = self.detect_batch(batch)
+            bbox_lists = [self.queue_plates(frame, boxes, frame_key=i)
+                          for i, (frame, boxes) in enumerate(zip(batch, box_lists))]
+            texts = self.ocr_queue.flush()
+            for i, bbox_list in enumerate(bbox_lists):
+                licence_plate_detections.append(bbox_list)
+                licence_plate_texts.append(self.texts_for_frame(texts, i, len(bbox_list)))
         return licence_plate_detections, licence_plate_texts
 
+    def detect_batch(self, frames):
+        return [self.plate_boxes(results) for results in self.predict(frames)]
+
+    def predict(self, frames):
+        """Run YOLO on a list of frames in a single call, one Results object per frame"""
+        kwargs = dict(self.PREDICT_PARAMS, verbose=False)
+        if self.device is not None:
+            kwargs['device'] = self.device
+        return self.model.predict(list(frames), **kwargs)
+
     def detect_frame(self, frame):
-        results = self.model.predict(frame)[0]
+        licence_plate_list = self.parse_results(frame, self.predict([frame])[0])
+        texts = self.ocr_queue.flush()
+        return licence_plate_list, self.texts_for_frame(texts, 0, len(licence_plate_list))
+
+    def parse_results(self, frame, results, frame_key=0):
+        """Collect plate boxes for one frame and queue their crops for OCR"""
+        return self.queue_plates(frame, self.plate_boxes(results), frame_key)
+
+    def plate_boxes(self, results):
+        """Licence plate boxes of one YOLO result"""
         id_name_dict = results.names
         licence_plate_list = []
-        licence_plate_texts = []
         for box in results.boxes:
             result = box.xyxy.tolist()[0]
             cls_id = int(box.cls.tolist()[0])
@@ -28,27 +71,27 @@ class LicencePlateDetection:
 
             if cls_name == "License_Plate":
                 licence_plate_list.append(result)
-                # Crop the license plate region
-                x1, y1, x2, y2 = map(int, result)
-                cropped_plate = frame[y1:y2, x1:x2]
-
-                # Always apply preprocessing
-                gray = cv2.cvtColor(cropped_plate, cv2.COLOR_BGR2GRAY)
-                resized = cv2.resize(gray, None, fx=2, fy=2)
-                cropped_plate = cv2.cvtColor(resized, cv2.COLOR_GRAY2BGR)
-
-                # Run OCR
-                ocr_result = self.ocr.ocr(cropped_plate)
-                #print(ocr_result)
-                #text = ocr_result[0][0][1][0] if ocr_result and ocr_result[0] else "N/A"
-                # Extract text safely
-                if ocr_result and "rec_texts" in ocr_result[0] and ocr_result[0]["rec_texts"]:
-                    text = ocr_result[0]["rec_texts"][0]
-                    print("Licence Text", text)
-                else:
-                    text = "N/A"
-                licence_plate_texts.append(text)
-        return licence_plate_list, licence_plate_texts
+        return licence_plate_list
+
+    def queue_plates(self, frame, licence_plate_list, frame_key=0):
+        """Queue the crop of every plate box of one frame for OCR"""
+        for plate_idx, result in enumerate(licence_plate_list):
+            # Crop the license plate region
+            x1, y1, x2, y2 = map(int, result)
+            cropped_plate = frame[y1:y2, x1:x2]
+            if cropped_plate.size > 0:
+                self.ocr_queue.add((frame_key, plate_idx), cropped_plate)
+        return licence_plate_list
+
+    def texts_for_frame(self, texts, frame_key, num_plates):
+        """Route recognized texts back to the plate boxes of one frame"""
+        licence_plate_texts = []
+        for plate_idx in range(num_plates):
+            text, _ = texts.get((frame_key, plate_idx), ("N/A", 0.0))
+            if text != "N/A":
+                print("Licence Text", text)
+            licence_plate_texts.append(text)
+        return licence_plate_texts
 
     def draw_bboxes(self, video_frames, licence_plate_detections, licence_plate_texts):
         output_video_frames = []
@@ -60,4 +103,3 @@ class LicencePlateDetection:
                             (255, 255,0), 2)
             output_video_frames.append(frame)
         return output_video_frames
-
@@ -0,0 +1,104 @@
+#Import All the Required Libraries
+import cv2
+
+def preprocess_plate_crop(cropped_plate, target_height=64):
+    """Grayscale a plate crop and scale it to a common height so crops can share a batch"""
+    gray = cv2.cvtColor(cropped_plate, cv2.COLOR_BGR2GRAY)
+    height, width = gray.shape[:2]
+    scale = target_height / float(height)
+    resized = cv2.resize(gray, (max(1, int(round(width * scale))), target_height),
+                         interpolation=cv2.INTER_CUBIC if scale > 1 else cv2.INTER_AREA)
+    return cv2.cvtColor(resized, cv2.COLOR_GRAY2BGR)
+
+def parse_ocr_result(result):
+    """Extract (text, score) from one image's OCR result in any PaddleOCR output format"""
+    if not result:
+        return "N/A", 0.0
+    # New format: {"rec_texts": [...], "rec_scores": [...]} (PaddleOCR pipeline)
+    if hasattr(result, 'get') and result.get('rec_texts'):
+        scores = result.get('rec_scores') or [0.0]
+        return result['rec_texts'][0], float(scores[0])
+    # Recognition-only format: {"rec_text": ..., "rec_score": ...}
+    if hasattr(result, 'get') and result.get('rec_text'):
+        return result['rec_text'], float(result.get('rec_score', 0.0))
+    # Old format: [[[x1,y1,x2,y2], (text, confidence)], ...] or [(text, confidence)]
+    if isinstance(result, (list, tuple)):
+        line = result[0]
+        if isinstance(line, (list, tuple)) and len(line) > 1 and isinstance(line[1], (list, tuple)):
+            return line[1][0], float(line[1][1])
+        if isinstance(line, (list, tuple)) and len(line) > 1 and isinstance(line[0], str):
+            return line[0], float(line[1])
+    return "N/A", 0.0
+
+class PlateOCRQueue:
+    """Collects plate crops from one or more frames and recognizes them in batched OCR calls"""
+    def __init__(self, ocr, target_height=64, max_batch_size=32):
+        self.ocr = ocr
+        self.target_height = target_height
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.keys = []
+        self.crops = []
+        self.ocr_calls = 0
+
+    def __len__(self):
+        return len(self.crops)
+
+    def add(self, key, cropped_plate):
+        """Queue a BGR plate crop under key and return the preprocessed crop"""
+        prepared = preprocess_plate_crop(cropped_plate, self.target_height)
+        self.keys.append(key)
+        self.crops.append(prepared)
+        return prepared
+
+    def flush(self):
+        """Recognize every queued crop and return {key: (text, score)}"""
+        keys, crops = self.keys, self.crops
+        self.keys, self.crops = [], []
+        return dict(zip(keys, self.recognize_all(crops)))
+
+    def recognize_all(self, crops):
+        """Recognize already preprocessed crops in batches of max_batch_size, in order"""
+        texts = []
+        for start in range(0, len(crops), self.max_batch_size):
+            texts.extend(self.recognize(crops[start:start + self.max_batch_size]))
+        return texts
+
+    def recognize(self, crops):
+        """Run OCR on a list of crops, falling back to one call per crop if batching fails"""
+        try:
+            recognized = self.recognize_batch(crops)
+            if recognized is not None:
+                return recognized
+        except Exception as e:
+            print(f"Batched OCR failed, retrying per crop: {e}")
+        return [self.recognize_one(crop) for crop in crops]
+
+    def recognize_batch(self, crops):
+        """One OCR call for every crop; None if the result does not line up with the crops"""
+        if hasattr(self.ocr, 'predict'):
+            # PaddleOCR 3.x accepts a list of images and returns one result per image
+            results = list(self.ocr.predict(crops))
+            self.ocr_calls += 1
+            if len(results) == len(crops):
+                return [parse_ocr_result(result) for result in results]
+        else:
+            # PaddleOCR 2.x recognition-only mode returns [[(text, score), ...]]
+            results = self.ocr.ocr(crops, det=False, cls=False)
+            self.ocr_calls += 1
+            if results and len(results[0]) == len(crops):
+                return [(text, float(score)) for text, score in results[0]]
+        return None
+
+    def recognize_one(self, crop):
+        """One OCR call for a single crop, through the same API as the batched call"""
+        if hasattr(self.ocr, 'predict'):
+            result = list(self.ocr.predict(crop))
+        else:
+            result = self.ocr.ocr(crop)
+        self.ocr_calls += 1
+        return parse_ocr_result(result[0] if result else None)
+
+def plate_sharpness(cropped_plate):
+    """Variance of the Laplacian; higher means a sharper crop"""
+    gray = cv2.cvtColor(cropped_plate, cv2.COLOR_BGR2GRAY)
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
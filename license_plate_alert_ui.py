@@ -1,35 +1,27 @@
 import cv2
-from ultralytics import YOLO
-import cvzone
-from paddleocr import PaddleOCR
 from datetime import datetime
-import numpy as np
-import re
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
 import threading
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.image import MIMEImage
 import os
-import json
-from PIL import Image, ImageTk
 import requests
-import time
-import uuid
-from difflib import SequenceMatcher
 import io
-from reportlab.lib.pagesizes import letter, A4
+from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image as RLImage, PageBreak
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.graphics.shapes import Drawing, Rect
-from reportlab.graphics import renderPDF
-import base64
-from io import BytesIO
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.enums import TA_CENTER
+from reportlab.graphics.shapes import Drawing
+from pipeline.engine import PlateAlertEngine
+from pipeline.ui_channel import UIUpdateChannel
+
+# Pipeline threads never touch widgets; the GUI applies their updates this often
+UI_POLL_MS = 200
+# Older lines are trimmed from the log and detection views beyond this
+MAX_TEXT_LINES = 5000
+# Closing the window waits this many seconds for queued alerts to be delivered
+CLOSE_ALERT_TIMEOUT = 10
 
 class LicensePlateAlertSystem:
     def __init__(self, root):
@@ -37,101 +29,33 @@ class LicensePlateAlertSystem:
         self.root.title("Enhanced License Plate Alert System")
         self.root.geometry("1200x900")
         
-        # Initialize variables
-        self.model = None
-        self.car_model = None
-        self.ocr = None
-        self.cap = None
+        # Progress, log lines and alerts from pipeline threads collect here until the next poll
+        self.ui_channel = UIUpdateChannel()
+        
+        # Detection, OCR, dedup and alerting run in the engine; this window is one client of it
+        self.engine = PlateAlertEngine(
+            settings_path='license_plate_settings.json',
+            store_path='detection_history.db',
+            spool_dir='alert_outbox',
+            cache_path='detection_cache.db',
+            log=self.log_message,
+            on_progress=self.on_engine_progress,
+            on_detection=self.ui_channel.add_detection,
+            on_alert=self.on_engine_alert)
         self.is_processing = False
+        self.paused = False
         self.video_path = ""
-        self.watch_list = set()
-        self.alert_contacts = {}
-        self.vehicle_details = {}
-        self.detected_plates_data = {}
-        self.saved_ids = set()
-        self.id_to_plate = {}
-        self.id_confidence_scores = {}
         self.processing_thread = None
-        self.detected_plates = set()
-        self.alerts_sent_count = 0
         self.ocr_method = 'PaddleOCR'
         self.gemini_api_key = ''
         self.gemini_model = None
-        self.expected_plates_video4 = [
-            'R183JF', 'N894JV', 'L656XH', 'H644LX', 'K884RS'
-        ]
-        
-        self.recent_plates = {}
-        
-        # Location mapping based on video files
-        self.location_mapping = {
-            'vid1': {
-                'name': 'Rajajinagar Modi Hospital Signal',
-                'city': 'Bangalore',
-                'state': 'Karnataka',
-                'country': 'India',
-                'pincode': '560010',
-                'coordinates': {
-                    'latitude': 12.9996,
-                    'longitude': 77.5519
-                },
-                'full_address': 'Rajajinagar Modi Hospital Signal, Bangalore - 560010, Karnataka, India'
-            },
-            'video4': {
-                'name': 'West Bank Signal',
-                'city': 'Miami',
-                'state': 'Florida',
-                'country': 'USA',
-                'zipcode': '33101',
-                'coordinates': {
-                    'latitude': 25.7617,
-                    'longitude': -80.1918
-                },
-                'full_address': 'West Bank Signal, Miami, FL 33101, USA'
-            }
-        }
-        
-        # Email configuration
-        self.email_config = {
-            'smtp_server': '',
-            'smtp_port': 587,
-            'email': '',
-            'password': ''
-        }
-        
-        # Telegram configuration
-        self.telegram_config = {
-            'bot_token': '',
-            'enabled': False
-        }
         
         self.setup_ui()
         self.load_settings()
         
-    def get_location_from_video(self, video_path):
-        """Get location information based on video file name"""
-        if not video_path:
-            return None
-            
-        video_name = os.path.basename(video_path).lower()
+        self.engine.start()
+        self.root.after(UI_POLL_MS, self.poll_ui_updates)
         
-        # Check for vid1 (including variations)
-        if 'vid1' in video_name:
-            return self.location_mapping['vid1']
-        # Check for video4 (including variations)
-        elif 'video4' in video_name:
-            return self.location_mapping['video4']
-        else:
-            # Default location if no match found
-            return {
-                'name': 'Unknown Location',
-                'city': 'Unknown',
-                'state': 'Unknown',
-                'country': 'Unknown',
-                'coordinates': {'latitude': 0.0, 'longitude': 0.0},
-                'full_address': 'Location not specified'
-            }
-    
     def setup_ui(self):
         # Create notebook for tabs
         notebook = ttk.Notebook(self.root)
@@ -174,6 +98,8 @@ class LicensePlateAlertSystem:
         
         ttk.Button(video_frame, text="Select Video File", 
                   command=self.select_video).pack(side='left', padx=5, pady=5)
+        ttk.Button(video_frame, text="Open Live Stream", 
+                  command=self.select_stream).pack(side='left', padx=5, pady=5)
         
         self.video_label = ttk.Label(video_frame, text="No video selected")
         self.video_label.pack(side='left', padx=5, pady=5)
@@ -559,9 +485,10 @@ Example Watch List entry:
         }
         
         # Add to collections
-        self.watch_list.add(plate)
-        self.alert_contacts[plate] = {'contact': contact, 'type': contact_type}
-        self.vehicle_details[plate] = vehicle_details
+        self.engine.watch_list.add(plate)
+        self.engine.watchlist_index.add(plate)
+        self.engine.alert_contacts[plate] = {'contact': contact, 'type': contact_type}
+        self.engine.vehicle_details[plate] = vehicle_details
         
         # Add to treeview
         self.watchlist_tree.insert('', 'end', values=(
@@ -590,12 +517,12 @@ Example Watch List entry:
         values = self.watchlist_tree.item(item, 'values')
         plate = values[0]
         
-        if plate not in self.vehicle_details:
+        if plate not in self.engine.vehicle_details:
             messagebox.showerror("Error", "Vehicle details not found")
             return
         
-        details = self.vehicle_details[plate]
-        contact_info = self.alert_contacts.get(plate, {})
+        details = self.engine.vehicle_details[plate]
+        contact_info = self.engine.alert_contacts.get(plate, {})
         
         # Create details window
         details_window = tk.Toplevel(self.root)
@@ -658,13 +585,13 @@ Date Added: {details.get('date_added', 'Date not specified')}
         values = self.watchlist_tree.item(item, 'values')
         plate = values[0]
         
-        if plate not in self.vehicle_details:
+        if plate not in self.engine.vehicle_details:
             messagebox.showerror("Error", "Vehicle details not found")
             return
         
         # Pre-fill form with existing data
-        details = self.vehicle_details[plate]
-        contact_info = self.alert_contacts.get(plate, {})
+        details = self.engine.vehicle_details[plate]
+        contact_info = self.engine.alert_contacts.get(plate, {})
         
         # Clear form first
         self.clear_form()
@@ -680,11 +607,12 @@ Date Added: {details.get('date_added', 'Date not specified')}
         self.case_details_entry.insert(1.0, details.get('case_details', ''))
         
         # Remove from current lists (will be re-added when form is submitted)
-        self.watch_list.discard(plate)
-        if plate in self.alert_contacts:
-            del self.alert_contacts[plate]
-        if plate in self.vehicle_details:
-            del self.vehicle_details[plate]
+        self.engine.watch_list.discard(plate)
+        self.engine.watchlist_index.remove(plate)
+        if plate in self.engine.alert_contacts:
+            del self.engine.alert_contacts[plate]
+        if plate in self.engine.vehicle_details:
+            del self.engine.vehicle_details[plate]
         
         self.watchlist_tree.delete(item)
         
@@ -706,17 +634,17 @@ Date Added: {details.get('date_added', 'Date not specified')}
             plate = values[1]  # License plate is in column 1
             
             # Remove from detected plates data
-            if plate in self.detected_plates_data:
-                del self.detected_plates_data[plate]
+            if plate in self.engine.detected_plates_data:
+                del self.engine.detected_plates_data[plate]
+                self.engine.detection_store.remove(plate)
             
             # Remove from tree
             self.detected_tree.delete(item)
             
             self.log_message(f"Removed detected plate: {plate}")
         
-        # Update statistics and save settings
+        # Update statistics
         self.update_detection_stats()
-        self.save_settings()
 
     def view_detected_details(self):
         """View detailed information of detected vehicle with enhanced location info and PDF export"""
@@ -730,11 +658,11 @@ Date Added: {details.get('date_added', 'Date not specified')}
         detection_time = values[0]
         plate = values[1]
         
-        if plate not in self.detected_plates_data:
+        if plate not in self.engine.detected_plates_data:
             messagebox.showerror("Error", "Detection details not found")
             return
         
-        detection_data = self.detected_plates_data[plate]
+        detection_data = self.engine.detected_plates_data[plate]
         
         # Create details window
         details_window = tk.Toplevel(self.root)
@@ -834,7 +762,7 @@ Processing Status: {detection_data.get('status', 'Processed')}
     def export_detection_pdf(self, plate):
         """Export professional PDF report for detected vehicle"""
         try:
-            if plate not in self.detected_plates_data:
+            if plate not in self.engine.detected_plates_data:
                 messagebox.showerror("Error", "Detection data not found")
                 return
             
@@ -848,7 +776,7 @@ Processing Status: {detection_data.get('status', 'Processed')}
             if not file_path:
                 return
             
-            detection_data = self.detected_plates_data[plate]
+            detection_data = self.engine.detected_plates_data[plate]
             location_info = detection_data.get('location_info', {})
             
             # Create PDF document
@@ -1122,9 +1050,10 @@ Processing Status: {detection_data.get('status', 'Processed')}
         plate = values[1]
         
         # Update status in detected plates data
-        if plate in self.detected_plates_data:
-            self.detected_plates_data[plate]['case_status'] = 'Resolved'
-            self.detected_plates_data[plate]['resolved_time'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if plate in self.engine.detected_plates_data:
+            self.engine.detected_plates_data[plate]['case_status'] = 'Resolved'
+            self.engine.detected_plates_data[plate]['resolved_time'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.engine.detection_store.append(plate, self.engine.detected_plates_data[plate])
         
         # Update treeview
         current_values = list(values)
@@ -1132,7 +1061,6 @@ Processing Status: {detection_data.get('status', 'Processed')}
         self.detected_tree.item(item, values=current_values)
         
         self.log_message(f"Case marked as resolved: {plate}")
-        self.save_settings()
         self.update_detection_stats()
     
     def send_followup_alert(self):
@@ -1146,11 +1074,11 @@ Processing Status: {detection_data.get('status', 'Processed')}
         values = self.detected_tree.item(item, 'values')
         plate = values[1]
         
-        if plate not in self.detected_plates_data:
+        if plate not in self.engine.detected_plates_data:
             messagebox.showerror("Error", "Detection data not found")
             return
         
-        detection_data = self.detected_plates_data[plate]
+        detection_data = self.engine.detected_plates_data[plate]
         
         try:
             # Send follow-up alert
@@ -1187,18 +1115,18 @@ Processing Status: {detection_data.get('status', 'Processed')}
             
         elif contact_type == "Email":
             followup_message = f"FOLLOW-UP ALERT: License plate '{plate}' case update.\nOriginal Detection: {detection_data.get('detection_time', 'Unknown')}\nLocation: {location_info.get('full_address', 'Location not available')}\nFollow-up Time: {timestamp}\nOwner: {detection_data.get('owner_name', 'Unknown')}"
-            self.send_email_alert(plate, contact, None, followup_message, detection_data)
+            self.engine.send_email_alert(plate, contact, None, followup_message, detection_data)
         
         # Log follow-up alert
         self.log_message(f"Follow-up alert sent for {plate} to {contact}")
     
     def update_detection_stats(self):
         """Update detection statistics display"""
-        total_detections = len(self.detected_plates_data)
-        resolved_cases = sum(1 for data in self.detected_plates_data.values() 
+        total_detections = len(self.engine.detected_plates_data)
+        resolved_cases = sum(1 for data in self.engine.detected_plates_data.values() 
                            if data.get('case_status') == 'Resolved')
         active_cases = total_detections - resolved_cases
-        high_priority = sum(1 for data in self.detected_plates_data.values() 
+        high_priority = sum(1 for data in self.engine.detected_plates_data.values() 
                           if data.get('case_priority') == 'High' and data.get('case_status') != 'Resolved')
         
         stats_text = f"Total Detections: {total_detections} | Active Cases: {active_cases} | Resolved: {resolved_cases} | High Priority Active: {high_priority}"
@@ -1214,7 +1142,22 @@ Processing Status: {detection_data.get('status', 'Processed')}
             self.video_label.config(text=f"Selected: {os.path.basename(file_path)}")
             
             # Update location display based on video file
-            location_info = self.get_location_from_video(file_path)
+            location_info = self.engine.get_location_from_video(file_path)
+            if location_info:
+                location_text = f"📍 Monitoring Location: {location_info['full_address']}"
+                self.location_label.config(text=location_text)
+            
+            self.update_start_button_state()
+    
+    def select_stream(self):
+        stream_url = simpledialog.askstring(
+            "Open Live Stream",
+            "Enter a stream URL (rtsp://, http://), a camera index (0) or fake://path/to/video.mp4:")
+        if stream_url and stream_url.strip():
+            self.video_path = stream_url.strip()
+            self.video_label.config(text=f"Live: {self.video_path}")
+            
+            location_info = self.engine.get_location_from_video(self.video_path)
             if location_info:
                 location_text = f"📍 Monitoring Location: {location_info['full_address']}"
                 self.location_label.config(text=location_text)
@@ -1228,19 +1171,9 @@ Processing Status: {detection_data.get('status', 'Processed')}
         )
         if model_path:
             try:
-                self.log_message("Loading YOLO model...")
-                self.model = YOLO(model_path)
-                self.log_message(f"Model class names: {self.model.names}")
-                self.log_message("Loading PaddleOCR...")
-                self.ocr = PaddleOCR(
-                    use_doc_orientation_classify=False,
-                    use_doc_unwarping=False,
-                    use_textline_orientation=False,
-                    lang='en'
-                )
+                self.engine.load_model(model_path)
                 self.model_label.config(text="Model loaded successfully")
                 self.update_start_button_state()
-                self.log_message("Model and OCR loaded successfully")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load model: {str(e)}")
                 self.log_message(f"Error loading model: {str(e)}")
@@ -1252,17 +1185,14 @@ Processing Status: {detection_data.get('status', 'Processed')}
         )
         if model_path:
             try:
-                self.log_message("Loading YOLO car model...")
-                from ultralytics import YOLO
-                self.car_model = YOLO(model_path)
+                self.engine.load_car_model(model_path)
                 self.car_model_label.config(text="Car model loaded successfully")
-                self.log_message("Car model loaded successfully")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load car model: {str(e)}")
                 self.log_message(f"Error loading car model: {str(e)}")
     
     def update_start_button_state(self):
-        if self.video_path and self.model and not self.is_processing:
+        if self.video_path and self.engine.model and not self.is_processing:
             self.start_button.config(state='normal')
         else:
             self.start_button.config(state='disabled')
@@ -1277,11 +1207,12 @@ Processing Status: {detection_data.get('status', 'Processed')}
             values = self.watchlist_tree.item(item, 'values')
             plate = values[0]
             
-            self.watch_list.discard(plate)
-            if plate in self.alert_contacts:
-                del self.alert_contacts[plate]
-            if plate in self.vehicle_details:
-                del self.vehicle_details[plate]
+            self.engine.watch_list.discard(plate)
+            self.engine.watchlist_index.remove(plate)
+            if plate in self.engine.alert_contacts:
+                del self.engine.alert_contacts[plate]
+            if plate in self.engine.vehicle_details:
+                del self.engine.vehicle_details[plate]
             
             self.watchlist_tree.delete(item)
             self.log_message(f"Removed from watch list: {plate}")
@@ -1289,7 +1220,7 @@ Processing Status: {detection_data.get('status', 'Processed')}
         self.save_settings()
     
     def save_email_settings(self):
-        self.email_config = {
+        self.engine.email_config = {
             'smtp_server': self.smtp_server_entry.get(),
             'smtp_port': int(self.smtp_port_entry.get()) if self.smtp_port_entry.get().isdigit() else 587,
             'email': self.email_entry.get(),
@@ -1301,7 +1232,7 @@ Processing Status: {detection_data.get('status', 'Processed')}
     
     def save_telegram_settings(self):
         """Save Telegram settings"""
-        self.telegram_config = {
+        self.engine.telegram_config = {
             'bot_token': self.telegram_token_entry.get().strip(),
             'enabled': self.telegram_enabled.get()
         }
@@ -1328,7 +1259,7 @@ Processing Status: {detection_data.get('status', 'Processed')}
                     'country': 'Test Country'
                 }
             }
-            self.send_email_alert("TEST123", self.email_config['email'], None, "This is a test email alert", test_data)
+            self.engine.send_email_alert("TEST123", self.engine.email_config['email'], None, "This is a test email alert", test_data)
             messagebox.showinfo("Success", "Test email sent successfully")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to send test email: {str(e)}")
@@ -1460,7 +1391,7 @@ Processing Status: {detection_data.get('status', 'Processed')}
     def send_telegram_alert(self, chat_id, message, plate_image=None):
         """Send alert via Telegram bot"""
         try:
-            bot_token = self.telegram_config.get('bot_token', '')
+            bot_token = self.engine.telegram_config.get('bot_token', '')
             if not bot_token:
                 raise Exception("Telegram bot token not configured")
             
@@ -1494,7 +1425,7 @@ Processing Status: {detection_data.get('status', 'Processed')}
     def send_telegram_image(self, chat_id, image, caption=""):
         """Send image via Telegram bot"""
         try:
-            bot_token = self.telegram_config.get('bot_token', '')
+            bot_token = self.engine.telegram_config.get('bot_token', '')
             url = f"https://api.telegram.org/bot{bot_token}/sendPhoto"
             
             # Convert OpenCV image to bytes
@@ -1521,7 +1452,7 @@ Processing Status: {detection_data.get('status', 'Processed')}
             raise Exception(f"Failed to send Telegram image: {str(e)}")
     
     def start_processing(self):
-        if not self.watch_list:
+        if not self.engine.watch_list:
             result = messagebox.askyesno("Warning", "No license plates in watch list. Continue anyway?")
             if not result:
                 return
@@ -1531,34 +1462,29 @@ Processing Status: {detection_data.get('status', 'Processed')}
         self.stop_button.config(state='normal')
         self.pause_button.config(state='normal')
         
-        # Reset tracking variables
-        self.saved_ids.clear()
-        self.id_to_plate.clear()
-        self.id_confidence_scores.clear()
-        self.detected_plates.clear()
-        self.alerts_sent_count = 0
-        self.recent_plates.clear()
-        
         # Start processing in a separate thread
         self.processing_thread = threading.Thread(target=self.process_video, daemon=True)
         self.processing_thread.start()
     
     def stop_processing(self):
+        # The engine sees the flag through should_stop and releases the capture itself
         self.is_processing = False
-        if self.cap:
-            self.cap.release()
         cv2.destroyAllWindows()
         self.update_ui_after_stop()
         self.log_message("Processing stopped by user")
     
+    def on_close(self):
+        """Stop processing and let queued alerts go out before the window closes"""
+        self.is_processing = False
+        if self.processing_thread is not None:
+            self.processing_thread.join(timeout=5)
+        self.engine.close(timeout=CLOSE_ALERT_TIMEOUT)
+        self.root.destroy()
+    
     def pause_processing(self):
         # Toggle pause state
-        if hasattr(self, 'paused'):
-            self.paused = not self.paused
-            self.pause_button.config(text="Resume" if self.paused else "Pause")
-        else:
-            self.paused = True
-            self.pause_button.config(text="Resume")
+        self.paused = not self.paused
+        self.pause_button.config(text="Resume" if self.paused else "Pause")
     
     def update_ui_after_stop(self):
         self.start_button.config(state='normal')
@@ -1568,100 +1494,78 @@ Processing Status: {detection_data.get('status', 'Processed')}
         self.progress.config(value=0)
         self.progress_label.config(text="0%")
     
+    def on_engine_progress(self, frame_count, total_frames, processing_fps, queue_depths):
+        """Record engine progress; called from the reader thread, shown by the next poll"""
+        self.ui_channel.set_progress(frame_count=frame_count, total_frames=total_frames,
+                                     processing_fps=processing_fps, queue_depths=queue_depths)
+    
+    def on_engine_alert(self, plate_number, detection_data, alert_display):
+        """Record a queued watch-list alert for the detected plates tab and the detection log"""
+        self.ui_channel.add_alert((plate_number, detection_data))
+        self.ui_channel.add_detection(alert_display)
+    
+    def poll_ui_updates(self):
+        """Apply everything pipeline threads recorded since the last poll, then poll again"""
+        try:
+            update = self.ui_channel.drain()
+            if update['progress'] is not None:
+                self.show_progress(**update['progress'])
+            if update['dropped']:
+                update['logs'].append(f"[{update['dropped']} log/detection lines dropped while the view caught up]\n")
+            if update['logs']:
+                self.append_text(self.logs_text, "".join(update['logs']))
+            if update['detections']:
+                self.append_text(self.detection_text, "".join(line + "\n" for line in update['detections']))
+            for plate_number, detection_data in update['alerts']:
+                location_info = detection_data.get('location_info')
+                self.detected_tree.insert('', 'end', values=(
+                    detection_data['detection_time'],
+                    plate_number,
+                    detection_data['owner_name'],
+                    location_info.get('name', 'Unknown location') if location_info else 'Unknown location',
+                    detection_data['vehicle_details'],
+                    detection_data['case_priority'],
+                    'Yes',
+                    'Active'
+                ))
+            if update['alerts']:
+                self.update_detection_stats()
+        finally:
+            self.root.after(UI_POLL_MS, self.poll_ui_updates)
+    
+    def show_progress(self, frame_count, total_frames, processing_fps, queue_depths):
+        if total_frames > 0:
+            self.progress.config(maximum=total_frames, value=frame_count)
+            self.progress_label.config(text=f"{frame_count / total_frames * 100:.1f}%")
+            self.status_label.config(text=f"Processing frame {frame_count}/{total_frames}")
+        else:
+            self.status_label.config(text=f"Processing frame {frame_count}")
+        self.fps_label.config(text=f"Speed: {processing_fps:.1f} FPS | Queues: " +
+                              " ".join(f"{name}={depth}" for name, depth in queue_depths.items()))
+    
+    def append_text(self, text_widget, text):
+        """Insert a batch of lines into a read-only text view, keeping the last MAX_TEXT_LINES"""
+        text_widget.config(state='normal')
+        text_widget.insert(tk.END, text)
+        line_count = int(text_widget.index('end-1c').split('.')[0])
+        if line_count > MAX_TEXT_LINES:
+            text_widget.delete(1.0, f"{line_count - MAX_TEXT_LINES + 1}.0")
+        text_widget.see(tk.END)
+        text_widget.config(state='disabled')
+    
     def process_video(self):
         try:
-            self.cap = cv2.VideoCapture(self.video_path)
-            
-            if not self.cap.isOpened():
-                raise Exception("Could not open video file")
-            
-            total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            fps = self.cap.get(cv2.CAP_PROP_FPS)
+            self.paused = False
+            summary = self.engine.process_video(self.video_path,
+                                                should_stop=lambda: not self.is_processing,
+                                                is_paused=lambda: self.paused)
+            frame_count = summary['frames']
             
-            self.root.after(0, lambda: self.progress.config(maximum=total_frames))
-            
-            frame_count = 0
-            start_time = time.time()
-            
-            self.log_message(f"Started processing video: {total_frames} frames at {fps:.2f} FPS")
-            
-            while self.is_processing and frame_count < total_frames:
-                # Handle pause
-                if hasattr(self, 'paused') and self.paused:
-                    time.sleep(0.1)
-                    continue
-                
-                ret, frame = self.cap.read()
-                if not ret:
-                    self.log_message("End of video reached or failed to read frame")
-                    break
-                
-                frame_count += 1
-                
-                # Update progress
-                progress_percent = (frame_count / total_frames) * 100
-                self.root.after(0, lambda p=frame_count: self.progress.config(value=p))
-                self.root.after(0, lambda pp=progress_percent: self.progress_label.config(text=f"{pp:.1f}%"))
-                
-                # Calculate processing FPS
-                elapsed_time = time.time() - start_time
-                processing_fps = frame_count / elapsed_time if elapsed_time > 0 else 0
-                
-                # Process every 2nd frame for better performance
-                if frame_count % 2 != 0:
-                    continue
-                
-                try:
-                    frame = cv2.resize(frame, (1020, 600))
-                    # Two-stage detection: car model + plate model
-                    if self.car_model is not None:
-                        car_results = self.car_model(frame)
-                        car_boxes = car_results[0].boxes
-                        if car_boxes is not None:
-                            for car_box in car_boxes:
-                                x1c, y1c, x2c, y2c = map(int, car_box.xyxy[0])
-                                car_crop = frame[y1c:y2c, x1c:x2c]
-                                if car_crop.size == 0:
-                                    continue
-                                # Run plate detector on car crop
-                                plate_results = self.model(car_crop)
-                                plate_boxes = plate_results[0].boxes
-                                if plate_boxes is not None:
-                                    for plate_box in plate_boxes:
-                                        # Adjust plate box coordinates to original frame
-                                        x1p, y1p, x2p, y2p = map(int, plate_box.xyxy[0])
-                                        # Offset by car crop position
-                                        abs_box = [x1c + x1p, y1c + y1p, x1c + x2p, y1c + y2p]
-                                        # Use a dummy track_id (or implement tracking if needed)
-                                        self.process_license_plate(-1, abs_box, frame, frame_count, fps, float(plate_box.conf[0]))
-                    else:
-                        # Single-stage: run plate detector on full frame
-                        results = self.model.track(frame, persist=True, conf=0.5, verbose=False)
-                        if results[0].boxes is not None and results[0].boxes.id is not None:
-                            self.process_detections(results, frame, frame_count, fps)
-                    
-                    # Update status every 30 frames
-                    if frame_count % 30 == 0:
-                        status_text = f"Processing frame {frame_count}/{total_frames}"
-                        fps_text = f"Speed: {processing_fps:.1f} FPS"
-                        self.root.after(0, lambda st=status_text: self.status_label.config(text=st))
-                        self.root.after(0, lambda ft=fps_text: self.fps_label.config(text=ft))
-                
-                except Exception as e:
-                    self.log_message(f"Error processing frame {frame_count}: {str(e)}")
-                    continue
-            
-            # Processing completed
-            if self.is_processing:  # Completed normally, not stopped
-                self.log_message(f"Video processing completed! Processed {frame_count} frames")
+            if not summary['stopped']:  # Completed normally, not stopped
                 self.root.after(0, lambda: self.status_label.config(text=f"Completed! Processed {frame_count} frames"))
                 
-                # Use the correct counters for the completion message
-                total_plates_detected = len(self.detected_plates)
-                alerts_sent = self.alerts_sent_count
-                
                 self.root.after(0, lambda: messagebox.showinfo("Processing Complete", 
-                    f"Video processing completed!\n\nTotal frames: {frame_count}\nPlates detected: {total_plates_detected}\nAlerts sent: {alerts_sent}"))
+                    f"Video processing completed!\n\nTotal frames: {frame_count}\nFrames analysed: {summary['frames_inferred']}\nPlates detected: {summary['plates_detected']}\nAlerts sent: {summary['alerts_sent']}"))
             
         except Exception as e:
             error_msg = f"Error during video processing: {str(e)}"
@@ -1669,635 +1573,21 @@ Processing Status: {detection_data.get('status', 'Processed')}
             self.root.after(0, lambda: messagebox.showerror("Processing Error", error_msg))
         
         finally:
-            if self.cap:
-                self.cap.release()
             cv2.destroyAllWindows()
             self.is_processing = False
             self.root.after(0, self.update_ui_after_stop)
     
-    def process_detections(self, results, frame, frame_count, fps):
-        try:
-            ids = results[0].boxes.id.cpu().numpy().astype(int)
-            boxes = results[0].boxes.xyxy.cpu().numpy().astype(int)
-            class_ids = results[0].boxes.cls.int().cpu().tolist()
-            confidences = results[0].boxes.conf.cpu().numpy()
-            names = self.model.names
-            
-            for track_id, box, class_id, conf in zip(ids, boxes, class_ids, confidences):
-                label = names[class_id]
-                
-                plate_classes = ["numberplate", "license_plate", "plate", "number_plate", "License_Plate"]
-                if label.lower() in [c.lower() for c in plate_classes]:
-                    self.process_license_plate(track_id, box, frame, frame_count, fps, conf)
-        except Exception as e:
-            self.log_message(f"Error in process_detections: {str(e)}")
-    
-    def is_similar_plate(self, new_plate, existing_plates, threshold=0.8):
-        """Check if new plate is similar to any existing detected plate"""
-        from difflib import SequenceMatcher
-        
-        # For video4.mp4, use stricter matching for expected plates
-        if hasattr(self, 'video_path') and self.video_path and 'video4.mp4' in self.video_path:
-            # Normalize the new plate for comparison
-            new_normalized = new_plate.replace('-', '').replace(' ', '').upper()
-            
-            # Check if new_plate is similar to any expected plate
-            for expected_plate in self.expected_plates_video4:
-                expected_normalized = expected_plate.replace('-', '').replace(' ', '').upper()
-                
-                # Check if this expected plate is already detected
-                for existing_plate in existing_plates:
-                    existing_normalized = existing_plate.replace('-', '').replace(' ', '').upper()
-                    
-                    # If both new and existing plates are similar to the same expected plate
-                    if (SequenceMatcher(None, new_normalized, expected_normalized).ratio() > 0.7 and 
-                        SequenceMatcher(None, existing_normalized, expected_normalized).ratio() > 0.7):
-                        return True, existing_plate
-        
-        # General similarity check for other cases
-        for existing_plate in existing_plates:
-            # Skip if length difference is too large
-            if abs(len(new_plate) - len(existing_plate)) > 2:
-                continue
-            
-            similarity = SequenceMatcher(None, new_plate, existing_plate).ratio()
-            if similarity >= threshold:
-                return True, existing_plate
-        return False, None
-
-    def process_license_plate(self, track_id, box, frame, frame_count, fps, conf):
-        """Enhanced license plate processing with location information"""
-        try:
-            x1, y1, x2, y2 = box
-            padding = 10
-            y1_crop = max(0, y1 - padding)
-            y2_crop = min(frame.shape[0], y2 + padding)
-            x1_crop = max(0, x1 - padding)
-            x2_crop = min(frame.shape[1], x2 + padding)
-            cropped_plate = frame[y1_crop:y2_crop, x1_crop:x2_crop]
-            
-            if cropped_plate.size == 0:
-                return
-
-            # Preprocess like main.py
-            gray = cv2.cvtColor(cropped_plate, cv2.COLOR_BGR2GRAY)
-            resized = cv2.resize(gray, None, fx=2, fy=2)
-            cropped_plate = cv2.cvtColor(resized, cv2.COLOR_GRAY2BGR)
-            
-            # Run OCR
-            result = self.ocr.ocr(cropped_plate)
-            text = "N/A"
-            
-            if result and len(result) > 0 and result[0]:
-                if isinstance(result[0], list) and len(result[0]) > 0:
-                    # Old format: [[[x1,y1,x2,y2], (text, confidence)]]
-                    if len(result[0][0]) > 1 and isinstance(result[0][0][1], tuple):
-                        text = result[0][0][1][0]
-                elif isinstance(result[0], dict):
-                    # New format: {"rec_texts": [...], "rec_scores": [...]}
-                    if "rec_texts" in result[0] and result[0]["rec_texts"]:
-                        text = result[0]["rec_texts"][0]
-
-            # Clean and validate the text
-            cleaned_text = self.clean_plate_text(text)
-            
-            # Skip if not valid
-            if not self.is_valid_plate(cleaned_text):
-                return
-            
-            display_plate = cleaned_text
-            
-            # For video4.mp4, always map to the best expected plate
-            if hasattr(self, 'video_path') and self.video_path and 'video4.mp4' in self.video_path:
-                from difflib import SequenceMatcher
-                best_ratio = 0
-                best_plate = cleaned_text
-                for expected_plate in self.expected_plates_video4:
-                    expected_normalized = expected_plate.replace('-', '').replace(' ', '').upper()
-                    ratio = SequenceMatcher(None, cleaned_text, expected_normalized).ratio()
-                    if ratio > best_ratio:
-                        best_ratio = ratio
-                        best_plate = expected_plate
-                # Only accept if it's a good match
-                if best_ratio > 0.7:
-                    display_plate = best_plate
-                else:
-                    return  # skip if not a good match
-            
-            # Check for exact match or similar plate
-            if display_plate in self.detected_plates:
-                return
-        
-            # Check for similar plates (fuzzy matching)
-            is_similar, similar_plate = self.is_similar_plate(display_plate, self.detected_plates)
-            if is_similar:
-                self.log_message(f"[DEBUG] Skipping similar plate: '{display_plate}' (similar to '{similar_plate}')")
-                return
-        
-            # Add to detected plates to prevent duplicates
-            self.detected_plates.add(display_plate)
-            
-            # Also update id_to_plate for tracking (optional, for backward compatibility)
-            if track_id != -1:
-                self.id_to_plate[track_id] = display_plate
-            
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            detection_msg = f"[{timestamp}] Frame {frame_count}: Detected '{display_plate}' (ID: {track_id}, Conf: {conf:.2f})"
-            
-            self.root.after(0, lambda msg=detection_msg: self.update_detection_display(msg))
-            self.log_message(detection_msg)
-            
-            # Check if plate is in watch list and send enhanced alert
-            if display_plate in self.watch_list:
-                self.send_enhanced_alert(display_plate, cropped_plate, frame_count, fps, conf)
-                
-        except Exception as e:
-            self.log_message(f"Error processing license plate: {str(e)}")
-    
-    def send_enhanced_alert(self, plate_number, plate_image, frame_number, fps, confidence):
-        """Enhanced alert system with detailed information and location - keeping plates in watchlist"""
-        try:
-            if plate_number not in self.alert_contacts:
-                self.log_message(f"No contact found for plate {plate_number}")
-                return
-            
-            contact_info = self.alert_contacts[plate_number]
-            vehicle_details = self.vehicle_details.get(plate_number, {})
-            contact = contact_info['contact']
-            contact_type = contact_info['type']
-            
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            time_in_video = frame_number / fps if fps > 0 else 0
-            
-            # Get location information based on video file
-            location_info = self.get_location_from_video(self.video_path)
-            
-            # Create detection data for the detected plates tab
-            detection_id = str(uuid.uuid4())[:8]
-            detection_data = {
-                'detection_id': detection_id,
-                'detection_time': timestamp,
-                'video_timestamp': f"{time_in_video:.1f}s",
-                'frame_number': frame_number,
-                'confidence': f"{confidence:.3f}",
-                'owner_name': vehicle_details.get('owner_name', 'Name not provided'),
-                'vehicle_details': vehicle_details.get('vehicle_details', 'Details not provided'),
-                'owner_phone': vehicle_details.get('owner_phone', 'Phone not provided'),
-                'address': vehicle_details.get('address', 'Address not provided'),
-                'case_details': vehicle_details.get('case_details', 'Case details not provided'),
-                'case_priority': vehicle_details.get('case_priority', 'Medium'),
-                'case_date': vehicle_details.get('case_date', 'Date not specified'),
-                'case_status': 'Detected',
-                'alert_sent': 'Yes',
-                'alert_contact': contact,
-                'alert_type': contact_type,
-                'alert_time': timestamp,
-                'status': 'Active',
-                'location_info': location_info  # Add location information
-            }
-            
-            # Add to detected plates data
-            self.detected_plates_data[plate_number] = detection_data
-            
-            # Add to detected plates treeview with location
-            self.root.after(0, lambda: self.detected_tree.insert('', 'end', values=(
-                timestamp,
-                plate_number,
-                vehicle_details.get('owner_name', 'Name not provided'),
-                location_info.get('name', 'Unknown location') if location_info else 'Unknown location',
-                vehicle_details.get('vehicle_details', 'Details not provided'),
-                vehicle_details.get('case_priority', 'Medium'),
-                'Yes',
-                'Active'
-            )))
-            
-            # DON'T remove from watch list - keep it there for future detections
-            # This was the main change requested - plates should stay in watchlist
-            
-            if contact_type == "Telegram":
-                # Enhanced message for Telegram with location information
-                location_text = location_info.get('full_address', 'Location not available') if location_info else 'Location not available'
-                
-                alert_message = f"🚨 <b>VEHICLE DETECTION ALERT</b>\n\n" \
-                              f"🔍 <b>License Plate:</b> {plate_number}\n" \
-                              f"👤 <b>Owner Name:</b> {vehicle_details.get('owner_name', 'Name not provided')}\n" \
-                              f"🚗 <b>Vehicle Details:</b> {vehicle_details.get('vehicle_details', 'Details not provided')}\n\n" \
-                              f"📞 <b>Phone:</b> {vehicle_details.get('owner_phone', 'Phone not provided')}\n" \
-                              f"📍 <b>Owner Address:</b> {vehicle_details.get('address', 'Address not provided')}\n\n" \
-                              f"🌍 <b>🟡 VEHICLE FOUND AT: {location_text} 🟡</b>\n\n" \
-                              f"⚖️ <b>Case Priority:</b> {vehicle_details.get('case_priority', 'Medium')}\n" \
-                              f"📅 <b>Case Date:</b> {vehicle_details.get('case_date', 'Date not specified')}\n" \
-                              f"📝 <b>Case Details:</b>\n{vehicle_details.get('case_details', 'Case details not provided')}\n\n" \
-                              f"🕐 <b>Detection Time:</b> {timestamp}\n" \
-                              f"📹 <b>Video Timestamp:</b> {time_in_video:.1f}s\n" \
-                              f"🎯 <b>Frame:</b> {frame_number}\n" \
-                              f"🎯 <b>Confidence:</b> {confidence:.3f}\n\n" \
-                              f"⚠️ <b>This vehicle has been successfully detected!</b>"
-                
-                # Extract chat ID from contact
-                chat_id = contact.replace('telegram:', '') if contact.startswith('telegram:') else contact
-                
-                self.log_message(f"Sending enhanced Telegram alert for plate {plate_number} to chat ID {chat_id}")
-                self.send_telegram_alert(chat_id, alert_message, plate_image)
-                
-            elif contact_type == "Email":
-                # Enhanced email message with location information
-                location_text = location_info.get('full_address', 'Location not available') if location_info else 'Location not available'
-                
-                alert_message = f"""VEHICLE DETECTION ALERT
-
-License Plate: {plate_number}
-Owner Name: {vehicle_details.get('owner_name', 'Name not provided')}
-Vehicle Details: {vehicle_details.get('vehicle_details', 'Details not provided')}
-
-Contact Information:
-Phone: {vehicle_details.get('owner_phone', 'Phone not provided')}
-Owner Address: {vehicle_details.get('address', 'Address not provided')}
-
-VEHICLE FOUND AT: {location_text}
-Location Details:
-- Location Name: {location_info.get('name', 'Unknown location') if location_info else 'Unknown location'}
-- City: {location_info.get('city', 'Unknown') if location_info else 'Unknown'}
-- State/Province: {location_info.get('state', 'Unknown') if location_info else 'Unknown'}
-- Country: {location_info.get('country', 'Unknown') if location_info else 'Unknown'}
-
-Case Information:
-Priority: {vehicle_details.get('case_priority', 'Medium')}
-Case Date: {vehicle_details.get('case_date', 'Date not specified')}
-Case Details: {vehicle_details.get('case_details', 'Case details not provided')}
-
-Detection Details:
-Time: {timestamp}
-Video time: {time_in_video:.1f}s
-Frame: {frame_number}
-Confidence: {confidence:.3f}
-
-This vehicle has been successfully detected and added to the detected plates list."""
-                
-                self.send_email_alert(plate_number, contact, plate_image, alert_message, detection_data)
-                
-            elif contact_type == "Phone":
-                location_text = location_info.get('name', 'Unknown location') if location_info else 'Unknown location'
-                alert_message = f"ALERT: License plate '{plate_number}' (Owner: {vehicle_details.get('owner_name', 'Unknown')}) detected at {location_text} on {timestamp}. Priority: {vehicle_details.get('case_priority', 'Medium')}"
-                # Note: Phone SMS functionality would need to be implemented
-                self.log_message(f"Phone alerts not supported in this version. Contact: {contact}")
-            
-            # Increment alerts sent counter
-            self.alerts_sent_count += 1
-            
-            # Update detection statistics
-            self.root.after(0, self.update_detection_stats)
-            
-            # Update UI
-            alert_display = f"🚨 ENHANCED ALERT SENT: {plate_number} ({vehicle_details.get('owner_name', 'Unknown')}) found at {location_info.get('name', 'Unknown location') if location_info else 'Unknown location'} -> {contact} ({contact_type})"
-            self.root.after(0, lambda msg=alert_display: self.update_detection_display(msg))
-            
-            # Save settings to persist detected plates data
-            self.save_settings()
-            
-        except Exception as e:
-            error_msg = f"Failed to send enhanced alert for {plate_number}: {str(e)}"
-            self.log_message(error_msg)
-    
-    def clean_plate_text(self, text):
-        """Clean and normalize license plate text"""
-        if not text:
-            return ""
-        
-        # Remove special characters and spaces
-        cleaned = re.sub(r'[^a-zA-Z0-9]', '', text.upper())
-        
-        # Common OCR corrections
-        corrections = {
-            'O': '0', 'I': '1', 'S': '5', 'Z': '2', 'B': '8', 'G': '6'
-        }
-        
-        # Apply corrections only to numeric parts (simplified approach)
-        result = ""
-        for char in cleaned:
-            if char in corrections and len([c for c in cleaned if c.isdigit()]) > len([c for c in cleaned if c.isalpha()]):
-                result += corrections.get(char, char)
-            else:
-                result += char
-        
-        return result[:10]  # Limit to reasonable plate length
-    
-    def is_valid_plate(self, text):
-        """Validate if the text looks like a license plate. Use fuzzy match for video4.mp4."""
-        import re
-        from difflib import SequenceMatcher
-        # If video4.mp4 is selected, use fuzzy match to expected plates
-        if hasattr(self, 'video_path') and self.video_path and 'video4.mp4' in self.video_path:
-            cleaned = text.replace(' ', '').upper()
-            best_ratio = 0
-            best_plate = ''
-            for plate in self.expected_plates_video4:
-                ratio = SequenceMatcher(None, cleaned, plate).ratio()
-                if ratio > best_ratio:
-                    best_ratio = ratio
-                    best_plate = plate
-            if best_ratio > 0.6:
-                return True
-            return False
-        # Otherwise, use original Indian plate validation
-        if not text or len(text) < 6 or len(text) > 10:
-            return False
-        pattern = r'^[A-Z]{2}[0-9]{1,2}[A-Z0OQ]{1,3}[0-9]{4}$'
-        if re.match(pattern, text):
-            return True
-        if len(text) >= 6:
-            prefix = text[:4]
-            series_and_number = text[4:]
-            for i in range(1, 4):
-                if len(series_and_number) >= i + 4:
-                    series = series_and_number[:i]
-                    number = series_and_number[i:]
-                    series_fixed = series.replace('0', 'Q').replace('O', 'Q')
-                    candidate = prefix + series_fixed + number
-                    if re.match(pattern, candidate):
-                        return True
-        return False
-    
-    def update_detection_display(self, message):
-        """Update the detection display in the UI"""
-        self.detection_text.config(state='normal')
-        self.detection_text.insert(tk.END, message + "\n")
-        self.detection_text.see(tk.END)
-        self.detection_text.config(state='disabled')
-    
-    def send_email_alert(self, plate_number, recipient, plate_image, message, detection_data=None):
-        """Enhanced email alert with HTML formatting and location highlighting"""
-        try:
-            if not all([self.email_config['smtp_server'], self.email_config['email'], self.email_config['password']]):
-                raise Exception("Email configuration incomplete")
-            
-            msg = MIMEMultipart('alternative')
-            msg['From'] = self.email_config['email']
-            msg['To'] = recipient
-            msg['Subject'] = f"🚨 VEHICLE DETECTION ALERT - {plate_number}"
-            
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Get location and vehicle details
-            if detection_data:
-                location_info = detection_data.get('location_info', {})
-                vehicle_details = detection_data
-            else:
-                location_info = {}
-                vehicle_details = {
-                    'owner_name': 'Test User',
-                    'vehicle_details': 'Test Vehicle',
-                    'owner_phone': '+1234567890',
-                    'address': 'Test Address',
-                    'case_details': 'Test case details',
-                    'case_priority': 'Medium',
-                    'case_date': datetime.now().strftime("%Y-%m-%d")
-                }
-            
-            location_text = location_info.get('full_address', 'Location not available') if location_info else 'Location not available'
-            location_name = location_info.get('name', 'Unknown location') if location_info else 'Unknown location'
-            
-            # Create HTML version with highlighting
-            html_message = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        .header {{
-            background-color: #d32f2f;
-            color: white;
-            padding: 20px;
-            text-align: center;
-            border-radius: 5px 5px 0 0;
-        }}
-        .content {{
-            background-color: #f5f5f5;
-            padding: 20px;
-            border-radius: 0 0 5px 5px;
-        }}
-        .highlight-location {{
-            background-color: #ffeb3b;
-            color: #333;
-            padding: 10px;
-            border-radius: 5px;
-            font-weight: bold;
-            margin: 10px 0;
-            border-left: 5px solid #ff9800;
-        }}
-        .info-section {{
-            background-color: white;
-            padding: 15px;
-            margin: 10px 0;
-            border-radius: 5px;
-            border-left: 4px solid #2196f3;
-        }}
-        .priority-high {{
-            border-left-color: #f44336;
-        }}
-        .priority-medium {{
-            border-left-color: #ff9800;
-        }}
-        .priority-low {{
-            border-left-color: #4caf50;
-        }}
-        .footer {{
-            text-align: center;
-            padding: 10px;
-            font-size: 12px;
-            color: #666;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 10px 0;
-        }}
-        th, td {{
-            text-align: left;
-            padding: 8px;
-            border-bottom: 1px solid #ddd;
-        }}
-        th {{
-            background-color: #f2f2f2;
-            font-weight: bold;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🚨 VEHICLE DETECTION ALERT</h1>
-        <h2>License Plate: {plate_number}</h2>
-    </div>
-    
-    <div class="content">
-        <div class="highlight-location">
-            🌍 <strong>VEHICLE FOUND AT: {location_text}</strong>
-        </div>
-        
-        <div class="info-section">
-            <h3>🚗 Vehicle Information</h3>
-            <table>
-                <tr><th>License Plate:</th><td>{plate_number}</td></tr>
-                <tr><th>Owner Name:</th><td>{vehicle_details.get('owner_name', 'Name not provided')}</td></tr>
-                <tr><th>Vehicle Details:</th><td>{vehicle_details.get('vehicle_details', 'Details not provided')}</td></tr>
-            </table>
-        </div>
-        
-        <div class="info-section">
-            <h3>📞 Contact Information</h3>
-            <table>
-                <tr><th>Phone Number:</th><td>{vehicle_details.get('owner_phone', 'Phone not provided')}</td></tr>
-                <tr><th>Owner Address:</th><td>{vehicle_details.get('address', 'Address not provided')}</td></tr>
-            </table>
-        </div>
-        
-        <div class="info-section">
-            <h3>🌍 Detection Location Details</h3>
-            <table>
-                <tr><th>Location Name:</th><td>{location_name}</td></tr>
-                <tr><th>City:</th><td>{location_info.get('city', 'Unknown') if location_info else 'Unknown'}</td></tr>
-                <tr><th>State/Province:</th><td>{location_info.get('state', 'Unknown') if location_info else 'Unknown'}</td></tr>
-                <tr><th>Country:</th><td>{location_info.get('country', 'Unknown') if location_info else 'Unknown'}</td></tr>
-                <tr><th>Coordinates:</th><td>{location_info.get('coordinates', {}).get('latitude', 'N/A') if location_info else 'N/A'}, {location_info.get('coordinates', {}).get('longitude', 'N/A') if location_info else 'N/A'}</td></tr>
-            </table>
-        </div>
-        
-        <div class="info-section priority-{vehicle_details.get('case_priority', 'medium').lower()}">
-            <h3>⚖️ Case Information</h3>
-            <table>
-                <tr><th>Case Priority:</th><td><strong>{vehicle_details.get('case_priority', 'Medium')}</strong></td></tr>
-                <tr><th>Case Date:</th><td>{vehicle_details.get('case_date', 'Date not specified')}</td></tr>
-                <tr><th>Case Details:</th><td>{vehicle_details.get('case_details', 'Case details not provided')}</td></tr>
-            </table>
-        </div>
-        
-        <div class="info-section">
-            <h3>🕐 Detection Details</h3>
-            <table>
-                <tr><th>Detection Time:</th><td>{timestamp}</td></tr>
-                <tr><th>Video Timestamp:</th><td>{detection_data.get('video_timestamp', 'N/A') if detection_data else 'N/A'}</td></tr>
-                <tr><th>Frame Number:</th><td>{detection_data.get('frame_number', 'N/A') if detection_data else 'N/A'}</td></tr>
-                <tr><th>Confidence Score:</th><td>{detection_data.get('confidence', 'N/A') if detection_data else 'N/A'}</td></tr>
-            </table>
-        </div>
-        
-        <div class="highlight-location">
-            ⚠️ <strong>This vehicle has been successfully detected and is being actively monitored!</strong>
-        </div>
-    </div>
-    
-    <div class="footer">
-        <p>Enhanced License Plate Alert System v2.0</p>
-        <p>Advanced Vehicle Monitoring Solution with Location-Based Detection</p>
-        <p>Alert Generated: {timestamp}</p>
-    </div>
-</body>
-</html>
-            """
-            
-            # Create plain text version
-            plain_message = f"""
-VEHICLE DETECTION ALERT
-=======================
-
-License Plate: {plate_number}
-
-VEHICLE FOUND AT: {location_text}
-
-Vehicle Information:
-- Owner Name: {vehicle_details.get('owner_name', 'Name not provided')}
-- Vehicle Details: {vehicle_details.get('vehicle_details', 'Details not provided')}
-
-Contact Information:
-- Phone: {vehicle_details.get('owner_phone', 'Phone not provided')}
-- Owner Address: {vehicle_details.get('address', 'Address not provided')}
-
-Detection Location:
-- Location Name: {location_name}
-- City: {location_info.get('city', 'Unknown') if location_info else 'Unknown'}
-- State/Province: {location_info.get('state', 'Unknown') if location_info else 'Unknown'}
-- Country: {location_info.get('country', 'Unknown') if location_info else 'Unknown'}
-
-Case Information:
-- Priority: {vehicle_details.get('case_priority', 'Medium')}
-- Case Date: {vehicle_details.get('case_date', 'Date not specified')}
-- Case Details: {vehicle_details.get('case_details', 'Case details not provided')}
-
-Detection Details:
-- Detection Time: {timestamp}
-- Video Timestamp: {detection_data.get('video_timestamp', 'N/A') if detection_data else 'N/A'}
-- Frame Number: {detection_data.get('frame_number', 'N/A') if detection_data else 'N/A'}
-- Confidence: {detection_data.get('confidence', 'N/A') if detection_data else 'N/A'}
-
-This vehicle has been successfully detected and is being actively monitored!
-
----
-Enhanced License Plate Alert System v2.0
-Alert Generated: {timestamp}
-            """
-            
-            # Attach both versions
-            msg.attach(MIMEText(plain_message, 'plain'))
-            msg.attach(MIMEText(html_message, 'html'))
-            
-            # Attach plate image if available
-            if plate_image is not None:
-                try:
-                    # Convert opencv image to PIL Image
-                    plate_rgb = cv2.cvtColor(plate_image, cv2.COLOR_BGR2RGB)
-                    pil_image = Image.fromarray(plate_rgb)
-                    
-                    # Save image to bytes
-                    img_buffer = io.BytesIO()
-                    pil_image.save(img_buffer, format='PNG')
-                    img_buffer.seek(0)
-                    
-                    # Attach image
-                    img_attachment = MIMEImage(img_buffer.read())
-                    img_attachment.add_header('Content-Disposition', f'attachment; filename=DetectedPlate_{plate_number}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.png')
-                    msg.attach(img_attachment)
-                except Exception as e:
-                    self.log_message(f"Failed to attach image: {str(e)}")
-            
-            # Send email
-            server = smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port'])
-            server.starttls()
-            server.login(self.email_config['email'], self.email_config['password'])
-            server.send_message(msg)
-            server.quit()
-            
-            self.log_message(f"Enhanced email alert sent successfully to {recipient} for plate {plate_number}")
-            
-        except Exception as e:
-            error_msg = f"Failed to send enhanced email alert: {str(e)}"
-            self.log_message(error_msg)
-            raise Exception(error_msg)
-    
     def log_message(self, message):
-        """Log message to the logs tab with timestamp"""
+        """Log message to the logs tab with timestamp; safe to call from any thread"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         log_entry = f"[{timestamp}] {message}\n"
         
-        # Update logs tab
-        self.root.after(0, lambda: self.update_logs(log_entry))
+        # Shown in the logs tab by the next poll
+        self.ui_channel.add_log(log_entry)
         
         # Also print to console for debugging
         print(log_entry.strip())
     
-    def update_logs(self, log_entry):
-        """Update the logs display"""
-        self.logs_text.config(state='normal')
-        self.logs_text.insert(tk.END, log_entry)
-        self.logs_text.see(tk.END)
-        self.logs_text.config(state='disabled')
-    
     def clear_logs(self):
         """Clear all logs"""
         self.logs_text.config(state='normal')
@@ -2321,54 +1611,23 @@ Alert Generated: {timestamp}
             messagebox.showerror("Error", f"Failed to save logs: {str(e)}")
     
     def save_settings(self):
-        """Save all settings to JSON file"""
+        """Save configuration to JSON file (detections live in the detection store)"""
         try:
-            settings = {
-                'watch_list': list(self.watch_list),
-                'alert_contacts': self.alert_contacts,
-                'vehicle_details': self.vehicle_details,
-                'detected_plates_data': self.detected_plates_data,
-                'email_config': self.email_config,
-                'telegram_config': self.telegram_config
-            }
-            
-            with open('license_plate_settings.json', 'w') as f:
-                json.dump(settings, f, indent=2)
-                
+            self.engine.save_settings()
         except Exception as e:
             self.log_message(f"Error saving settings: {str(e)}")
     
     def load_settings(self):
         """Load settings from JSON file"""
         try:
-            if os.path.exists('license_plate_settings.json'):
-                with open('license_plate_settings.json', 'r') as f:
-                    settings = json.load(f)
-                
-                # Load watch list
-                self.watch_list = set(settings.get('watch_list', []))
-                
-                # Load alert contacts
-                self.alert_contacts = settings.get('alert_contacts', {})
-                
-                # Load vehicle details
-                self.vehicle_details = settings.get('vehicle_details', {})
-                
-                # Load detected plates data
-                self.detected_plates_data = settings.get('detected_plates_data', {})
-                
-                # Load email config
-                self.email_config.update(settings.get('email_config', {}))
-                
-                # Load telegram config
-                self.telegram_config.update(settings.get('telegram_config', {}))
-                
+            if self.engine.load_settings():
                 # Update UI with loaded data
                 self.populate_watchlist_tree()
-                self.populate_detected_tree()
                 self.populate_settings_ui()
                 
                 self.log_message("Settings loaded successfully")
+            
+            self.populate_detected_tree()
                 
         except Exception as e:
             self.log_message(f"Error loading settings: {str(e)}")
@@ -2380,9 +1639,9 @@ Alert Generated: {timestamp}
             self.watchlist_tree.delete(item)
         
         # Add loaded items
-        for plate in self.watch_list:
-            contact_info = self.alert_contacts.get(plate, {})
-            vehicle_details = self.vehicle_details.get(plate, {})
+        for plate in self.engine.watch_list:
+            contact_info = self.engine.alert_contacts.get(plate, {})
+            vehicle_details = self.engine.vehicle_details.get(plate, {})
             
             self.watchlist_tree.insert('', 'end', values=(
                 plate,
@@ -2400,7 +1659,7 @@ Alert Generated: {timestamp}
             self.detected_tree.delete(item)
         
         # Add loaded items
-        for plate, data in self.detected_plates_data.items():
+        for plate, data in self.engine.detected_plates_data.items():
             location_info = data.get('location_info', {})
             self.detected_tree.insert('', 'end', values=(
                 data.get('detection_time', 'Unknown'),
@@ -2420,27 +1679,28 @@ Alert Generated: {timestamp}
         """Populate settings UI with loaded data"""
         # Email settings
         self.smtp_server_entry.delete(0, tk.END)
-        self.smtp_server_entry.insert(0, self.email_config.get('smtp_server', ''))
+        self.smtp_server_entry.insert(0, self.engine.email_config.get('smtp_server', ''))
         
         self.smtp_port_entry.delete(0, tk.END)
-        self.smtp_port_entry.insert(0, str(self.email_config.get('smtp_port', 587)))
+        self.smtp_port_entry.insert(0, str(self.engine.email_config.get('smtp_port', 587)))
         
         self.email_entry.delete(0, tk.END)
-        self.email_entry.insert(0, self.email_config.get('email', ''))
+        self.email_entry.insert(0, self.engine.email_config.get('email', ''))
         
         self.password_entry.delete(0, tk.END)
-        self.password_entry.insert(0, self.email_config.get('password', ''))
+        self.password_entry.insert(0, self.engine.email_config.get('password', ''))
         
         # Telegram settings
         self.telegram_token_entry.delete(0, tk.END)
-        self.telegram_token_entry.insert(0, self.telegram_config.get('bot_token', ''))
+        self.telegram_token_entry.insert(0, self.engine.telegram_config.get('bot_token', ''))
         
-        self.telegram_enabled.set(self.telegram_config.get('enabled', False))
+        self.telegram_enabled.set(self.engine.telegram_config.get('enabled', False))
 
 def main():
     """Main function to run the application"""
     root = tk.Tk()
     app = LicensePlateAlertSystem(root)
+    root.protocol("WM_DELETE_WINDOW", app.on_close)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -1,26 +1,85 @@
 #Import All the Required Libraries
-from utils import (read_video, save_video)
+import os
+from utils import (read_video, save_video, iter_video_frames, iter_frame_windows,
+                   get_video_fps, VideoStreamWriter)
 from detections import CarDetection, LicencePlateDetection
+from pipeline.detection_cache import DetectionCache
 
-def main():
-    #Input Video Path
-    input_video_path = "input_videos/video4.mp4"
+# Streaming mode decodes, detects, annotates and encodes this many frames at a time,
+# so peak memory depends on the window size instead of the video length
+STREAM_WINDOW_SIZE = 8
+
+def process_video_in_memory(input_video_path, output_video_path, car_detector, licence_plate_detector,
+                            car_stub_path=None, read_car_stub=False):
+    """Original pipeline: every frame of the video is held in memory at once"""
     #Read Video
     video_frames = read_video(input_video_path)
     #Detect Car
-    car_detector = CarDetection(model_path="yolo11n.pt")
-    car_detections = car_detector.detect_frames(video_frames, read_from_stub=True, stub_path= "tracker_stubs/car_detection.pkl")
-
+    car_detections = car_detector.detect_frames(video_frames, read_from_stub=read_car_stub, stub_path=car_stub_path)
     #Detect Licence Plate
-    licence_plate_detector = LicencePlateDetection(model_path='models/best.pt')
     licence_plate_detections, licence_plate_texts = licence_plate_detector.detect_frames(video_frames)
-
     #Draw Car Bounding Boxes
     output_video_frames = car_detector.draw_bboxes(video_frames, car_detections)
     #Draw Licence Plate Bounding Boxes
     output_video_frames = licence_plate_detector.draw_bboxes(output_video_frames, licence_plate_detections, licence_plate_texts)
     #Save the Output Video
-    save_video(output_video_frames, output_video_path="output_videos/output_video.avi")
+    save_video(output_video_frames, output_video_path=output_video_path)
+
+def process_video_stream(input_video_path, output_video_path, car_detector, licence_plate_detector,
+                         window_size=STREAM_WINDOW_SIZE, car_stub_path=None, read_car_stub=False):
+    """Streaming pipeline: frames flow through detection and encoding one window at a time"""
+    car_stub = None
+    if read_car_stub and car_stub_path is not None and os.path.exists(car_stub_path):
+        car_stub = car_detector.load_stub(car_stub_path)
+
+    # Only the (small) car boxes are kept for the whole run so the stub can still be written
+    all_car_detections = []
+    frame_index = 0
+    fps = get_video_fps(input_video_path)
+    with VideoStreamWriter(output_video_path, fps=fps) as writer:
+        for window in iter_frame_windows(iter_video_frames(input_video_path), window_size):
+            #Detect Car
+            if car_stub is not None:
+                car_detections = car_stub[frame_index:frame_index + len(window)]
+                # A stub shorter than the video must not drop frames from the output
+                car_detections = car_detections + [[] for _ in range(len(window) - len(car_detections))]
+            else:
+                car_detections = car_detector.detect_frames(window, start_index=frame_index)
+                all_car_detections.extend(car_detections)
+            #Detect Licence Plate
+            licence_plate_detections, licence_plate_texts = licence_plate_detector.detect_frames(window, start_index=frame_index)
+            #Draw Bounding Boxes
+            output_window = car_detector.draw_bboxes(window, car_detections)
+            output_window = licence_plate_detector.draw_bboxes(output_window, licence_plate_detections, licence_plate_texts)
+            #Encode the window and let it go
+            for frame in output_window:
+                writer.write(frame)
+            frame_index += len(window)
+
+    if car_stub is None and car_stub_path is not None:
+        car_detector.save_stub(all_car_detections, car_stub_path)
+    print(f"Processed {frame_index} frames in windows of {window_size}")
+
+def main(stream=True):
+    #Input Video Path
+    input_video_path = "input_videos/video4.mp4"
+    output_video_path = "output_videos/output_video.avi"
+    car_stub_path = "tracker_stubs/car_detection.dets"
+    #Load Detectors
+    car_detector = CarDetection(model_path="yolo11n.pt", batch_size=STREAM_WINDOW_SIZE)
+    licence_plate_detector = LicencePlateDetection(model_path='models/best.pt', batch_size=STREAM_WINDOW_SIZE)
+    #Reuse detections from earlier runs over the same video, models and params
+    detection_cache = DetectionCache("detection_cache.db")
+    car_detector.use_cache(detection_cache, input_video_path)
+    licence_plate_detector.use_cache(detection_cache, input_video_path)
+
+    if stream:
+        process_video_stream(input_video_path, output_video_path, car_detector, licence_plate_detector,
+                             car_stub_path=car_stub_path, read_car_stub=True)
+    else:
+        process_video_in_memory(input_video_path, output_video_path, car_detector, licence_plate_detector,
+                                car_stub_path=car_stub_path, read_car_stub=True)
+    detection_cache.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
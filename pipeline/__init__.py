@@ -0,0 +1,13 @@
+from .ocr_budget import TrackOCRBudget
+from .stages import StagedPipeline, PipelineStage
+from .plate_dedup import PlateDeduplicator
+from .model_pool import ModelPool
+from .tracker import IoUTracker
+from .frame_sampler import AdaptiveFrameSampler
+from .roi import RegionOfInterest
+from .detection_cache import DetectionCache, FrameCacheView, hash_file
+from .detection_archive import DetectionArchive, write_detection_archive
+from .ui_channel import UIUpdateChannel
+from .metrics import MetricsRegistry, MetricsServer, LatencyHistogram
+from .alert_latency import AlertLatencyTracker, latency_breakdown
+from .quality_governor import QualityGovernor, QUALITY_LEVELS
@@ -0,0 +1,68 @@
+#Import All the Required Libraries
+import math
+import threading
+from collections import deque
+
+# Timestamps (time.time()) a watch-list hit collects on its way from the frame to the contact
+ALERT_STAGES = ('captured', 'inferred', 'ocr_done', 'dedup_done', 'queued', 'delivered')
+
+def latency_breakdown(timing):
+    """Milliseconds from capture to every later stage recorded in a timing dict"""
+    captured = timing.get('captured')
+    if captured is None:
+        return {}
+    return {f"{stage}_ms": round((timing[stage] - captured) * 1000, 1)
+            for stage in ALERT_STAGES[1:] if timing.get(stage) is not None}
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+class AlertLatencyTracker:
+    """Frame-to-delivery latencies of alerts per (camera, channel)
+
+    Keeps the most recent max_samples latencies of each camera and channel, so p50, p95
+    and p99 are exact over that window instead of bucket estimates.
+    """
+    def __init__(self, max_samples=1000):
+        self.max_samples = max_samples
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def record(self, camera, channel, seconds):
+        with self.lock:
+            samples = self.samples.get((camera, channel))
+            if samples is None:
+                samples = self.samples[(camera, channel)] = deque(maxlen=self.max_samples)
+            samples.append(seconds)
+
+    def percentiles(self, camera=None, channel=None):
+        """{count, p50, p95, p99, max} in seconds over the cameras and channels matching the filters"""
+        with self.lock:
+            values = sorted(value for (sample_camera, sample_channel), samples in self.samples.items()
+                            if camera in (None, sample_camera) and channel in (None, sample_channel)
+                            for value in samples)
+        return {
+            'count': len(values),
+            'p50': percentile(values, 0.50),
+            'p95': percentile(values, 0.95),
+            'p99': percentile(values, 0.99),
+            'max': values[-1] if values else 0.0
+        }
+
+    def stats(self):
+        """{(camera, channel): percentiles} for every pair with samples"""
+        with self.lock:
+            keys = sorted(self.samples)
+        return {key: self.percentiles(*key) for key in keys}
+
+    def summary_lines(self):
+        lines = []
+        for (camera, channel), stats in self.stats().items():
+            lines.append(f"Frame-to-alert latency [{camera} via {channel}]: {stats['count']} alerts, "
+                         f"p50 {stats['p50']:.2f}s, p95 {stats['p95']:.2f}s, p99 {stats['p99']:.2f}s, "
+                         f"max {stats['max']:.2f}s")
+        return lines
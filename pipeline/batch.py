@@ -0,0 +1,218 @@
+#Import All the Required Libraries
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import signal
+import time
+from alerts.detection_store import write_json_atomic
+from pipeline.engine import PlateAlertEngine, CameraStream, print_log
+
+# Same extensions as the GUI's video file dialog
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv')
+
+def expand_sources(patterns):
+    """Video files named by paths, directories (searched recursively) and glob patterns, sorted, without repeats"""
+    videos = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, '**', '*'), recursive=True)
+        else:
+            matches = glob.glob(pattern, recursive=True) or [pattern]
+        for path in sorted(matches):
+            if os.path.isfile(path) and path.lower().endswith(VIDEO_EXTENSIONS):
+                path = os.path.abspath(path)
+                if path not in videos:
+                    videos.append(path)
+    return videos
+
+def batch_key(videos):
+    """Identifies a batch by its set of videos, so a rerun of the same sources resumes it"""
+    return hashlib.sha1("\n".join(sorted(videos)).encode('utf-8')).hexdigest()[:16]
+
+class BatchCheckpoint:
+    """JSON record of the finished videos and, per unfinished batch, the watch-list plates already alerted
+
+    Saved atomically after every video, so an interrupted or crashed batch resumes with the
+    videos it had not finished. A video only counts as done while its size and mtime match.
+    Alerted plates are kept under the batch's key (see batch_key) only until that batch has
+    finished, so they suppress repeats within one batch and its resumed runs, never in a
+    different batch that shares the checkpoint file.
+    """
+    def __init__(self, path="batch_checkpoint.json"):
+        self.path = path
+        self.videos = {}
+        self.batches = {}
+        self.batch = None
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                data = json.load(f)
+            self.videos = data.get('videos', {})
+            self.batches = data.get('batches', {})
+
+    def begin_batch(self, key):
+        """Alerts recorded from now on belong to batch key; a resumed batch gets its earlier alerts back"""
+        self.batch = key
+        self.batches.setdefault(key, {})
+
+    def finish_batch(self):
+        """Forget the alerts of the current batch; nothing is left to resume"""
+        self.batches.pop(self.batch, None)
+        self.save()
+
+    def file_state(self, video_path):
+        stat = os.stat(video_path)
+        return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def is_done(self, video_path):
+        entry = self.videos.get(video_path)
+        return entry is not None and {key: entry.get(key) for key in ('size', 'mtime')} == self.file_state(video_path)
+
+    def mark_done(self, video_path, summary):
+        self.videos[video_path] = dict(self.file_state(video_path), summary=summary, completed_at=time.time())
+        self.save()
+
+    def alerted_from(self, plate):
+        """Video that already raised an alert for plate in this batch, or None"""
+        return self.batches.get(self.batch, {}).get(plate)
+
+    def record_alert(self, plate, video_path):
+        self.batches.setdefault(self.batch, {})[plate] = video_path
+
+    def save(self):
+        write_json_atomic(self.path, {'videos': self.videos, 'batches': self.batches})
+
+# Per-process state of a batch worker: one engine whose models are loaded once
+_worker_engine = None
+_worker_alerts = []
+
+def init_batch_worker(config):
+    """Pool initializer: load the settings, YOLO and PaddleOCR once for every video this process runs"""
+    global _worker_engine
+    # Ctrl+C is the parent's to handle: it stops handing out videos and terminates the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    worker_name = f"worker {os.getpid()}"
+    # No store or outbox here: watch-list hits go back to the parent's single dispatcher
+    engine = PlateAlertEngine(settings_path=config['settings_path'], store_path=None, spool_dir=None,
+                              log=lambda message: print_log(f"[{worker_name}] {message}"),
+                              progress_interval=config['progress_interval'], cache_path=config['cache_path'])
+    engine.load_settings()
+    engine.load_model(config['model_path'])
+    if config.get('car_model_path'):
+        engine.load_car_model(config['car_model_path'])
+    engine.alert_handler = lambda stream, alert: _worker_alerts.append(alert)
+    _worker_engine = engine
+
+def process_batch_video(video_path):
+    """Pool task: run one video and return its summary with the watch-list hits it raised"""
+    del _worker_alerts[:]
+    start_time = time.time()
+    result = {'source': video_path, 'worker': os.getpid(), 'summary': None, 'error': None}
+    try:
+        result['summary'] = _worker_engine.process_video(video_path)
+    except Exception as e:
+        result['error'] = str(e)
+    result['alerts'] = list(_worker_alerts)
+    result['elapsed'] = time.time() - start_time
+    return result
+
+class BatchProcessor:
+    """Runs a folder of videos on a process pool and alerts through one engine's dispatcher
+
+    Every worker process loads the models once and processes whole videos; the watch-list
+    hits of each video come back to this process, where a plate already alerted from an
+    earlier video of the batch (or of the interrupted run it resumes) is only logged, and
+    the rest are sent and stored through engine. Each finished video is checkpointed, so a
+    rerun skips it.
+    """
+    def __init__(self, engine, model_path, car_model_path=None, workers=2, checkpoint_path="batch_checkpoint.json",
+                 cache_path="detection_cache.db", progress_interval=1000):
+        self.engine = engine
+        self.workers = max(1, int(workers))
+        self.checkpoint = BatchCheckpoint(checkpoint_path)
+        self.worker_config = {
+            'settings_path': engine.settings_path,
+            'model_path': model_path,
+            'car_model_path': car_model_path,
+            'cache_path': cache_path,
+            'progress_interval': progress_interval
+        }
+
+    def run(self, sources, should_stop=None):
+        """Process every video in sources (paths, directories, globs); return the aggregate report"""
+        should_stop = should_stop or (lambda: False)
+        videos = expand_sources(sources)
+        self.checkpoint.begin_batch(batch_key(videos))
+        pending = [video for video in videos if not self.checkpoint.is_done(video)]
+        report = {'videos': len(videos), 'skipped': len(videos) - len(pending), 'processed': 0, 'failed': [],
+                  'frames': 0, 'frames_inferred': 0, 'plates_detected': 0, 'alerts_sent': 0,
+                  'duplicate_alerts': 0, 'video_seconds': 0.0}
+        self.engine.log_message(f"Batch: {len(videos)} videos, {report['skipped']} already done, "
+                                f"{len(pending)} to process on {min(self.workers, len(pending))} worker process(es)")
+        start_time = time.time()
+        if pending:
+            # spawn: every worker starts clean instead of inheriting this process's model and CUDA state
+            context = multiprocessing.get_context('spawn')
+            with context.Pool(min(self.workers, len(pending)), initializer=init_batch_worker,
+                              initargs=(self.worker_config,)) as pool:
+                for result in pool.imap_unordered(process_batch_video, pending):
+                    self.handle_result(result, report)
+                    if should_stop():
+                        self.engine.log_message("Batch stopped; unfinished videos will be picked up by the next run")
+                        pool.terminate()
+                        break
+        if report['processed'] + report['skipped'] == report['videos']:
+            self.checkpoint.finish_batch()
+        report['elapsed'] = time.time() - start_time
+        report['fps'] = report['frames'] / report['elapsed'] if report['elapsed'] > 0 else 0.0
+        self.log_report(report)
+        return report
+
+    def handle_result(self, result, report):
+        """Dispatch the alerts of one finished video, then checkpoint it"""
+        source = result['source']
+        name = os.path.basename(source)
+        if result['error'] is not None:
+            self.engine.log_message(f"{name}: failed ({result['error']}); it will be retried by the next run")
+            report['failed'].append(source)
+            return
+
+        stream = CameraStream(self.engine, source)
+        for alert in result['alerts']:
+            plate_number = alert[0]
+            earlier_video = self.checkpoint.alerted_from(plate_number)
+            if earlier_video is not None:
+                self.engine.log_message(f"{name}: {plate_number} was already alerted from "
+                                        f"{os.path.basename(earlier_video)}; not alerting again")
+                report['duplicate_alerts'] += 1
+                continue
+            stream.send_enhanced_alert(*alert)
+            self.checkpoint.record_alert(plate_number, source)
+
+        # The alerts are in the outbox spool before the video is marked done
+        summary = result['summary']
+        summary['alerts_sent'] = stream.alerts_sent_count
+        self.checkpoint.mark_done(source, summary)
+        report['processed'] += 1
+        report['frames'] += summary['frames']
+        report['frames_inferred'] += summary.get('frames_inferred', summary['frames'])
+        report['plates_detected'] += summary['plates_detected']
+        report['alerts_sent'] += stream.alerts_sent_count
+        report['video_seconds'] += result['elapsed']
+        fps = summary['frames'] / result['elapsed'] if result['elapsed'] > 0 else 0.0
+        self.engine.log_message(f"{name}: {summary['frames']} frames in {result['elapsed']:.1f}s ({fps:.1f} FPS), "
+                                f"{summary['plates_detected']} plates, {stream.alerts_sent_count} alerts "
+                                f"[worker {result['worker']}]")
+
+    def log_report(self, report):
+        self.engine.log_message(
+            f"Batch finished: {report['processed']} processed, {report['skipped']} skipped, "
+            f"{len(report['failed'])} failed in {report['elapsed']:.1f}s")
+        self.engine.log_message(
+            f"Throughput: {report['frames']} frames at {report['fps']:.1f} FPS overall "
+            f"({report['frames_inferred']} inferred), {report['plates_detected']} plates, "
+            f"{report['alerts_sent']} alerts, {report['duplicate_alerts']} cross-video duplicates suppressed")
+        if report['elapsed'] > 0 and report['video_seconds'] > 0:
+            self.engine.log_message(f"Parallel speed-up: {report['video_seconds'] / report['elapsed']:.1f}x "
+                                    f"({report['video_seconds']:.1f}s of per-video work)")
@@ -0,0 +1,78 @@
+#Import All the Required Libraries
+import os
+import shutil
+import numpy as np
+
+class DetectionArchive:
+    """Per-frame detections stored as flat NumPy arrays and read through np.memmap
+
+    An archive is a directory with three .npy files:
+        boxes.npy    float32 (N, 4)    x1, y1, x2, y2 of every detection of every frame
+        scores.npy   float32 (N, 2)    class id and confidence of each detection
+        offsets.npy  int64 (frames + 1) detections of frame i are rows offsets[i]:offsets[i + 1]
+    Opening maps the files without reading them, and archive[i] is a view of frame i's
+    boxes, so random access costs O(1) and no deserialisation.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.boxes = np.load(os.path.join(path, 'boxes.npy'), mmap_mode='r')
+        self.scores = np.load(os.path.join(path, 'scores.npy'), mmap_mode='r')
+        self.offsets = np.load(os.path.join(path, 'offsets.npy'), mmap_mode='r')
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        """Boxes of frame index as an (n, 4) array view, or a list of them for a slice"""
+        if isinstance(index, slice):
+            return [self.frame(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Frame {index} is not in the archive ({len(self)} frames)")
+        return self.frame(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.frame(index)
+
+    def frame(self, index):
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        return self.boxes[start:stop]
+
+    def frame_scores(self, index):
+        """(class_ids, confidences) of frame index"""
+        scores = self.scores[self.offsets[index]:self.offsets[index + 1]]
+        return scores[:, 0].astype(np.int64), scores[:, 1]
+
+def write_detection_archive(path, detections):
+    """Write one list of detection rows per frame as a DetectionArchive at path
+
+    Rows are [x1, y1, x2, y2] or [x1, y1, x2, y2, conf, class_id]; missing scores are
+    stored as class -1 and confidence NaN. The archive is written next to path and renamed
+    into place, so readers never see a half-written one.
+    """
+    counts = [len(rows) for rows in detections]
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    boxes = np.zeros((offsets[-1], 4), dtype=np.float32)
+    scores = np.empty((offsets[-1], 2), dtype=np.float32)
+    scores[:, 0] = -1
+    scores[:, 1] = np.nan
+    row_index = 0
+    for rows in detections:
+        for row in rows:
+            boxes[row_index] = row[:4]
+            if len(row) >= 6:
+                scores[row_index] = (row[5], row[4])
+            row_index += 1
+
+    temp_path = f"{path}.tmp"
+    shutil.rmtree(temp_path, ignore_errors=True)
+    os.makedirs(temp_path)
+    np.save(os.path.join(temp_path, 'boxes.npy'), boxes)
+    np.save(os.path.join(temp_path, 'scores.npy'), scores)
+    np.save(os.path.join(temp_path, 'offsets.npy'), offsets)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(temp_path, path)
+    return DetectionArchive(path)
@@ -0,0 +1,189 @@
+#Import All the Required Libraries
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import numpy as np
+
+def hash_file(path, chunk_size=1 << 20):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def hash_params(params):
+    """Stable hash of a JSON-serialisable dict of inference parameters"""
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+class DetectionCache:
+    """Content-addressed cache of per-frame detections in SQLite
+
+    Results are keyed by (video hash, model weights hashes, inference params) and frame
+    index, so any change to the video, the weights or the params misses, while watch-list
+    or alert changes keep every frame valid. Each frame is one row holding a float32
+    matrix (one row per detection), written as soon as the frame is detected: a run that
+    stops half way leaves its frames reusable. File hashes are remembered by path, size
+    and mtime so a video is only read in full once.
+    """
+    def __init__(self, db_path="detection_cache.db", flush_every=64):
+        self.db_path = db_path
+        self.flush_every = flush_every
+        self.lock = threading.Lock()
+        self.pending = []
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS frame_detections (
+                cache_key TEXT NOT NULL,
+                frame_index INTEGER NOT NULL,
+                num_rows INTEGER NOT NULL,
+                num_columns INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (cache_key, frame_index)
+            ) WITHOUT ROWID""")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                sha256 TEXT NOT NULL
+            )""")
+        self.conn.commit()
+
+    def file_hash(self, path):
+        """Content hash of path, reusing the stored one while size and mtime are unchanged"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        with self.lock:
+            row = self.conn.execute("SELECT size, mtime, sha256 FROM file_hashes WHERE path = ?",
+                                    (path,)).fetchone()
+        if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime:
+            return row[2]
+        sha256 = hash_file(path)
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO file_hashes (path, size, mtime, sha256) VALUES (?, ?, ?, ?)",
+                              (path, stat.st_size, stat.st_mtime, sha256))
+            self.conn.commit()
+        return sha256
+
+    def cache_key(self, video_path, weights_paths, params):
+        """Key for the detections of one video by one set of models and params"""
+        parts = {
+            'video': self.file_hash(video_path),
+            'weights': [self.file_hash(path) if path and os.path.exists(path) else str(path)
+                        for path in weights_paths],
+            'params': hash_params(params)
+        }
+        return hash_params(parts)
+
+    def view(self, video_path, weights_paths, params):
+        """Return a FrameCacheView bound to one (video, weights, params) key"""
+        return FrameCacheView(self, self.cache_key(video_path, weights_paths, params))
+
+    def get(self, cache_key, frame_index):
+        """Return the cached float32 matrix for a frame, or None"""
+        with self.lock:
+            row = self.conn.execute("""
+                SELECT num_rows, num_columns, data FROM frame_detections
+                WHERE cache_key = ? AND frame_index = ?""", (cache_key, int(frame_index))).fetchone()
+            if row is None:
+                # The frame may still be waiting in the write buffer
+                for key, index, num_rows, num_columns, data in reversed(self.pending):
+                    if key == cache_key and index == int(frame_index):
+                        row = (num_rows, num_columns, data)
+                        break
+        if row is None:
+            return None
+        num_rows, num_columns, data = row
+        return np.frombuffer(data, dtype=np.float32).reshape(num_rows, num_columns)
+
+    def put(self, cache_key, frame_index, matrix):
+        """Store the detections of one frame; writes are committed every flush_every frames"""
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        if matrix.ndim != 2:
+            raise ValueError("Detections must be a 2-D matrix, one row per detection")
+        with self.lock:
+            self.pending.append((cache_key, int(frame_index), matrix.shape[0], matrix.shape[1], matrix.tobytes()))
+            if len(self.pending) >= self.flush_every:
+                self._flush()
+
+    def cached_frames(self, cache_key):
+        """Set of frame indices cached for a key"""
+        with self.lock:
+            self._flush()
+            rows = self.conn.execute("SELECT frame_index FROM frame_detections WHERE cache_key = ?",
+                                     (cache_key,)).fetchall()
+        return {frame_index for frame_index, in rows}
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        if not self.pending:
+            return
+        self.conn.executemany("""
+            INSERT OR REPLACE INTO frame_detections (cache_key, frame_index, num_rows, num_columns, data)
+            VALUES (?, ?, ?, ?, ?)""", self.pending)
+        self.conn.commit()
+        self.pending = []
+
+    def close(self):
+        with self.lock:
+            self._flush()
+            self.conn.close()
+
+class FrameCacheView:
+    """DetectionCache entries of one (video, weights, params) key, addressed by frame index"""
+    def __init__(self, cache, cache_key):
+        self.cache = cache
+        self.cache_key = cache_key
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, frame_index):
+        matrix = self.cache.get(self.cache_key, frame_index)
+        if matrix is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return matrix
+
+    def put(self, frame_index, matrix):
+        self.cache.put(self.cache_key, frame_index, matrix)
+
+    def detect(self, frames, first_index, detect_batch, num_columns):
+        """Per-frame detection rows for frames[i] = frame first_index + i, running detect_batch only on misses
+
+        detect_batch takes a list of frames and returns a list of rows (num_columns numbers
+        each) per frame; its results are stored before they are returned.
+        """
+        rows_by_frame = [None] * len(frames)
+        missing = []
+        for offset in range(len(frames)):
+            matrix = self.get(first_index + offset)
+            if matrix is None:
+                missing.append(offset)
+            else:
+                rows_by_frame[offset] = matrix.tolist()
+        if missing:
+            detected = detect_batch([frames[offset] for offset in missing])
+            for offset, rows in zip(missing, detected):
+                rows_by_frame[offset] = rows
+                self.put(first_index + offset, np.array(rows, dtype=np.float32).reshape(-1, num_columns))
+        return rows_by_frame
+
+    def cached_frames(self):
+        return self.cache.cached_frames(self.cache_key)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
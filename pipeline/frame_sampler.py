@@ -0,0 +1,94 @@
+#Import All the Required Libraries
+import cv2
+
+class AdaptiveFrameSampler:
+    """Decides per decoded frame whether full detection + OCR is worth running
+
+    A frame is inferred when plates were seen recently (tracks are alive), when a cheap
+    difference against the previous frame on a small grayscale copy shows motion, or as a
+    heartbeat every idle_interval frames on a static scene. Busy scenes run at
+    active_interval (1 = every frame). Between tracks only every probe_interval-th frame is
+    looked at, so a decoder can skip decoding the others (wants_frame).
+    """
+    def __init__(self, active_interval=1, idle_interval=15, probe_interval=2, motion_threshold=0.002,
+                 pixel_threshold=25, hold_frames=30, downscale_width=160):
+        self.active_interval = max(1, int(active_interval))
+        self.idle_interval = max(1, int(idle_interval))
+        self.probe_interval = max(1, int(probe_interval))
+        self.motion_threshold = motion_threshold
+        self.pixel_threshold = pixel_threshold
+        self.hold_frames = hold_frames
+        self.downscale_width = downscale_width
+        self.reset()
+
+    def reset(self):
+        self.previous = None
+        self.last_inferred = None
+        self.active_until = -1
+        self.frames_seen = 0
+        self.frames_inferred = 0
+        self.reasons = {'tracks': 0, 'motion': 0, 'heartbeat': 0}
+        self.last_motion = 0.0
+
+    def motion_score(self, frame):
+        """Fraction of pixels that changed since the previous frame, on a small grayscale copy"""
+        height, width = frame.shape[:2]
+        small_height = max(1, int(height * self.downscale_width / float(width)))
+        small = cv2.resize(frame, (self.downscale_width, small_height), interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+        previous, self.previous = self.previous, gray
+        if previous is None:
+            # Nothing to compare with; the first frame is taken by the heartbeat
+            return 0.0
+        changed = cv2.absdiff(gray, previous) > self.pixel_threshold
+        return float(changed.mean())
+
+    def wants_frame(self, frame_count):
+        """Cheap check before decoding: False means the frame can be grabbed and skipped undecoded"""
+        if frame_count <= self.active_until:
+            return frame_count % self.active_interval == 0
+        return frame_count % self.probe_interval == 0
+
+    def should_process(self, frame, frame_count, admit=None):
+        """Return True if frame should go through detection
+
+        admit, if given, gets the last word on a frame the sampler wants (the quality governor
+        thinning frames under load); a frame it turns down is not counted as inferred, so the
+        next frame is still due.
+        """
+        self.frames_seen += 1
+        # Motion is measured on every frame so the reference stays one frame old
+        self.last_motion = self.motion_score(frame)
+        since_last = frame_count - self.last_inferred if self.last_inferred is not None else None
+
+        reason = None
+        if frame_count <= self.active_until:
+            if since_last is None or since_last >= self.active_interval:
+                reason = 'tracks'
+        elif self.last_motion >= self.motion_threshold:
+            if since_last is None or since_last >= self.active_interval:
+                reason = 'motion'
+        elif since_last is None or since_last >= self.idle_interval:
+            reason = 'heartbeat'
+
+        if reason is None or (admit is not None and not admit()):
+            return False
+        self.reasons[reason] += 1
+        self.frames_inferred += 1
+        self.last_inferred = frame_count
+        return True
+
+    def report_detections(self, frame_count, num_plates):
+        """Feedback from detection: keep the full rate for hold_frames after plates were seen"""
+        if num_plates:
+            self.active_until = max(self.active_until, frame_count + self.hold_frames)
+
+    def stats(self):
+        skipped = self.frames_seen - self.frames_inferred
+        return {
+            'frames_seen': self.frames_seen,
+            'frames_inferred': self.frames_inferred,
+            'frames_skipped': skipped,
+            'skip_rate': skipped / self.frames_seen if self.frames_seen else 0.0,
+            'reasons': dict(self.reasons)
+        }
@@ -0,0 +1,205 @@
+#Import All the Required Libraries
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (seconds) of the latency buckets: 0.5 ms to 10 s
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram (Prometheus style) with count, sum and max"""
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Approximate quantile: upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.bucket_counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+def escape_label_value(value):
+    """Escape a label value for the Prometheus text format: backslash, double quote and newline"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in labels) + "}"
+
+class MetricsRegistry:
+    """Thread-safe per-stage latency histograms and counters of the detection pipeline
+
+    Stages are timed with observe(stage, seconds, **labels) or the timer(stage, **labels)
+    context manager; counters go up with inc(name, value, **labels). render_prometheus()
+    returns the Prometheus text exposition format, summary_lines() a short log summary.
+    """
+    def __init__(self, prefix="plate_alert"):
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.started = time.time()
+
+    def observe(self, stage, seconds, **labels):
+        key = (stage, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def counter(self, name, **labels):
+        with self.lock:
+            return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def stage_stats(self):
+        """{stage: {count, avg, p50, p95, max}} over all label values, in seconds"""
+        with self.lock:
+            merged = {}
+            for (stage, _), histogram in self.histograms.items():
+                total = merged.setdefault(stage, LatencyHistogram(histogram.buckets))
+                total.bucket_counts = [a + b for a, b in zip(total.bucket_counts, histogram.bucket_counts)]
+                total.count += histogram.count
+                total.total += histogram.total
+                total.max = max(total.max, histogram.max)
+        return {stage: {'count': histogram.count,
+                        'avg': histogram.total / histogram.count if histogram.count else 0.0,
+                        'p50': histogram.quantile(0.5),
+                        'p95': histogram.quantile(0.95),
+                        'max': histogram.max}
+                for stage, histogram in merged.items()}
+
+    def render_prometheus(self):
+        """Metrics in the Prometheus text format"""
+        lines = []
+        name = f"{self.prefix}_stage_seconds"
+        with self.lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+        if histograms:
+            lines.append(f"# HELP {name} Time spent per pipeline stage")
+            lines.append(f"# TYPE {name} histogram")
+        for (stage, labels), histogram in histograms:
+            labels = (('stage', stage),) + labels
+            cumulative = 0
+            bounds = [repr(bound) for bound in histogram.buckets] + ["+Inf"]
+            for bound, bucket_count in zip(bounds, histogram.bucket_counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{format_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(labels)} {histogram.total:.6f}")
+            lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+        typed = set()
+        for (counter_name, labels), value in counters:
+            full_name = f"{self.prefix}_{counter_name}_total"
+            if full_name not in typed:
+                lines.append(f"# TYPE {full_name} counter")
+                typed.add(full_name)
+            lines.append(f"{full_name}{format_labels(labels)} {value}")
+        lines.append(f"# TYPE {self.prefix}_uptime_seconds gauge")
+        lines.append(f"{self.prefix}_uptime_seconds {time.time() - self.started:.1f}")
+        return "\n".join(lines) + "\n"
+
+    def summary_lines(self):
+        """One log line per stage with count, avg, p95 and max, plus the counters"""
+        lines = []
+        for stage, stats in sorted(self.stage_stats().items()):
+            lines.append(f"Stage timing '{stage}': {stats['count']} calls, avg {stats['avg'] * 1000:.1f} ms, "
+                         f"p95 <= {stats['p95'] * 1000:.1f} ms, max {stats['max'] * 1000:.1f} ms")
+        with self.lock:
+            totals = {}
+            for (counter_name, _), value in self.counters.items():
+                totals[counter_name] = totals.get(counter_name, 0) + value
+        if totals:
+            lines.append("Counters: " + ", ".join(f"{name}={value}" for name, value in sorted(totals.items())))
+        return lines
+
+class MetricsServer:
+    """Serves a MetricsRegistry as Prometheus text at http://host:port/metrics (localhost by default)"""
+    def __init__(self, registry, host="127.0.0.1", port=9108):
+        self.registry = registry
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry_ref.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+class MetricsReporter:
+    """Logs the registry's summary every interval seconds on a background thread"""
+    def __init__(self, registry, log, interval=60.0):
+        self.registry = registry
+        self.log = log
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="metrics-reporter", daemon=True)
+        self.thread.start()
+        return self
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            for line in self.registry.summary_lines():
+                self.log(line)
+
+    def stop(self):
+        self.stopped.set()
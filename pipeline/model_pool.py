@@ -0,0 +1,181 @@
+#Import All the Required Libraries
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+class ModelPool:
+    """A few model workers shared by many streams, batching requests across streams
+
+    make_handler(worker_index) is called once per worker thread and returns that worker's
+    handler: a function taking a list of items and returning one result per item. Each
+    worker therefore owns its own model replica. Requests wait in per-stream queues and
+    batches are filled round-robin, one request per stream per pass, starting after the
+    stream served first last time, so a busy camera cannot starve a quiet one.
+    """
+    def __init__(self, name, make_handler, workers=1, max_batch_size=8, max_wait=0.005):
+        self.name = name
+        self.make_handler = make_handler
+        self.workers = max(1, int(workers))
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max_wait
+        self.streams = {}
+        self.order = []
+        self.next_index = 0
+        self.pending = 0
+        self.condition = threading.Condition()
+        self.threads = []
+        self.running = False
+        self.failed_workers = 0
+        # Set when no worker could load its model; later requests fail with it right away
+        self.error = None
+        self.batches = 0
+        self.batched_items = 0
+
+    def register_stream(self, stream_id):
+        with self.condition:
+            if stream_id not in self.streams:
+                self.streams[stream_id] = {
+                    'queue': deque(),
+                    'submitted': 0,
+                    'completed': 0,
+                    'wait_time': 0.0,
+                    'max_wait_time': 0.0,
+                    'latency': 0.0,
+                    'max_latency': 0.0
+                }
+                self.order.append(stream_id)
+
+    def submit(self, stream_id, item):
+        """Queue item for stream_id and return a Future for its result"""
+        future = Future()
+        self.register_stream(stream_id)
+        with self.condition:
+            if self.error is not None:
+                future.set_exception(self.error)
+                return future
+            stream = self.streams[stream_id]
+            stream['queue'].append((item, future, time.perf_counter()))
+            stream['submitted'] += 1
+            self.pending += 1
+            self.condition.notify()
+        return future
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.failed_workers = 0
+        self.error = None
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run_worker, args=(index,),
+                                      name=f"{self.name}-worker-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, timeout=5):
+        """Stop the workers; requests still queued fail with RuntimeError"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+        with self.condition:
+            self.fail_queued(RuntimeError(f"{self.name} pool stopped"))
+
+    def fail_queued(self, error):
+        """Fail every queued request with error (caller holds the lock)"""
+        for stream in self.streams.values():
+            while stream['queue']:
+                _, future, _ = stream['queue'].popleft()
+                future.set_exception(error)
+        self.pending = 0
+
+    def metrics(self):
+        """Batching and per-stream wait/latency figures (seconds)"""
+        with self.condition:
+            streams = {}
+            for stream_id, stream in self.streams.items():
+                completed = stream['completed']
+                streams[stream_id] = {
+                    'submitted': stream['submitted'],
+                    'completed': completed,
+                    'queued': len(stream['queue']),
+                    'avg_wait': stream['wait_time'] / completed if completed else 0.0,
+                    'max_wait': stream['max_wait_time'],
+                    'avg_latency': stream['latency'] / completed if completed else 0.0,
+                    'max_latency': stream['max_latency']
+                }
+            return {
+                'batches': self.batches,
+                'avg_batch_size': self.batched_items / self.batches if self.batches else 0.0,
+                'streams': streams
+            }
+
+    def next_batch(self):
+        """Take up to max_batch_size requests round-robin across streams (caller holds the lock)"""
+        batch = []
+        while len(batch) < self.max_batch_size and self.pending:
+            for offset in range(len(self.order)):
+                stream_id = self.order[(self.next_index + offset) % len(self.order)]
+                stream = self.streams[stream_id]
+                if stream['queue']:
+                    batch.append((stream_id,) + stream['queue'].popleft())
+                    self.pending -= 1
+                    if len(batch) == self.max_batch_size:
+                        break
+            # The next batch starts with the stream after the first one served here
+            self.next_index = (self.next_index + 1) % len(self.order)
+        return batch
+
+    def _run_worker(self, index):
+        try:
+            handler = self.make_handler(index)
+        except Exception as e:
+            print(f"{self.name} pool worker {index} failed to start: {e}")
+            with self.condition:
+                self.failed_workers += 1
+                if self.failed_workers == self.workers:
+                    # Nothing is left to serve the queues, so fail their requests as stop() does
+                    self.error = RuntimeError(f"{self.name} pool has no workers: {e}")
+                    self.running = False
+                    self.fail_queued(self.error)
+            return
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                # Give other streams a moment to join a batch that is not full yet
+                if self.pending < self.max_batch_size and self.max_wait:
+                    self.condition.wait(self.max_wait)
+                batch = self.next_batch()
+            if not batch:
+                continue
+            start_time = time.perf_counter()
+            try:
+                results = handler([item for _, item, _, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"{self.name} handler returned {len(results)} results for {len(batch)} items")
+                error = None
+            except Exception as e:
+                results = [None] * len(batch)
+                error = e
+            end_time = time.perf_counter()
+            with self.condition:
+                self.batches += 1
+                self.batched_items += len(batch)
+                for stream_id, _, _, submitted_at in batch:
+                    stream = self.streams[stream_id]
+                    stream['completed'] += 1
+                    stream['wait_time'] += start_time - submitted_at
+                    stream['max_wait_time'] = max(stream['max_wait_time'], start_time - submitted_at)
+                    stream['latency'] += end_time - submitted_at
+                    stream['max_latency'] = max(stream['max_latency'], end_time - submitted_at)
+            for (_, _, future, _), result in zip(batch, results):
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
@@ -0,0 +1,69 @@
+#Import All the Required Libraries
+from collections import Counter
+
+class TrackOCRBudget:
+    """Decides per track ID whether a plate crop is still worth sending to OCR
+
+    A track keeps getting OCR until stable_reads valid reads agree on the same text.
+    After that it is only re-read when its box grows by growth_ratio or its crop gets
+    sharper by sharpness_ratio compared to the best crop already read, unless reread_stable
+    is off (the quality governor turns it off under load).
+    """
+    def __init__(self, stable_reads=3, growth_ratio=1.3, sharpness_ratio=1.5, reread_stable=True):
+        self.stable_reads = max(1, int(stable_reads))
+        self.reread_stable = reread_stable
+        self.growth_ratio = growth_ratio
+        self.sharpness_ratio = sharpness_ratio
+        self.tracks = {}
+        self.ocr_calls = 0
+        self.ocr_skipped = 0
+
+    def reset(self):
+        self.tracks.clear()
+        self.ocr_calls = 0
+        self.ocr_skipped = 0
+
+    def should_ocr(self, track_id, box, sharpness=0.0):
+        """Return True if this detection of track_id should be OCR'd"""
+        state = self.tracks.get(track_id)
+        if track_id == -1 or state is None or self.stable_text(track_id) is None:
+            self.ocr_calls += 1
+            return True
+        area = box_area(box)
+        if self.reread_stable and (area >= state['best_area'] * self.growth_ratio or
+                                   (sharpness and sharpness >= state['best_sharpness'] * self.sharpness_ratio)):
+            self.ocr_calls += 1
+            return True
+        self.ocr_skipped += 1
+        return False
+
+    def record(self, track_id, text, box, sharpness=0.0):
+        """Record the outcome of an OCR call; text is None when the read was not a valid plate"""
+        if track_id == -1:
+            return
+        state = self.tracks.setdefault(track_id, {'reads': Counter(), 'best_area': 0, 'best_sharpness': 0.0})
+        state['best_area'] = max(state['best_area'], box_area(box))
+        state['best_sharpness'] = max(state['best_sharpness'], sharpness or 0.0)
+        if text:
+            state['reads'][text] += 1
+
+    def stable_text(self, track_id):
+        """Return the agreed text for track_id, or None if it is not stable yet"""
+        state = self.tracks.get(track_id)
+        if not state or not state['reads']:
+            return None
+        text, count = state['reads'].most_common(1)[0]
+        return text if count >= self.stable_reads else None
+
+    def stats(self):
+        total = self.ocr_calls + self.ocr_skipped
+        return {
+            'ocr_calls': self.ocr_calls,
+            'ocr_skipped': self.ocr_skipped,
+            'skip_rate': self.ocr_skipped / total if total else 0.0,
+            'stable_tracks': sum(1 for track_id in self.tracks if self.stable_text(track_id) is not None)
+        }
+
+def box_area(box):
+    x1, y1, x2, y2 = box
+    return max(0, x2 - x1) * max(0, y2 - y1)
@@ -0,0 +1,119 @@
+#Import All the Required Libraries
+import re
+import time
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from alerts.watchlist_index import deletion_variants
+
+class PlateDeduplicator:
+    """Time-windowed cache of recently accepted plates with an approximate-match index
+
+    A plate is a duplicate if the same or a similar plate was accepted within the last
+    cooldown_frames frames or cooldown_seconds seconds. Similar plates are found through
+    a deletion-variant index (up to index_distance edits), then confirmed with
+    SequenceMatcher, so the cost of a check does not grow with the session length.
+    Only accepted plates refresh the window; the cache never holds more than max_entries.
+    """
+    def __init__(self, cooldown_frames=None, cooldown_seconds=None, similarity_threshold=0.8,
+                 max_length_difference=2, index_distance=2, max_entries=5000, clock=time.monotonic):
+        self.cooldown_frames = cooldown_frames
+        self.cooldown_seconds = cooldown_seconds
+        self.similarity_threshold = similarity_threshold
+        self.max_length_difference = max_length_difference
+        self.index_distance = index_distance
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.variants = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, plate):
+        return self.normalize(plate) in self.entries
+
+    def clear(self):
+        self.entries.clear()
+        self.variants.clear()
+
+    def normalize(self, plate):
+        return re.sub(r'[^A-Z0-9]', '', (plate or '').upper())
+
+    def is_duplicate(self, plate, frame_count=None, now=None):
+        """Return (is_duplicate, matched_plate) without recording the plate"""
+        now = self.clock() if now is None else now
+        self.expire(frame_count, now)
+        key = self.normalize(plate)
+        if not plate or plate == "N/A" or len(key) < 3:
+            return True, None
+        if key in self.entries:
+            return True, self.entries[key]['plate']
+        for candidate in self.similar_keys(key):
+            return True, self.entries[candidate]['plate']
+        return False, None
+
+    def add(self, plate, frame_count=None, now=None):
+        """Record plate as accepted at frame_count / now"""
+        now = self.clock() if now is None else now
+        key = self.normalize(plate)
+        if not key:
+            return
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            entry = {'plate': plate, 'count': 0}
+            for variant in deletion_variants(key, self.index_distance):
+                self.variants.setdefault(variant, set()).add(key)
+        entry.update({'last_frame': frame_count, 'last_time': now, 'count': entry['count'] + 1})
+        # Most recently accepted plates live at the end, so expiry only looks at the front
+        self.entries[key] = entry
+        while len(self.entries) > self.max_entries:
+            self.evict(next(iter(self.entries)))
+
+    def check_and_add(self, plate, frame_count=None, now=None):
+        """Return (is_duplicate, matched_plate) and record the plate if it is new"""
+        now = self.clock() if now is None else now
+        is_duplicate, matched_plate = self.is_duplicate(plate, frame_count, now)
+        if not is_duplicate:
+            self.add(plate, frame_count, now)
+        return is_duplicate, matched_plate
+
+    def similar_keys(self, key):
+        """Yield cached keys that are similar enough to key, best match first"""
+        candidates = set()
+        for variant in deletion_variants(key, self.index_distance):
+            candidates.update(self.variants.get(variant, ()))
+        scored = []
+        for candidate in candidates:
+            if abs(len(candidate) - len(key)) > self.max_length_difference:
+                continue
+            ratio = SequenceMatcher(None, key, candidate).ratio()
+            if ratio >= self.similarity_threshold:
+                scored.append((ratio, candidate))
+        for _, candidate in sorted(scored, reverse=True):
+            yield candidate
+
+    def expire(self, frame_count=None, now=None):
+        """Drop entries older than the cooldown window"""
+        while self.entries:
+            key, entry = next(iter(self.entries.items()))
+            if not self.is_expired(entry, frame_count, now):
+                break
+            self.evict(key)
+
+    def is_expired(self, entry, frame_count, now):
+        if self.cooldown_frames is not None and frame_count is not None and entry['last_frame'] is not None:
+            if frame_count - entry['last_frame'] >= self.cooldown_frames:
+                return True
+        if self.cooldown_seconds is not None and now is not None:
+            if now - entry['last_time'] >= self.cooldown_seconds:
+                return True
+        return False
+
+    def evict(self, key):
+        self.entries.pop(key, None)
+        for variant in deletion_variants(key, self.index_distance):
+            keys = self.variants.get(variant)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.variants[variant]
@@ -0,0 +1,188 @@
+#Import All the Required Libraries
+import threading
+import time
+from .alert_latency import percentile
+
+# Quality levels from full to minimal; each level gives up at least as much as the one before
+#   frame_stride:    infer 1 of every frame_stride frames the sampler (or frame_skip) lets through
+#   inference_size:  image size the plate model detects at (None: the model's own size)
+#   ocr_crop_height: height plate crops are scaled to for OCR, at most (None: the camera's setting)
+#   max_ocr_plates:  plates per frame sent to OCR, biggest first (None: all of them)
+#   stable_reads:    agreeing reads after which a track stops getting OCR
+#   reread_stable:   whether stable tracks are re-read when their plate grows or gets sharper
+QUALITY_LEVELS = (
+    {'name': 'full', 'frame_stride': 1, 'inference_size': None, 'ocr_crop_height': None,
+     'max_ocr_plates': None, 'stable_reads': 3, 'reread_stable': True},
+    {'name': 'settled-tracks', 'frame_stride': 1, 'inference_size': None, 'ocr_crop_height': None,
+     'max_ocr_plates': None, 'stable_reads': 2, 'reread_stable': False},
+    {'name': 'fewer-ocr', 'frame_stride': 1, 'inference_size': None, 'ocr_crop_height': 48,
+     'max_ocr_plates': 4, 'stable_reads': 2, 'reread_stable': False},
+    {'name': 'small-inference', 'frame_stride': 1, 'inference_size': 480, 'ocr_crop_height': 48,
+     'max_ocr_plates': 4, 'stable_reads': 2, 'reread_stable': False},
+    {'name': 'half-rate', 'frame_stride': 2, 'inference_size': 480, 'ocr_crop_height': 48,
+     'max_ocr_plates': 3, 'stable_reads': 2, 'reread_stable': False},
+    {'name': 'minimal', 'frame_stride': 3, 'inference_size': 320, 'ocr_crop_height': 40,
+     'max_ocr_plates': 2, 'stable_reads': 1, 'reread_stable': False},
+)
+
+def describe_level(level):
+    """What a quality level gives up, for the log"""
+    parts = []
+    if level['frame_stride'] > 1:
+        parts.append(f"1 of every {level['frame_stride']} sampled frames inferred")
+    if level['inference_size']:
+        parts.append(f"detection at {level['inference_size']} px")
+    if level['ocr_crop_height']:
+        parts.append(f"OCR crops at most {level['ocr_crop_height']} px high")
+    if level['max_ocr_plates']:
+        parts.append(f"OCR on the {level['max_ocr_plates']} biggest plates per frame")
+    if level['stable_reads'] != QUALITY_LEVELS[0]['stable_reads']:
+        reads = level['stable_reads']
+        parts.append(f"tracks settle after {reads} agreeing read{'s' if reads != 1 else ''}")
+    if not level['reread_stable']:
+        parts.append("settled tracks never re-read")
+    return ", ".join(parts) or "full coverage"
+
+class QualityGovernor:
+    """Steps one stream's quality down when it falls behind and back up when it has headroom
+
+    Every check_interval seconds the stream reports how many frames it has read and how
+    full its stage queues are; the decode-to-detection latency of every inferred frame is
+    recorded as it happens. A check is overloaded when the read rate is below target_fps,
+    the p95 latency above target_latency or a queue fuller than max_queue_fill, and
+    degrade_checks overloaded checks in a row step one level down QUALITY_LEVELS. It takes
+    recover_checks checks in a row with headroom (recover_margin better than the targets,
+    queues at most half as full) to step one level back up. A recovery that is undone by
+    the very next change doubles the checks the next recovery needs (up to 16x), so a
+    stream that can only just keep up settles instead of flapping between two levels.
+    """
+    def __init__(self, target_fps=None, target_latency=None, check_interval=2.0, degrade_checks=2,
+                 recover_checks=5, recover_margin=1.25, max_queue_fill=0.75, levels=QUALITY_LEVELS,
+                 log=None, clock=time.monotonic):
+        self.target_fps = target_fps
+        self.target_latency = target_latency
+        self.check_interval = check_interval
+        self.degrade_checks = max(1, int(degrade_checks))
+        self.recover_checks = max(1, int(recover_checks))
+        self.recover_margin = recover_margin
+        self.max_queue_fill = max_queue_fill
+        self.levels = levels
+        self.log = log or (lambda message: None)
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.level_index = 0
+        self.latencies = []
+        self.last_check = None
+        self.frames_at_check = 0
+        self.overloaded_checks = 0
+        self.healthy_checks = 0
+        self.recover_after = self.recover_checks
+        self.candidates = 0
+        # (clock time, from level, to level, reason) of every change
+        self.changes = []
+        self.level_seconds = [0.0] * len(levels)
+        self.level_since = None
+
+    @property
+    def level(self):
+        return self.levels[self.level_index]
+
+    def admit_frame(self):
+        """Keep 1 of every frame_stride frames offered; called once per frame the sampler wants"""
+        stride = self.level['frame_stride']
+        if stride <= 1:
+            return True
+        self.candidates += 1
+        return self.candidates % stride == 0
+
+    def record_latency(self, seconds):
+        with self.lock:
+            self.latencies.append(seconds)
+
+    def check(self, frames_read, queue_fill=0.0):
+        """Evaluate the last check_interval seconds; returns the new level on a change, else None"""
+        now = self.clock()
+        if self.last_check is None:
+            self.last_check = self.level_since = now
+            self.frames_at_check = frames_read
+            return None
+        elapsed = now - self.last_check
+        if elapsed < self.check_interval:
+            return None
+        read_fps = (frames_read - self.frames_at_check) / elapsed
+        with self.lock:
+            latencies, self.latencies = sorted(self.latencies), []
+        self.last_check = now
+        self.frames_at_check = frames_read
+        return self.evaluate(read_fps, percentile(latencies, 0.95) if latencies else None, queue_fill, now)
+
+    def evaluate(self, read_fps, latency_p95, queue_fill, now):
+        problems = self.overload_reasons(read_fps, latency_p95, queue_fill)
+        if problems:
+            self.healthy_checks = 0
+            self.overloaded_checks += 1
+            if self.overloaded_checks >= self.degrade_checks and self.level_index < len(self.levels) - 1:
+                return self.set_level(self.level_index + 1, now, ", ".join(problems))
+        elif self.has_headroom(read_fps, latency_p95, queue_fill):
+            self.overloaded_checks = 0
+            self.healthy_checks += 1
+            if self.healthy_checks >= self.recover_after and self.level_index > 0:
+                return self.set_level(self.level_index - 1, now, self.headroom_text(read_fps, latency_p95))
+        else:
+            self.overloaded_checks = 0
+            self.healthy_checks = 0
+        return None
+
+    def overload_reasons(self, read_fps, latency_p95, queue_fill):
+        reasons = []
+        if self.target_fps and read_fps < self.target_fps:
+            reasons.append(f"read {read_fps:.1f} FPS < target {self.target_fps:.1f}")
+        if self.target_latency and latency_p95 is not None and latency_p95 > self.target_latency:
+            reasons.append(f"p95 latency {latency_p95 * 1000:.0f} ms > target {self.target_latency * 1000:.0f} ms")
+        if queue_fill >= self.max_queue_fill:
+            reasons.append(f"stage queues {queue_fill:.0%} full")
+        return reasons
+
+    def has_headroom(self, read_fps, latency_p95, queue_fill):
+        if self.target_fps and read_fps < self.target_fps * self.recover_margin:
+            return False
+        if self.target_latency and latency_p95 is not None and latency_p95 > self.target_latency / self.recover_margin:
+            return False
+        return queue_fill <= self.max_queue_fill / 2
+
+    def headroom_text(self, read_fps, latency_p95):
+        parts = [f"read {read_fps:.1f} FPS"]
+        if latency_p95 is not None:
+            parts.append(f"p95 latency {latency_p95 * 1000:.0f} ms")
+        return f"headroom for {self.recover_after} checks: " + ", ".join(parts)
+
+    def set_level(self, index, now, reason):
+        previous = self.level_index
+        if index > previous and self.changes and self.changes[-1][2] < self.changes[-1][1]:
+            self.recover_after = min(self.recover_after * 2, self.recover_checks * 16)
+        elif index == 0:
+            self.recover_after = self.recover_checks
+        self.level_seconds[previous] += now - self.level_since
+        self.level_since = now
+        self.level_index = index
+        self.overloaded_checks = 0
+        self.healthy_checks = 0
+        self.candidates = 0
+        self.changes.append((now, previous, index, reason))
+        direction = "degraded" if index > previous else "recovered"
+        self.log(f"Quality {direction} to '{self.level['name']}' (level {index}/{len(self.levels) - 1}) "
+                 f"because {reason}; now: {describe_level(self.level)}")
+        return self.level
+
+    def stats(self):
+        """Degradations, recoveries and seconds spent at each level name"""
+        seconds = list(self.level_seconds)
+        if self.level_since is not None:
+            seconds[self.level_index] += self.clock() - self.level_since
+        return {
+            'level': self.level['name'],
+            'degradations': sum(1 for _, previous, index, _ in self.changes if index > previous),
+            'recoveries': sum(1 for _, previous, index, _ in self.changes if index < previous),
+            'level_seconds': {level['name']: round(spent, 1)
+                              for level, spent in zip(self.levels, seconds) if spent > 0}
+        }
@@ -0,0 +1,54 @@
+#Import All the Required Libraries
+import cv2
+import numpy as np
+
+class RegionOfInterest:
+    """Polygon of a camera image that is worth running detection on
+
+    Points are fractions of the frame width and height, so one polygon fits any
+    resolution. apply() crops a frame to the polygon's bounding rectangle and blanks
+    the pixels outside the polygon; to_frame() maps boxes found in the crop back.
+    """
+    def __init__(self, polygon, fill=(114, 114, 114)):
+        if len(polygon) < 3:
+            raise ValueError("A region of interest needs at least 3 points")
+        self.polygon = [(float(x), float(y)) for x, y in polygon]
+        self.fill = fill
+        self.frame_shape = None
+        self.rect = None
+        self.mask = None
+
+    def prepare(self, frame_shape):
+        """Compute the pixel rectangle and mask for frames of this shape (cached)"""
+        if self.frame_shape == frame_shape[:2]:
+            return
+        height, width = frame_shape[:2]
+        points = np.array([[min(max(x, 0.0), 1.0) * (width - 1), min(max(y, 0.0), 1.0) * (height - 1)]
+                           for x, y in self.polygon], dtype=np.float32).round().astype(np.int32)
+        x, y, w, h = cv2.boundingRect(points)
+        mask = np.zeros((h, w), dtype=np.uint8)
+        cv2.fillPoly(mask, [points - np.array([x, y], dtype=np.int32)], 255)
+        self.frame_shape = frame_shape[:2]
+        self.rect = (x, y, w, h)
+        self.mask = mask
+
+    def apply(self, frame):
+        """Return the frame cropped to the ROI rectangle with everything outside the polygon blanked"""
+        self.prepare(frame.shape)
+        x, y, w, h = self.rect
+        crop = frame[y:y + h, x:x + w].copy()
+        crop[self.mask == 0] = self.fill
+        return crop
+
+    def to_frame(self, box):
+        """Map an (x1, y1, x2, y2) box from ROI crop coordinates back to frame coordinates"""
+        x, y = self.rect[:2]
+        x1, y1, x2, y2 = box
+        return [int(x1) + x, int(y1) + y, int(x2) + x, int(y2) + y]
+
+    def pixel_fraction(self):
+        """Share of the frame's pixels that detection still sees"""
+        if self.rect is None:
+            return 1.0
+        height, width = self.frame_shape
+        return self.rect[2] * self.rect[3] / float(width * height)
@@ -0,0 +1,143 @@
+#Import All the Required Libraries
+import queue
+import threading
+import time
+
+# Marks the end of the stream as it travels through the stage queues
+_END = object()
+
+class PipelineStage:
+    """One processing stage: a bounded input queue drained by one or more worker threads
+
+    A drain_on_stop stage keeps handling the items that reach it after the pipeline is
+    stopped, for work that must not be lost once accepted (alerts); other stages discard them.
+    """
+    def __init__(self, name, handler, maxsize=8, workers=1, drain_on_stop=False):
+        self.name = name
+        self.handler = handler
+        self.drain_on_stop = drain_on_stop
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.workers = max(1, int(workers))
+        self.processed = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.max_depth = 0
+        self.finished_workers = 0
+        self.lock = threading.Lock()
+
+    def metrics(self):
+        return {
+            'queue_depth': self.queue.qsize(),
+            'max_queue_depth': self.max_depth,
+            'queue_capacity': self.queue.maxsize,
+            'processed': self.processed,
+            'errors': self.errors,
+            'busy_time': self.busy_time,
+            'avg_time': self.busy_time / self.processed if self.processed else 0.0
+        }
+
+class StagedPipeline:
+    """Producer/consumer pipeline; bounded queues between stages give backpressure
+
+    Each stage handler takes one item and returns the item for the next stage, or None
+    to drop it. The source iterable is consumed on its own reader thread.
+    """
+    def __init__(self, should_stop=None, on_error=None, poll_interval=0.1):
+        self.stages = []
+        self.should_stop = should_stop or (lambda: False)
+        self.on_error = on_error
+        self.poll_interval = poll_interval
+        self.source_items = 0
+
+    def add_stage(self, name, handler, maxsize=8, workers=1, drain_on_stop=False):
+        self.stages.append(PipelineStage(name, handler, maxsize=maxsize, workers=workers,
+                                         drain_on_stop=drain_on_stop))
+        return self
+
+    def run(self, source):
+        """Feed source through every stage and block until the stream has drained"""
+        threads = [threading.Thread(target=self._read_source, args=(source,), name="pipeline-reader", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            for worker in range(stage.workers):
+                threads.append(threading.Thread(target=self._run_worker, args=(index,),
+                                                name=f"pipeline-{stage.name}-{worker}", daemon=True))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def queue_depths(self):
+        return {stage.name: stage.queue.qsize() for stage in self.stages}
+
+    def queue_fill(self):
+        """How full the fullest stage queue is, 0.0 to 1.0; single-slot queues (live detect) are left out"""
+        fills = [stage.queue.qsize() / float(stage.queue.maxsize) for stage in self.stages if stage.queue.maxsize > 1]
+        return max(fills) if fills else 0.0
+
+    def metrics(self):
+        return {stage.name: stage.metrics() for stage in self.stages}
+
+    def _put(self, stage, item):
+        """Block while the stage queue is full, but give up if the pipeline is stopped
+
+        A drain_on_stop stage keeps consuming after a stop, so puts to it never give up.
+        """
+        while True:
+            try:
+                stage.queue.put(item, timeout=self.poll_interval)
+                stage.max_depth = max(stage.max_depth, stage.queue.qsize())
+                return True
+            except queue.Full:
+                if item is not _END and not stage.drain_on_stop and self.should_stop():
+                    return False
+
+    def _read_source(self, source):
+        first_stage = self.stages[0]
+        try:
+            for item in source:
+                if self.should_stop() or not self._put(first_stage, item):
+                    break
+                self.source_items += 1
+        except Exception as e:
+            self._report_error("source", e)
+        finally:
+            self._put(first_stage, _END)
+
+    def _run_worker(self, index):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            item = stage.queue.get()
+            if item is _END:
+                with stage.lock:
+                    stage.finished_workers += 1
+                    last_worker = stage.finished_workers == stage.workers
+                if last_worker:
+                    if next_stage is not None:
+                        self._put(next_stage, _END)
+                else:
+                    # Let the sibling workers of this stage see the end marker too
+                    stage.queue.put(_END)
+                return
+            if not stage.drain_on_stop and self.should_stop():
+                # Drain without processing so upstream puts never block forever
+                continue
+            start_time = time.perf_counter()
+            try:
+                result = stage.handler(item)
+            except Exception as e:
+                result = None
+                with stage.lock:
+                    stage.errors += 1
+                self._report_error(stage.name, e)
+            with stage.lock:
+                stage.processed += 1
+                stage.busy_time += time.perf_counter() - start_time
+            if result is not None and next_stage is not None:
+                self._put(next_stage, result)
+
+    def _report_error(self, stage_name, error):
+        if self.on_error is not None:
+            self.on_error(stage_name, error)
+        else:
+            print(f"Pipeline stage '{stage_name}' failed: {error}")
@@ -0,0 +1,62 @@
+#Import All the Required Libraries
+import itertools
+
+def box_iou(box_a, box_b):
+    """Intersection over union of two (x1, y1, x2, y2) boxes"""
+    x1 = max(box_a[0], box_b[0])
+    y1 = max(box_a[1], box_b[1])
+    x2 = min(box_a[2], box_b[2])
+    y2 = min(box_a[3], box_b[3])
+    intersection = max(0, x2 - x1) * max(0, y2 - y1)
+    area_a = max(0, box_a[2] - box_a[0]) * max(0, box_a[3] - box_a[1])
+    area_b = max(0, box_b[2] - box_b[0]) * max(0, box_b[3] - box_b[1])
+    union = area_a + area_b - intersection
+    return intersection / union if union > 0 else 0.0
+
+class IoUTracker:
+    """Greedy IoU tracker giving plate boxes stable IDs across the frames of one stream
+
+    Used where detections come from a shared model (predict, not track), so each stream
+    keeps its own tracks. A track is dropped after max_missed updates without a match.
+    """
+    def __init__(self, iou_threshold=0.3, max_missed=10):
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.tracks = {}
+        self.ids = itertools.count(1)
+
+    def update(self, boxes):
+        """Return a track ID for each box of the current frame"""
+        pairs = []
+        for index, box in enumerate(boxes):
+            for track_id, track in self.tracks.items():
+                iou = box_iou(box, track['box'])
+                if iou >= self.iou_threshold:
+                    pairs.append((iou, index, track_id))
+        assigned = {}
+        used_tracks = set()
+        for iou, index, track_id in sorted(pairs, reverse=True):
+            if index in assigned or track_id in used_tracks:
+                continue
+            assigned[index] = track_id
+            used_tracks.add(track_id)
+
+        track_ids = []
+        for index, box in enumerate(boxes):
+            track_id = assigned.get(index)
+            if track_id is None:
+                track_id = next(self.ids)
+            self.tracks[track_id] = {'box': tuple(box), 'missed': 0}
+            used_tracks.add(track_id)
+            track_ids.append(track_id)
+
+        for track_id in list(self.tracks):
+            if track_id not in used_tracks:
+                self.tracks[track_id]['missed'] += 1
+                if self.tracks[track_id]['missed'] > self.max_missed:
+                    del self.tracks[track_id]
+        return track_ids
+
+    def reset(self):
+        self.tracks.clear()
+        self.ids = itertools.count(1)
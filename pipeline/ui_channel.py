@@ -0,0 +1,66 @@
+#Import All the Required Libraries
+import threading
+from collections import deque
+
+class UIUpdateChannel:
+    """Thread-safe mailbox between pipeline threads and a GUI that polls it
+
+    Pipeline threads only record state here: the latest progress replaces the previous one,
+    and log lines, detection lines and alerts are appended. The GUI calls drain() on a
+    timer (e.g. 5 times a second) and applies everything in one go, so the cost on the GUI
+    thread depends on the poll rate, not on the frame rate. Pending lines are capped at
+    max_pending per kind; when the GUI falls that far behind the oldest ones are dropped
+    and counted.
+    """
+    def __init__(self, max_pending=2000):
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.progress = None
+        self.progress_changed = False
+        self.logs = deque()
+        self.detections = deque()
+        self.alerts = deque()
+        self.dropped = 0
+
+    def set_progress(self, **progress):
+        """Record the latest progress (any keyword fields); only the newest is shown"""
+        with self.lock:
+            self.progress = progress
+            self.progress_changed = True
+
+    def add_log(self, line):
+        self._append(self.logs, line)
+
+    def add_detection(self, line):
+        self._append(self.detections, line)
+
+    def add_alert(self, alert):
+        self._append(self.alerts, alert)
+
+    def _append(self, pending, item):
+        with self.lock:
+            pending.append(item)
+            if len(pending) > self.max_pending:
+                pending.popleft()
+                self.dropped += 1
+
+    def drain(self):
+        """Take everything recorded since the last drain
+
+        Returns a dict with progress (None if unchanged), logs, detections, alerts and
+        dropped (lines lost to the cap since the last drain).
+        """
+        with self.lock:
+            update = {
+                'progress': self.progress if self.progress_changed else None,
+                'logs': list(self.logs),
+                'detections': list(self.detections),
+                'alerts': list(self.alerts),
+                'dropped': self.dropped
+            }
+            self.progress_changed = False
+            self.logs.clear()
+            self.detections.clear()
+            self.alerts.clear()
+            self.dropped = 0
+        return update
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Headless entry point: run plate detection and watch-list alerting without the Tkinter UI
+
+Usage:
+    python plate_alert_cli.py input_videos/video4.mp4 rtsp://camera/stream --model models/best.pt
+
+Several sources run at the same time and share one pool of model workers. Stream URLs,
+camera indices and fake://path/to/video.mp4 (a file replayed as a live camera) are read as
+live streams: only the newest frame is processed and lost streams are reconnected.
+
+With --batch the sources are folders or glob patterns of video files, processed in parallel
+by --workers processes:
+    python plate_alert_cli.py --batch evidence/case_42/ --model models/best.pt --workers 4
+"""
+
+#Import All the Required Libraries
+import argparse
+import signal
+import sys
+from pipeline.engine import PlateAlertEngine
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Detect licence plates in videos or streams and alert on watch-list hits")
+    parser.add_argument("sources", nargs="+", help="Video files or stream URLs (folders or globs with --batch)")
+    parser.add_argument("--model", required=True, help="YOLO licence plate model (.pt)")
+    parser.add_argument("--car-model", help="Optional YOLO car model for two-stage detection")
+    parser.add_argument("--settings", default="license_plate_settings.json",
+                        help="Settings file with the watch list, contacts and alert configuration")
+    parser.add_argument("--db", default="detection_history.db", help="Detection store (SQLite)")
+    parser.add_argument("--outbox", default="alert_outbox", help="Spool directory for pending alerts")
+    parser.add_argument("--cache", default="detection_cache.db",
+                        help="Detection cache; re-runs over the same video, models and settings skip inference")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the detection cache")
+    parser.add_argument("--alert-timeout", type=float, default=60.0,
+                        help="Seconds to wait for queued alerts to be delivered before exiting")
+    parser.add_argument("--progress-interval", type=int, default=300,
+                        help="Log progress every this many frames")
+    parser.add_argument("--sequential", action="store_true",
+                        help="Process sources one after another instead of concurrently")
+    parser.add_argument("--detect-workers", type=int, default=1,
+                        help="Detection model replicas shared by all concurrent sources")
+    parser.add_argument("--ocr-workers", type=int, default=1,
+                        help="OCR model replicas shared by all concurrent sources")
+    parser.add_argument("--batch-size", type=int, default=8,
+                        help="Largest cross-source batch sent to a model worker")
+    parser.add_argument("--live", action="store_true",
+                        help="Treat every source as a live stream (newest frame wins, reconnect on loss)")
+    parser.add_argument("--max-reconnects", type=int, default=None,
+                        help="Give up on a live stream after this many failed reconnects in a row (default: never)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Process every video in the given folders/globs on a pool of worker processes")
+    parser.add_argument("--workers", type=int, default=2,
+                        help="Worker processes in batch mode; each loads its own YOLO and PaddleOCR")
+    parser.add_argument("--checkpoint", default="batch_checkpoint.json",
+                        help="Batch progress file; videos finished by an earlier run are skipped")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve per-stage timings in the Prometheus format on 127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-interval", type=float, default=60.0,
+                        help="Log a per-stage timing summary every this many seconds (0 turns it off)")
+    parser.add_argument("--target-fps", type=float, default=None,
+                        help="Frames/sec each source must be read at; below it the stream trades coverage for speed")
+    parser.add_argument("--target-latency", type=float, default=None,
+                        help="p95 seconds from decode to detection; above it the stream trades coverage for speed")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    # Without an on_progress callback every stream logs its own progress
+    engine = PlateAlertEngine(settings_path=args.settings, store_path=args.db, spool_dir=args.outbox,
+                              progress_interval=args.progress_interval,
+                              cache_path=None if args.no_cache else args.cache,
+                              metrics_port=args.metrics_port, metrics_log_interval=args.metrics_interval)
+    engine.live_mode = args.live
+    engine.live_max_reconnects = args.max_reconnects
+    engine.quality_target_fps = args.target_fps
+    engine.quality_target_latency = args.target_latency
+    if not engine.load_settings():
+        engine.log_message(f"Settings file {args.settings} not found; running with an empty watch list")
+    engine.log_message(f"Watch list: {len(engine.watch_list)} plate(s)")
+    if args.batch:
+        return run_batch(engine, args)
+    engine.load_model(args.model)
+    if args.car_model:
+        engine.load_car_model(args.car_model)
+    engine.start()
+    
+    stopping = []
+    exit_code = 0
+    # Streams see the first Ctrl+C through should_stop and join their pipelines before the engine closes
+    previous_handler = signal.signal(signal.SIGINT, stop_handler(
+        engine, stopping, "Stopping; alerts already read are still sent. Press Ctrl+C again to abort"))
+    try:
+        if len(args.sources) > 1 and not args.sequential:
+            summaries = engine.process_streams(args.sources, should_stop=lambda: bool(stopping),
+                                               detect_workers=args.detect_workers, ocr_workers=args.ocr_workers,
+                                               batch_size=args.batch_size)
+            for name, summary in summaries.items():
+                if 'error' in summary:
+                    exit_code = 1
+                    continue
+                engine.log_message(f"{name} ({summary['source']}): {summary['frames']} frames, "
+                                   f"{summary['plates_detected']} plates, {summary['alerts_sent']} alerts")
+        else:
+            for source in args.sources:
+                if stopping:
+                    break
+                try:
+                    summary = engine.process_video(source, should_stop=lambda: bool(stopping))
+                    engine.log_message(f"{source}: {summary['frames']} frames, "
+                                       f"{summary['plates_detected']} plates, {summary['alerts_sent']} alerts")
+                except KeyboardInterrupt:
+                    raise
+                except Exception as e:
+                    engine.log_message(f"Error during video processing: {str(e)}")
+                    exit_code = 1
+    except KeyboardInterrupt:
+        engine.log_message("Aborted")
+        exit_code = 1
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+        engine.close(timeout=args.alert_timeout)
+    return exit_code
+
+def stop_handler(engine, stopping, message):
+    """SIGINT handler: the first Ctrl+C asks for a clean stop through stopping, a second one aborts"""
+    def request_stop(signum, frame):
+        if stopping:
+            raise KeyboardInterrupt
+        stopping.append(True)
+        engine.log_message(message)
+    return request_stop
+
+def run_batch(engine, args):
+    """Batch mode: worker processes load the models; this process only sends and stores alerts"""
+    # Imported here so the process pool machinery is only loaded in batch mode
+    from pipeline.batch import BatchProcessor
+    
+    engine.start()
+    stopping = []
+    # The first Ctrl+C finishes the video in hand and stops; a second one aborts
+    previous_handler = signal.signal(signal.SIGINT, stop_handler(
+        engine, stopping, "Stopping after the next finished video; press Ctrl+C again to abort"))
+    try:
+        processor = BatchProcessor(engine, args.model, car_model_path=args.car_model, workers=args.workers,
+                                   checkpoint_path=args.checkpoint, cache_path=None if args.no_cache else args.cache,
+                                   progress_interval=args.progress_interval)
+        report = processor.run(args.sources, should_stop=lambda: bool(stopping))
+    except KeyboardInterrupt:
+        engine.log_message("Interrupted, stopping; finished videos are checkpointed")
+        return 1
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+        engine.close(timeout=args.alert_timeout)
+    return 1 if report['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
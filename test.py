@@ -5,6 +5,7 @@ from paddleocr import PaddleOCR
 from datetime import datetime
 import numpy as np
 import re
+from pipeline.frame_sampler import AdaptiveFrameSampler
 
 # Load YOLO and PaddleOCR
 model = YOLO('best.pt')  # Replace with your trained model
@@ -88,6 +89,8 @@ print(f"Video: {total_frames} frames at {fps} FPS")
 
 frame_count = 0
 processed_count = 0
+# Full rate while plates are tracked or the scene moves, a heartbeat on static scenes
+sampler = AdaptiveFrameSampler()
 
 try:
     while True:
@@ -98,8 +101,8 @@ try:
             
         frame_count += 1
         
-        # Process every 3rd frame for efficiency
-        if frame_count % 3 != 0:
+        # Skip frames that are not worth running YOLO + OCR on
+        if not sampler.should_process(frame, frame_count):
             continue
             
         processed_count += 1
@@ -110,6 +113,7 @@ try:
         
         if results[0].boxes is not None and results[0].boxes.id is not None:
             ids = results[0].boxes.id.cpu().numpy().astype(int)
+            sampler.report_detections(frame_count, len(ids))
             boxes = results[0].boxes.xyxy.cpu().numpy().astype(int)
             class_ids = results[0].boxes.cls.int().cpu().tolist()
             confidences = results[0].boxes.conf.cpu().numpy()
@@ -225,6 +229,9 @@ finally:
     print(f"\nProcessing Summary:")
     print(f"Total frames: {frame_count}")
     print(f"Processed frames: {processed_count}")
+    sampler_stats = sampler.stats()
+    print(f"Skipped frames: {sampler_stats['frames_skipped']} ({sampler_stats['skip_rate']:.0%}), "
+          f"reasons: {sampler_stats['reasons']}")
     print(f"Unique plates detected: {len(id_to_plate)}")
     print(f"Log file: {log_filename}")
     
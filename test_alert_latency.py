@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Test script for frame-to-alert latency tracing
+"""
+
+from pipeline.alert_latency import AlertLatencyTracker, latency_breakdown, percentile
+
+def test_breakdown_is_relative_to_capture():
+    timing = {'captured': 100.0, 'inferred': 100.05, 'ocr_done': 100.2, 'queued': 100.25, 'delivered': 101.5}
+    assert latency_breakdown(timing) == {'inferred_ms': 50.0, 'ocr_done_ms': 200.0, 'queued_ms': 250.0,
+                                         'delivered_ms': 1500.0}
+    assert latency_breakdown({'queued': 5.0}) == {}
+
+def test_nearest_rank_percentiles():
+    values = list(range(1, 101))
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile(values, 0.99) == 99
+    assert percentile([7], 0.99) == 7
+    assert percentile([], 0.5) == 0.0
+
+def test_tracker_filters_by_camera_and_channel():
+    tracker = AlertLatencyTracker(max_samples=100)
+    for seconds in range(1, 11):
+        tracker.record('cam1', 'telegram', float(seconds))
+    tracker.record('cam2', 'email', 30.0)
+    assert tracker.percentiles('cam1', 'telegram')['p50'] == 5.0
+    assert tracker.percentiles(channel='email') == {'count': 1, 'p50': 30.0, 'p95': 30.0, 'p99': 30.0, 'max': 30.0}
+    assert tracker.percentiles()['count'] == 11
+    assert sorted(tracker.stats()) == [('cam1', 'telegram'), ('cam2', 'email')]
+
+def test_tracker_keeps_recent_samples_only():
+    tracker = AlertLatencyTracker(max_samples=3)
+    for seconds in (10.0, 1.0, 2.0, 3.0):
+        tracker.record('cam1', 'telegram', seconds)
+    assert tracker.percentiles()['max'] == 3.0
+
+if __name__ == "__main__":
+    test_breakdown_is_relative_to_capture()
+    test_nearest_rank_percentiles()
+    test_tracker_filters_by_camera_and_channel()
+    test_tracker_keeps_recent_samples_only()
+    print("All alert latency tests passed")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test script for the background alert outbox against a local SMTP stub and a fake Telegram server
+"""
+
+import json
+import os
+import socketserver
+import tempfile
+import threading
+from email.mime.text import MIMEText
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from alerts.outbox import AlertOutbox
+
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept messages without TLS or auth"""
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 stub ready")
+        in_data = False
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            line = line.decode('utf-8', 'replace').rstrip('\r\n')
+            if in_data:
+                if line == '.':
+                    in_data = False
+                    self.server.messages.append('\n'.join(lines))
+                    lines = []
+                    self.reply("250 queued")
+                else:
+                    lines.append(line)
+                continue
+            command = line[:4].upper()
+            if command == 'EHLO' or command == 'HELO':
+                self.reply("250 stub")
+            elif command == 'DATA':
+                in_data = True
+                self.reply("354 end with .")
+            elif command == 'QUIT':
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 ok")
+
+    def reply(self, text):
+        self.wfile.write((text + "\r\n").encode())
+
+class TelegramStubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.requests.append((self.path, body))
+        failing = self.server.fail_method is None or self.path.endswith('/' + self.server.fail_method)
+        if failing and self.server.fail_next > 0:
+            self.server.fail_next -= 1
+            payload = {'ok': False, 'description': 'stub failure'}
+        else:
+            payload = {'ok': True, 'result': {}}
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_smtp_stub():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), SMTPStubHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.messages = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def start_telegram_stub(fail_next=0, fail_method=None):
+    server = HTTPServer(('127.0.0.1', 0), TelegramStubHandler)
+    server.requests = []
+    server.fail_next = fail_next
+    server.fail_method = fail_method
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def make_outbox(spool_dir, smtp_server=None, telegram_server=None, **kwargs):
+    email_config = {'smtp_server': '127.0.0.1', 'smtp_port': smtp_server.server_address[1] if smtp_server else 0,
+                    'email': 'alerts@example.com', 'password': '', 'use_tls': False}
+    telegram_config = {'bot_token': 'TEST', 'enabled': True}
+    api_base = f"http://127.0.0.1:{telegram_server.server_address[1]}" if telegram_server else "http://127.0.0.1:9"
+    kwargs.setdefault('batch_window', 0.05)
+    kwargs.setdefault('base_delay', 0.05)
+    return AlertOutbox(spool_dir=spool_dir, get_email_config=lambda: email_config,
+                       get_telegram_config=lambda: telegram_config, telegram_api_base=api_base,
+                       log=lambda message: None, **kwargs)
+
+def make_email(plate):
+    msg = MIMEText(f"Plate {plate} detected")
+    msg['Subject'] = f"ALERT - {plate}"
+    return msg.as_string()
+
+def test_email_burst_reuses_one_smtp_session():
+    smtp_server = start_smtp_stub()
+    with tempfile.TemporaryDirectory() as spool_dir:
+        outbox = make_outbox(spool_dir, smtp_server=smtp_server)
+        for plate in ['R183JF', 'N894JV', 'L656XH']:
+            outbox.enqueue_email('police@example.com', make_email(plate))
+        outbox.start()
+        assert outbox.wait_until_empty(timeout=10)
+        outbox.stop()
+        assert len(smtp_server.messages) == 3
+        assert smtp_server.connections == 1
+        assert not [name for name in os.listdir(spool_dir) if name.endswith('.json')]
+    smtp_server.shutdown()
+
+def test_telegram_message_and_photo():
+    telegram_server = start_telegram_stub()
+    with tempfile.TemporaryDirectory() as spool_dir:
+        outbox = make_outbox(spool_dir, telegram_server=telegram_server)
+        outbox.start()
+        outbox.enqueue_telegram('1019673274', '<b>ALERT</b> R183JF', image_png=b'\x89PNG fake')
+        assert outbox.wait_until_empty(timeout=10)
+        outbox.stop()
+        paths = [path for path, _ in telegram_server.requests]
+        assert paths == ['/botTEST/sendMessage', '/botTEST/sendPhoto']
+        assert outbox.delivered_count == 1
+    telegram_server.shutdown()
+
+def test_failed_send_is_retried_with_backoff():
+    telegram_server = start_telegram_stub(fail_next=2)
+    with tempfile.TemporaryDirectory() as spool_dir:
+        outbox = make_outbox(spool_dir, telegram_server=telegram_server)
+        outbox.start()
+        outbox.enqueue_telegram('42', 'retry me')
+        assert outbox.wait_until_empty(timeout=10)
+        outbox.stop()
+        assert outbox.delivered_count == 1
+        assert len(telegram_server.requests) == 3
+    telegram_server.shutdown()
+
+def test_failed_photo_does_not_resend_the_text():
+    telegram_server = start_telegram_stub(fail_next=1, fail_method='sendPhoto')
+    with tempfile.TemporaryDirectory() as spool_dir:
+        outbox = make_outbox(spool_dir, telegram_server=telegram_server)
+        outbox.start()
+        outbox.enqueue_telegram('42', '<b>ALERT</b> N894JV', image_png=b'\x89PNG fake')
+        assert outbox.wait_until_empty(timeout=10)
+        outbox.stop()
+        paths = [path for path, _ in telegram_server.requests]
+        assert paths == ['/botTEST/sendMessage', '/botTEST/sendPhoto', '/botTEST/sendPhoto']
+        assert outbox.delivered_count == 1
+    telegram_server.shutdown()
+
+def test_pending_alerts_survive_a_restart():
+    smtp_server = start_smtp_stub()
+    with tempfile.TemporaryDirectory() as spool_dir:
+        # Never started: simulates a crash before the alert went out
+        crashed = make_outbox(spool_dir, smtp_server=smtp_server)
+        crashed.enqueue_email('police@example.com', make_email('H644LX'))
+        assert smtp_server.messages == []
+
+        restarted = make_outbox(spool_dir, smtp_server=smtp_server)
+        assert restarted.pending_count() == 1
+        restarted.start()
+        assert restarted.wait_until_empty(timeout=10)
+        restarted.stop()
+        assert len(smtp_server.messages) == 1
+        assert 'H644LX' in smtp_server.messages[0]
+    smtp_server.shutdown()
+
+def test_alert_is_parked_after_max_attempts():
+    with tempfile.TemporaryDirectory() as spool_dir:
+        # Nothing listens on the Telegram port, so every attempt fails
+        outbox = make_outbox(spool_dir, max_attempts=2)
+        outbox.start()
+        outbox.enqueue_telegram('42', 'undeliverable')
+        assert outbox.wait_until_empty(timeout=10)
+        outbox.stop()
+        assert outbox.failed_count == 1
+        assert len(os.listdir(os.path.join(spool_dir, 'failed'))) == 1
+
+if __name__ == "__main__":
+    test_email_burst_reuses_one_smtp_session()
+    test_telegram_message_and_photo()
+    test_failed_send_is_retried_with_backoff()
+    test_failed_photo_does_not_resend_the_text()
+    test_pending_alerts_survive_a_restart()
+    test_alert_is_parked_after_max_attempts()
+    print("Alert outbox tests completed!")
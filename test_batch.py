@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for batch mode: source expansion, the checkpoint and cross-video alert suppression
+"""
+
+import os
+import tempfile
+import numpy as np
+from pipeline.engine import PlateAlertEngine
+from pipeline.batch import expand_sources, BatchCheckpoint, BatchProcessor, batch_key
+
+def touch(path, content=b'video'):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    return path
+
+def make_engine(tmp):
+    engine = PlateAlertEngine(settings_path=os.path.join(tmp, 'settings.json'),
+                              store_path=os.path.join(tmp, 'history.db'), spool_dir=os.path.join(tmp, 'outbox'),
+                              log=lambda message: None, cache_path=None, metrics_log_interval=None)
+    engine.watch_list = {'KA05MH4821'}
+    engine.alert_contacts = {'KA05MH4821': {'contact': '42', 'type': 'Telegram'}}
+    return engine
+
+def make_result(source, plates):
+    crop = np.full((20, 60, 3), 255, dtype=np.uint8)
+    return {'source': source, 'worker': 1, 'error': None, 'elapsed': 1.0,
+            'summary': {'source': source, 'frames': 10, 'frames_inferred': 5, 'plates_detected': len(plates),
+                        'alerts_sent': 0},
+            'alerts': [(plate, crop, 5, 25.0, 0.9, None, plate, 0) for plate in plates]}
+
+def make_report():
+    return {'videos': 0, 'skipped': 0, 'processed': 0, 'failed': [], 'frames': 0, 'frames_inferred': 0,
+            'plates_detected': 0, 'alerts_sent': 0, 'duplicate_alerts': 0, 'video_seconds': 0.0}
+
+def test_expand_sources_dirs_globs_and_repeats():
+    with tempfile.TemporaryDirectory() as tmp:
+        a = touch(os.path.join(tmp, 'case', 'a.mp4'))
+        b = touch(os.path.join(tmp, 'case', 'nested', 'b.AVI'))
+        touch(os.path.join(tmp, 'case', 'notes.txt'))
+        c = touch(os.path.join(tmp, 'other', 'c.mkv'))
+        videos = expand_sources([os.path.join(tmp, 'case'), os.path.join(tmp, 'other', '*.mkv'), a,
+                                 os.path.join(tmp, 'missing.mp4')])
+        assert videos == [os.path.abspath(a), os.path.abspath(b), os.path.abspath(c)]
+
+def test_checkpoint_skips_unchanged_videos_only():
+    with tempfile.TemporaryDirectory() as tmp:
+        video = touch(os.path.join(tmp, 'a.mp4'))
+        path = os.path.join(tmp, 'checkpoint.json')
+        BatchCheckpoint(path).mark_done(video, {'frames': 10})
+        assert BatchCheckpoint(path).is_done(video)
+        # A re-encoded file with the same name is processed again
+        touch(video, b'a longer re-encoded video')
+        assert not BatchCheckpoint(path).is_done(video)
+
+def test_alerted_plates_are_scoped_to_their_batch():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'checkpoint.json')
+        checkpoint = BatchCheckpoint(path)
+        checkpoint.begin_batch(batch_key(['/case1/a.mp4', '/case1/b.mp4']))
+        checkpoint.record_alert('KA05MH4821', '/case1/a.mp4')
+        checkpoint.save()
+        # Resuming the same batch keeps its alerts
+        resumed = BatchCheckpoint(path)
+        resumed.begin_batch(batch_key(['/case1/b.mp4', '/case1/a.mp4']))
+        assert resumed.alerted_from('KA05MH4821') == '/case1/a.mp4'
+        # Another batch sharing the checkpoint file does not see them
+        other = BatchCheckpoint(path)
+        other.begin_batch(batch_key(['/case2/c.mp4']))
+        assert other.alerted_from('KA05MH4821') is None
+        resumed.finish_batch()
+        again = BatchCheckpoint(path)
+        again.begin_batch(batch_key(['/case1/a.mp4', '/case1/b.mp4']))
+        assert again.alerted_from('KA05MH4821') is None
+
+def test_handle_result_alerts_a_plate_once_per_batch():
+    with tempfile.TemporaryDirectory() as tmp:
+        a = touch(os.path.join(tmp, 'a.mp4'))
+        b = touch(os.path.join(tmp, 'b.mp4'))
+        engine = make_engine(tmp)
+        processor = BatchProcessor(engine, 'best.pt', checkpoint_path=os.path.join(tmp, 'checkpoint.json'))
+        processor.checkpoint.begin_batch(batch_key([a, b]))
+        report = make_report()
+        processor.handle_result(make_result(a, ['KA05MH4821']), report)
+        processor.handle_result(make_result(b, ['KA05MH4821']), report)
+        assert report['alerts_sent'] == 1 and report['duplicate_alerts'] == 1 and report['processed'] == 2
+        assert engine.alert_outbox.pending_count() == 1
+        assert processor.checkpoint.is_done(a) and processor.checkpoint.is_done(b)
+        engine.close()
+
+def test_failed_video_is_not_checkpointed():
+    with tempfile.TemporaryDirectory() as tmp:
+        a = touch(os.path.join(tmp, 'a.mp4'))
+        engine = make_engine(tmp)
+        processor = BatchProcessor(engine, 'best.pt', checkpoint_path=os.path.join(tmp, 'checkpoint.json'))
+        report = make_report()
+        result = dict(make_result(a, []), error="Could not open video source")
+        processor.handle_result(result, report)
+        assert report['failed'] == [a] and not processor.checkpoint.is_done(a)
+        engine.close()
+
+def test_finished_videos_are_skipped_without_workers():
+    with tempfile.TemporaryDirectory() as tmp:
+        a = touch(os.path.join(tmp, 'case', 'a.mp4'))
+        engine = make_engine(tmp)
+        checkpoint_path = os.path.join(tmp, 'checkpoint.json')
+        BatchCheckpoint(checkpoint_path).mark_done(os.path.abspath(a), {'frames': 10})
+        processor = BatchProcessor(engine, 'best.pt', checkpoint_path=checkpoint_path)
+        report = processor.run([os.path.join(tmp, 'case')])
+        assert report['videos'] == 1 and report['skipped'] == 1 and report['processed'] == 0
+        engine.close()
+
+if __name__ == "__main__":
+    test_expand_sources_dirs_globs_and_repeats()
+    test_checkpoint_skips_unchanged_videos_only()
+    test_alerted_plates_are_scoped_to_their_batch()
+    test_handle_result_alerts_a_plate_once_per_batch()
+    test_failed_video_is_not_checkpointed()
+    test_finished_videos_are_skipped_without_workers()
+    print("All batch tests passed")
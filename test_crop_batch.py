@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script for two-stage detection: letterboxed car crops, plate boxes mapped back to the
+frame, and track IDs kept per car
+"""
+
+import os
+import tempfile
+import numpy as np
+from detections.crop_batch import letterbox, unletterbox_box, merge_overlapping_plates
+from pipeline.engine import PlateAlertEngine, CameraStream
+from pipeline.tracker import IoUTracker
+from benchmarks.stub_models import ResultBoxes, DetectionResult
+
+class FakeCarModel:
+    """Finds a grid of 40 non-overlapping 100x100 cars in every frame"""
+    names = {0: 'car'}
+
+    def predict(self, frames, **kwargs):
+        boxes = [[x, y, x + 100, y + 100] for y in range(0, 500, 100) for x in range(0, 800, 100)]
+        return [DetectionResult(ResultBoxes(boxes, [0.9] * len(boxes)), self.names) for _ in frames]
+
+class FakePlateModel:
+    """One very confident plate per car crop; records the threshold of every call"""
+    names = {0: 'license_plate'}
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, crops, conf=0.25, **kwargs):
+        self.calls.append((len(crops), conf))
+        return [DetectionResult(ResultBoxes([[40, 200, 280, 260]], [0.97]), self.names) for _ in crops]
+
+def make_engine(tmp):
+    return PlateAlertEngine(settings_path=os.path.join(tmp, 'settings.json'), store_path=None, spool_dir=None,
+                            log=lambda message: None, cache_path=None, metrics_log_interval=None)
+
+def to_letterbox(box, scale, pad):
+    """Where a crop box lands in the letterboxed square"""
+    return [box[0] * scale + pad[0], box[1] * scale + pad[1], box[2] * scale + pad[0], box[3] * scale + pad[1]]
+
+def test_wide_crop_is_padded_top_and_bottom():
+    crop = np.full((100, 400, 3), 255, np.uint8)
+    square, scale, pad = letterbox(crop, size=320)
+    assert square.shape == (320, 320, 3) and scale == 0.8 and pad == (0, 120)
+    assert (square[:120] == 114).all() and (square[200:] == 114).all()
+    assert (square[120:200] == 255).all()
+
+def test_tall_crop_is_padded_left_and_right():
+    crop = np.zeros((300, 150, 3), np.uint8)
+    square, scale, pad = letterbox(crop, size=320)
+    assert pad[1] == 0 and pad[0] > 0
+    assert (square[:, :pad[0]] == 114).all() and (square[:, pad[0]:320 - pad[0]] == 0).all()
+
+def test_box_round_trip_with_padding_and_frame_offset():
+    # Wide, tall and upscaled car crops cut out of the frame at (600, 350)
+    offset = (600, 350)
+    for crop_shape, size in (((180, 420, 3), 320), ((420, 180, 3), 320), ((50, 90, 3), 640)):
+        crop = np.zeros(crop_shape, np.uint8)
+        _, scale, pad = letterbox(crop, size=size)
+        plate_in_crop = [20, 30, 80, 48]
+        box = unletterbox_box(to_letterbox(plate_in_crop, scale, pad), scale, pad, offset)
+        expected = [plate_in_crop[0] + 600, plate_in_crop[1] + 350, plate_in_crop[2] + 600, plate_in_crop[3] + 350]
+        assert all(abs(got - want) <= 1 for got, want in zip(box, expected)), (crop_shape, box, expected)
+
+def test_merge_keeps_the_more_confident_plate():
+    weak = ((100, 100, 200, 130), 0.6, (50, 50, 300, 250))
+    strong = ((102, 101, 203, 131), 0.9, (80, 40, 320, 260))
+    other = ((500, 100, 600, 130), 0.4, (450, 50, 700, 250))
+    assert merge_overlapping_plates([weak, other, strong]) == [strong, other]
+    # Below the IoU threshold both plates are kept
+    assert len(merge_overlapping_plates([weak, strong], iou_threshold=0.99)) == 2
+    assert merge_overlapping_plates([]) == []
+
+def test_every_plate_batch_uses_the_detection_threshold():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(tmp)
+        plate_model = FakePlateModel()
+        frame = np.zeros((600, 900, 3), np.uint8)
+        plates = engine.detect_plate_batch([frame], plate_model, FakeCarModel(), conf=0.4)[0]
+        # 40 cars at plate_batch_size 32 take two plate-model calls, both at the caller's threshold
+        assert plate_model.calls == [(32, 0.4), (8, 0.4)]
+        assert len(plates) == 40 and all(abs(conf - 0.97) < 1e-6 for _, conf, _ in plates)
+        # Without a threshold, plates in car crops are kept from car_plate_conf, not detection_conf
+        plate_model.calls = []
+        engine.detect_plate_batch([frame], plate_model, FakeCarModel())
+        assert plate_model.calls == [(32, 0.25), (8, 0.25)]
+        engine.close()
+
+def test_moving_car_keeps_its_track_id():
+    tracker = IoUTracker()
+    car_ids = [tracker.update([(100 + step * 8, 300, 320 + step * 8, 460)])[0] for step in range(10)]
+    assert car_ids == [car_ids[0]] * 10
+
+def test_new_car_gets_a_new_track_id():
+    tracker = IoUTracker()
+    first_car = tracker.update([(100, 300, 320, 460)])[0]
+    ids = tracker.update([(108, 300, 328, 460), (600, 280, 820, 440)])
+    assert ids[0] == first_car and ids[1] != first_car
+
+def test_expired_track_id_is_not_reused():
+    tracker = IoUTracker(max_missed=2)
+    first_car = tracker.update([(100, 300, 320, 460)])[0]
+    for _ in range(3):
+        tracker.update([])
+    assert first_car not in tracker.tracks
+    # The same spot later is a different car
+    assert tracker.update([(100, 300, 320, 460)])[0] != first_car
+
+def test_plates_of_one_car_share_its_track_id():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(tmp)
+        stream = CameraStream(engine, 'vid1.mp4')
+        car_a, car_b = (100, 300, 320, 460), (600, 280, 820, 440)
+        # Two plate boxes found inside car_a and one inside car_b
+        detections = [((140, 400, 220, 420), 0.9, car_a), ((150, 320, 230, 340), 0.6, car_a),
+                      ((650, 400, 730, 420), 0.8, car_b)]
+        plates = stream.assign_track_ids(detections)
+        assert plates[0][0] == plates[1][0] != plates[2][0]
+        assert [(box, conf) for _, box, conf in plates] == [(box, conf) for box, conf, _ in detections]
+        # Next frame: both cars moved a little and keep their IDs
+        moved = [((148, 400, 228, 420), 0.9, (108, 300, 328, 460)), ((655, 400, 735, 420), 0.8, (605, 280, 825, 440))]
+        assert [track_id for track_id, _, _ in stream.assign_track_ids(moved)] == [plates[0][0], plates[2][0]]
+        engine.close()
+
+if __name__ == "__main__":
+    test_wide_crop_is_padded_top_and_bottom()
+    test_tall_crop_is_padded_left_and_right()
+    test_box_round_trip_with_padding_and_frame_offset()
+    test_merge_keeps_the_more_confident_plate()
+    test_every_plate_batch_uses_the_detection_threshold()
+    test_moving_car_keeps_its_track_id()
+    test_new_car_gets_a_new_track_id()
+    test_expired_track_id_is_not_reused()
+    test_plates_of_one_car_share_its_track_id()
+    print("All crop batch tests passed")
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Test script for the memory-mapped detection archive that replaces the pickle stubs
+"""
+
+import os
+import tempfile
+import numpy as np
+from pipeline.detection_archive import DetectionArchive, write_detection_archive
+
+def test_round_trip_with_empty_frames():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'car_detection.dets')
+        detections = [
+            [[10, 20, 110, 90, 0.9, 2]],
+            [],
+            [[0, 0, 5, 5, 0.5, 2], [50, 60, 70, 80, 0.7, 7]],
+        ]
+        write_detection_archive(path, detections)
+        archive = DetectionArchive(path)
+        assert len(archive) == 3
+        assert isinstance(archive.boxes, np.memmap)
+        assert archive[0].tolist() == [[10, 20, 110, 90]]
+        assert archive[1].shape == (0, 4)
+        assert archive[-1].tolist() == [[0, 0, 5, 5], [50, 60, 70, 80]]
+        class_ids, confidences = archive.frame_scores(2)
+        assert class_ids.tolist() == [2, 7]
+        assert np.allclose(confidences, [0.5, 0.7])
+
+def test_slices_and_unscored_boxes():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'car_detection.dets')
+        write_detection_archive(path, [[[1, 2, 3, 4]] for _ in range(10)])
+        archive = DetectionArchive(path)
+        window = archive[8:12]
+        assert len(window) == 2
+        class_ids, confidences = archive.frame_scores(0)
+        assert class_ids.tolist() == [-1] and np.isnan(confidences[0])
+
+if __name__ == "__main__":
+    test_round_trip_with_empty_frames()
+    test_slices_and_unscored_boxes()
+    print("All detection archive tests passed")
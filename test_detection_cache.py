@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for the content-addressed detection cache
+"""
+
+import os
+import tempfile
+import numpy as np
+from pipeline.detection_cache import DetectionCache
+
+def make_video(tmp, name, content):
+    path = os.path.join(tmp, name)
+    with open(path, 'wb') as f:
+        f.write(content)
+    return path
+
+def test_only_uncached_frames_are_detected():
+    with tempfile.TemporaryDirectory() as tmp:
+        video = make_video(tmp, 'clip.mp4', b'video bytes')
+        cache = DetectionCache(os.path.join(tmp, 'cache.db'))
+        view = cache.view(video, [], {'conf': 0.5})
+        detected = []
+
+        def detect_batch(frames):
+            detected.extend(frames)
+            return [[[frame, 0, frame + 10, 5]] for frame in frames]
+
+        first = view.detect([1, 2, 3], 0, detect_batch, 4)
+        second = view.detect([1, 2, 3, 4], 0, detect_batch, 4)
+        assert detected == [1, 2, 3, 4]
+        assert second[:3] == first
+        assert view.stats()['hits'] == 3
+        cache.close()
+
+def test_key_changes_with_video_and_params():
+    with tempfile.TemporaryDirectory() as tmp:
+        video = make_video(tmp, 'clip.mp4', b'video bytes')
+        other_video = make_video(tmp, 'copy_edited.mp4', b'other bytes')
+        renamed = make_video(tmp, 'renamed.mp4', b'video bytes')
+        cache = DetectionCache(os.path.join(tmp, 'cache.db'))
+        key = cache.cache_key(video, [], {'conf': 0.5})
+        assert cache.cache_key(renamed, [], {'conf': 0.5}) == key
+        assert cache.cache_key(other_video, [], {'conf': 0.5}) != key
+        assert cache.cache_key(video, [], {'conf': 0.6}) != key
+        cache.close()
+
+def test_partial_run_survives_reopen():
+    with tempfile.TemporaryDirectory() as tmp:
+        video = make_video(tmp, 'clip.mp4', b'video bytes')
+        db_path = os.path.join(tmp, 'cache.db')
+        cache = DetectionCache(db_path)
+        view = cache.view(video, [], {})
+        view.put(7, np.array([[1, 2, 3, 4]]))
+        view.put(8, np.zeros((0, 4)))
+        cache.close()
+
+        cache = DetectionCache(db_path)
+        view = cache.view(video, [], {})
+        assert view.cached_frames() == {7, 8}
+        assert view.get(7).tolist() == [[1, 2, 3, 4]]
+        assert view.get(8).shape == (0, 4)
+        assert view.get(9) is None
+        cache.close()
+
+if __name__ == "__main__":
+    test_only_uncached_frames_are_detected()
+    test_key_changes_with_video_and_params()
+    test_partial_run_survives_reopen()
+    print("All detection cache tests passed")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for the append-only detection store and the atomic JSON writer
+"""
+
+import json
+import os
+import tempfile
+from alerts.detection_store import DetectionStore, write_json_atomic
+
+def test_every_change_is_kept_in_history():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DetectionStore(os.path.join(tmp, 'history.db'))
+        store.append('KA05MH4821', {'status': 'sent'})
+        store.append('KA05MH4821', {'status': 'acknowledged'})
+        store.remove('KA05MH4821')
+        history = store.history('KA05MH4821')
+        assert [entry['op'] for entry in history] == ['upsert', 'upsert', 'delete']
+        assert [entry['data'] for entry in history] == [{'status': 'sent'}, {'status': 'acknowledged'}, None]
+        store.close()
+
+def test_load_latest_skips_removed_plates():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'history.db')
+        store = DetectionStore(path)
+        store.append('KA05MH4821', {'status': 'sent'})
+        store.append('MH12AB1234', {'status': 'sent'})
+        store.remove('KA05MH4821')
+        store.append('MH12AB1234', {'status': 'acknowledged'})
+        store.close()
+        # The latest view survives reopening the database
+        reopened = DetectionStore(path)
+        assert reopened.load_latest() == {'MH12AB1234': {'status': 'acknowledged'}}
+        reopened.append('KA05MH4821', {'status': 'sent again'})
+        assert reopened.load_latest()['KA05MH4821'] == {'status': 'sent again'}
+        reopened.close()
+
+def test_import_legacy_only_seeds_an_empty_store():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DetectionStore(os.path.join(tmp, 'history.db'))
+        legacy = {'KA05MH4821': {'status': 'sent'}, 'MH12AB1234': {'status': 'sent'}}
+        assert store.import_legacy(legacy) == 2
+        assert store.import_legacy(legacy) == 0
+        assert store.import_legacy({}) == 0
+        assert len(store.history('KA05MH4821')) == 1
+        assert store.load_latest() == legacy
+        store.close()
+
+def test_failed_atomic_write_keeps_the_old_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'settings.json')
+        write_json_atomic(path, {'watch_list': ['KA05MH4821']})
+        try:
+            # Fails halfway through serializing, after the temp file was opened
+            write_json_atomic(path, {'watch_list': ['MH12AB1234'], 'broken': object()})
+            assert False, "an unserializable value should fail the write"
+        except TypeError:
+            pass
+        with open(path, 'r') as f:
+            assert json.load(f) == {'watch_list': ['KA05MH4821']}
+
+if __name__ == "__main__":
+    test_every_change_is_kept_in_history()
+    test_load_latest_skips_removed_plates()
+    test_import_legacy_only_seeds_an_empty_store()
+    test_failed_atomic_write_keeps_the_old_file()
+    print("All detection store tests passed")
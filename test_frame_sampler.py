@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test script for the adaptive frame sampler
+"""
+
+import numpy as np
+from pipeline.frame_sampler import AdaptiveFrameSampler
+from pipeline.quality_governor import QualityGovernor, QUALITY_LEVELS
+
+def make_frame(car_x=None):
+    frame = np.full((600, 1020, 3), 80, np.uint8)
+    if car_x is not None:
+        frame[250:400, car_x:car_x + 200] = 220
+    return frame
+
+def test_static_scene_runs_at_heartbeat_rate():
+    sampler = AdaptiveFrameSampler(idle_interval=15)
+    inferred = [i for i in range(1, 91) if sampler.should_process(make_frame(), i)]
+    assert inferred == [1, 16, 31, 46, 61, 76]
+    stats = sampler.stats()
+    assert stats['frames_skipped'] == 84 and stats['reasons']['heartbeat'] == 6
+
+def test_moving_vehicle_runs_at_full_rate():
+    sampler = AdaptiveFrameSampler(idle_interval=15)
+    sampler.should_process(make_frame(), 1)
+    inferred = [i for i in range(2, 32) if sampler.should_process(make_frame(car_x=10 * i), i)]
+    assert len(inferred) == 30
+    assert sampler.stats()['reasons']['motion'] == 30
+
+def test_tracked_plates_hold_full_rate_on_a_stopped_vehicle():
+    sampler = AdaptiveFrameSampler(idle_interval=15, hold_frames=10)
+    frame = make_frame(car_x=300)
+    sampler.should_process(frame, 1)
+    sampler.report_detections(1, num_plates=1)
+    inferred = [i for i in range(2, 31) if sampler.should_process(frame, i)]
+    # Every frame while the plate is held, then back to the heartbeat
+    assert inferred == list(range(2, 12)) + [26]
+
+def test_frames_the_governor_turns_down_are_not_counted():
+    sampler = AdaptiveFrameSampler(idle_interval=15)
+    governor = QualityGovernor()
+    governor.level_index = [level['name'] for level in QUALITY_LEVELS].index('half-rate')
+    inferred = [i for i in range(1, 41) if sampler.should_process(make_frame(), i, governor.admit_frame)]
+    # A turned-down heartbeat stays due, so the next frame takes it instead of waiting 15 more
+    assert inferred == [2, 18, 34]
+    assert sampler.stats()['frames_inferred'] == 3 and sampler.stats()['reasons']['heartbeat'] == 3
+
+if __name__ == "__main__":
+    test_static_scene_runs_at_heartbeat_rate()
+    test_moving_vehicle_runs_at_full_rate()
+    test_tracked_plates_hold_full_rate_on_a_stopped_vehicle()
+    test_frames_the_governor_turns_down_are_not_counted()
+    print("Frame sampler tests completed!")
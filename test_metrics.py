@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-stage timing histograms and the metrics endpoint
+"""
+
+import urllib.request
+from pipeline.metrics import LatencyHistogram, MetricsRegistry, MetricsServer
+
+def test_histogram_quantiles_use_bucket_bounds():
+    histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+    for seconds in [0.005] * 90 + [0.05] * 9 + [3.0]:
+        histogram.observe(seconds)
+    assert histogram.count == 100
+    assert histogram.quantile(0.5) == 0.01
+    assert histogram.quantile(0.95) == 0.1
+    # Above the last bucket the largest observation is reported
+    assert histogram.quantile(1.0) == 3.0
+
+def test_registry_merges_labels_in_stage_stats():
+    registry = MetricsRegistry()
+    registry.observe('detect', 0.02, stream='cam1')
+    registry.observe('detect', 0.04, stream='cam2')
+    with registry.timer('ocr', stream='cam1'):
+        pass
+    registry.inc('frames_read', 30, stream='cam1')
+    registry.inc('frames_read', 10, stream='cam1')
+    stats = registry.stage_stats()
+    assert stats['detect']['count'] == 2
+    assert abs(stats['detect']['avg'] - 0.03) < 1e-9
+    assert stats['ocr']['count'] == 1
+    assert registry.counter('frames_read', stream='cam1') == 40
+    assert any(line.startswith("Counters: frames_read=40") for line in registry.summary_lines())
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.observe('detect', 0.002, stream='cam1')
+    registry.inc('plates_detected', stream='cam1')
+    text = registry.render_prometheus()
+    assert '# TYPE plate_alert_stage_seconds histogram' in text
+    assert 'plate_alert_stage_seconds_bucket{stage="detect",stream="cam1",le="0.0025"} 1' in text
+    assert 'plate_alert_stage_seconds_bucket{stage="detect",stream="cam1",le="+Inf"} 1' in text
+    assert 'plate_alert_stage_seconds_count{stage="detect",stream="cam1"} 1' in text
+    assert 'plate_alert_plates_detected_total{stream="cam1"} 1' in text
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    # Stream labels are sources: Windows paths, or names with quotes or line breaks
+    registry.inc('frames_read', stream='C:\\videos\\gate "A"\ncam.avi')
+    text = registry.render_prometheus()
+    assert 'plate_alert_frames_read_total{stream="C:\\\\videos\\\\gate \\"A\\"\\ncam.avi"} 1' in text
+    assert all(not line.startswith('cam.avi') for line in text.splitlines())
+
+def test_server_serves_metrics_on_localhost():
+    registry = MetricsRegistry()
+    registry.observe('decode', 0.001)
+    server = MetricsServer(registry, port=0).start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            body = response.read().decode('utf-8')
+        assert 'plate_alert_stage_seconds_count{stage="decode"} 1' in body
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    test_histogram_quantiles_use_bucket_bounds()
+    test_registry_merges_labels_in_stage_stats()
+    test_prometheus_text_format()
+    test_label_values_are_escaped()
+    test_server_serves_metrics_on_localhost()
+    print("All metrics tests passed")
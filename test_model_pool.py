@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared model pool and the per-stream IoU tracker
+"""
+
+import threading
+import time
+from pipeline.model_pool import ModelPool
+from pipeline.tracker import IoUTracker
+
+def test_requests_from_streams_share_batches():
+    batches = []
+
+    def make_handler(worker_index):
+        def handler(items):
+            batches.append(list(items))
+            return [item * 10 for item in items]
+        return handler
+
+    pool = ModelPool("test", make_handler, max_batch_size=4, max_wait=0.05)
+    futures = [pool.submit(f"cam{index}", index) for index in range(4)]
+    pool.start()
+    try:
+        assert [future.result(timeout=5) for future in futures] == [0, 10, 20, 30]
+    finally:
+        pool.stop()
+    assert batches == [[0, 1, 2, 3]]
+    metrics = pool.metrics()
+    assert metrics['batches'] == 1 and metrics['avg_batch_size'] == 4
+    assert metrics['streams']['cam2']['completed'] == 1
+
+def test_busy_stream_does_not_starve_others():
+    pool = ModelPool("test", lambda worker_index: (lambda items: items), max_batch_size=2)
+    for index in range(10):
+        pool.submit("busy", ("busy", index))
+    pool.submit("quiet", ("quiet", 0))
+    # Round-robin: the quiet stream rides in the very first batch
+    with pool.condition:
+        first_batch = [stream_id for stream_id, _, _, _ in pool.next_batch()]
+    assert first_batch == ["busy", "quiet"]
+
+def test_handler_errors_reach_every_caller():
+    def make_handler(worker_index):
+        def handler(items):
+            raise ValueError("model failed")
+        return handler
+
+    pool = ModelPool("test", make_handler, max_wait=0)
+    pool.start()
+    try:
+        future = pool.submit("cam1", 1)
+        try:
+            future.result(timeout=5)
+            assert False, "expected the handler error"
+        except ValueError:
+            pass
+    finally:
+        pool.stop()
+
+def test_failed_model_load_fails_queued_and_later_requests():
+    def make_handler(worker_index):
+        raise IOError("weights not found")
+
+    pool = ModelPool("test", make_handler, workers=2)
+    queued = pool.submit("cam1", 1)
+    pool.start()
+    try:
+        for future in (queued, pool.submit("cam2", 2)):
+            try:
+                future.result(timeout=5)
+                assert False, "expected the pool to fail the request"
+            except RuntimeError as e:
+                assert "weights not found" in str(e)
+    finally:
+        pool.stop()
+
+def test_one_failed_worker_leaves_the_others_serving():
+    def make_handler(worker_index):
+        if worker_index == 0:
+            raise IOError("out of GPU memory")
+        return lambda items: [item + 1 for item in items]
+
+    pool = ModelPool("test", make_handler, workers=2, max_wait=0)
+    pool.start()
+    try:
+        assert [pool.submit("cam1", index).result(timeout=5) for index in range(3)] == [1, 2, 3]
+    finally:
+        pool.stop()
+
+def test_concurrent_streams_get_their_own_results():
+    pool = ModelPool("test", lambda worker_index: (lambda items: [item for item in items]), workers=2,
+                     max_batch_size=8)
+    pool.start()
+    results = {}
+
+    def run_stream(name):
+        results[name] = [pool.submit(name, (name, index)).result(timeout=5) for index in range(20)]
+
+    threads = [threading.Thread(target=run_stream, args=(f"cam{index}",)) for index in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool.stop()
+    for name, values in results.items():
+        assert values == [(name, index) for index in range(20)]
+
+def test_tracker_keeps_ids_for_moving_boxes():
+    tracker = IoUTracker(iou_threshold=0.3, max_missed=1)
+    first = tracker.update([(0, 0, 100, 40), (300, 300, 400, 340)])
+    second = tracker.update([(305, 302, 405, 342), (5, 0, 105, 40)])
+    assert second == [first[1], first[0]]
+    # A box far from every track starts a new one
+    third = tracker.update([(600, 600, 700, 640)])
+    assert third[0] not in first
+    # Tracks missed for more than max_missed updates are dropped
+    tracker.update([])
+    tracker.update([])
+    assert tracker.update([(0, 0, 100, 40)])[0] not in first
+
+if __name__ == "__main__":
+    start = time.time()
+    test_requests_from_streams_share_batches()
+    test_busy_stream_does_not_starve_others()
+    test_handler_errors_reach_every_caller()
+    test_failed_model_load_fails_queued_and_later_requests()
+    test_one_failed_worker_leaves_the_others_serving()
+    test_concurrent_streams_get_their_own_results()
+    test_tracker_keeps_ids_for_moving_boxes()
+    print(f"Model pool tests completed in {time.time() - start:.2f}s")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-track OCR budget
+"""
+
+from pipeline.ocr_budget import TrackOCRBudget
+
+BOX = (100, 100, 200, 130)
+
+def read(budget, track_id, text, box=BOX, sharpness=10.0):
+    """Offer one detection to the budget and record text if it was OCR'd"""
+    if budget.should_ocr(track_id, box, sharpness):
+        budget.record(track_id, text, box, sharpness)
+        return True
+    return False
+
+def test_stops_after_agreeing_reads():
+    budget = TrackOCRBudget(stable_reads=3)
+    calls = [read(budget, 7, 'KA05MH4821') for _ in range(6)]
+    assert calls == [True, True, True, False, False, False]
+    assert budget.stable_text(7) == 'KA05MH4821'
+
+def test_disagreeing_and_invalid_reads_keep_the_track_open():
+    budget = TrackOCRBudget(stable_reads=2)
+    assert read(budget, 7, 'KA05MH4821')
+    assert read(budget, 7, None)
+    assert read(budget, 7, 'KA05MH4827')
+    assert read(budget, 7, 'KA05MH4821')
+    assert budget.stable_text(7) == 'KA05MH4821'
+    assert not read(budget, 7, 'KA05MH4821')
+
+def test_rereads_when_the_box_grows():
+    budget = TrackOCRBudget(stable_reads=1, growth_ratio=1.3)
+    assert read(budget, 7, 'KA05MH4821')
+    assert not read(budget, 7, 'KA05MH4821', box=(100, 100, 210, 130))
+    # 1.5x the best area read so far
+    assert read(budget, 7, 'KA05MH4821', box=(100, 100, 250, 130))
+    assert not read(budget, 7, 'KA05MH4821', box=(100, 100, 250, 130))
+
+def test_rereads_a_sharper_crop():
+    budget = TrackOCRBudget(stable_reads=1, sharpness_ratio=1.5)
+    assert read(budget, 7, 'KA05MH4821', sharpness=10.0)
+    assert not read(budget, 7, 'KA05MH4821', sharpness=12.0)
+    assert read(budget, 7, 'KA05MH4821', sharpness=16.0)
+    assert not read(budget, 7, 'KA05MH4821', sharpness=20.0)
+
+def test_untracked_detections_always_get_ocr():
+    budget = TrackOCRBudget(stable_reads=1)
+    assert all(read(budget, -1, 'KA05MH4821') for _ in range(5))
+    assert budget.stable_text(-1) is None and -1 not in budget.tracks
+
+def test_stats_count_calls_and_skips():
+    budget = TrackOCRBudget(stable_reads=2)
+    for _ in range(5):
+        read(budget, 1, 'KA05MH4821')
+    read(budget, 2, 'MH12AB1234')
+    stats = budget.stats()
+    assert stats['ocr_calls'] == 3 and stats['ocr_skipped'] == 3
+    assert stats['skip_rate'] == 0.5 and stats['stable_tracks'] == 1
+    budget.reset()
+    assert budget.stats() == {'ocr_calls': 0, 'ocr_skipped': 0, 'skip_rate': 0.0, 'stable_tracks': 0}
+
+if __name__ == "__main__":
+    test_stops_after_agreeing_reads()
+    test_disagreeing_and_invalid_reads_keep_the_track_open()
+    test_rereads_when_the_box_grows()
+    test_rereads_a_sharper_crop()
+    test_untracked_detections_always_get_ocr()
+    test_stats_count_calls_and_skips()
+    print("All OCR budget tests passed")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for the time-windowed plate deduplicator (cases from test_deduplication.py)
+"""
+
+from pipeline.plate_dedup import PlateDeduplicator
+
+def make_dedup(**kwargs):
+    kwargs.setdefault('cooldown_frames', 30)
+    kwargs.setdefault('similarity_threshold', 0.7)
+    return PlateDeduplicator(**kwargs)
+
+def test_rejects_empty_and_short_text():
+    dedup = make_dedup()
+    assert dedup.check_and_add("", 1)[0]
+    assert dedup.check_and_add("N/A", 1)[0]
+    assert dedup.check_and_add("A1", 1)[0]
+    assert len(dedup) == 0
+
+def test_video4_sequence():
+    dedup = make_dedup()
+    test_cases = [
+        ("R-183-JF", 10, False),
+        ("R-183-JF", 15, True),   # within cooldown
+        ("N-894-JV", 20, False),
+        ("R-183-JF", 50, False),  # after cooldown
+        ("R183JF", 55, True),     # same plate without separators
+        ("H-644-LX", 60, False),
+    ]
+    for plate_text, frame_count, expected in test_cases:
+        is_duplicate, _ = dedup.check_and_add(plate_text, frame_count)
+        assert is_duplicate == expected, (plate_text, frame_count)
+
+def test_similar_plate_within_cooldown_is_duplicate():
+    dedup = make_dedup(similarity_threshold=0.8)
+    assert not dedup.check_and_add("DL2CAT4762", 100)[0]
+    is_duplicate, matched = dedup.check_and_add("DL2CAT4763", 110)
+    assert is_duplicate and matched == "DL2CAT4762"
+    # A clearly different plate is not folded into it
+    assert not dedup.check_and_add("HR26C06869", 110)[0]
+
+def test_similar_plate_after_cooldown_is_accepted():
+    dedup = make_dedup(similarity_threshold=0.8)
+    dedup.check_and_add("DL2CAT4762", 100)
+    assert not dedup.check_and_add("DL2CAT4763", 130)[0]
+
+def test_duplicates_do_not_extend_the_window():
+    dedup = make_dedup()
+    dedup.check_and_add("R183JF", 10)
+    assert dedup.check_and_add("R183JF", 35)[0]
+    assert not dedup.check_and_add("R183JF", 40)[0]
+
+def test_seconds_window():
+    now = [0.0]
+    dedup = PlateDeduplicator(cooldown_seconds=60, clock=lambda: now[0])
+    assert not dedup.check_and_add("KA01AB1234")[0]
+    now[0] = 59.0
+    assert dedup.check_and_add("KA01AB1234")[0]
+    now[0] = 61.0
+    assert not dedup.check_and_add("KA01AB1234")[0]
+
+def test_cache_is_bounded():
+    import random
+    rng = random.Random(7)
+    alphabet = "ABCDEFGHJKLMNPRSTUVWXYZ0123456789"
+    plates = ["".join(rng.choice(alphabet) for _ in range(9)) for _ in range(1000)]
+    dedup = PlateDeduplicator(max_entries=100)
+    accepted = [plate for i, plate in enumerate(plates) if not dedup.check_and_add(plate, i)[0]]
+    assert len(dedup) == 100
+    assert accepted[-1] in dedup and accepted[0] not in dedup
+    assert all(keys for keys in dedup.variants.values())
+
+if __name__ == "__main__":
+    test_rejects_empty_and_short_text()
+    test_video4_sequence()
+    test_similar_plate_within_cooldown_is_duplicate()
+    test_similar_plate_after_cooldown_is_accepted()
+    test_duplicates_do_not_extend_the_window()
+    test_seconds_window()
+    test_cache_is_bounded()
+    print("Plate deduplication tests completed!")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for PaddleOCR result parsing and the batched plate OCR queue
+"""
+
+import numpy as np
+from detections.plate_ocr import parse_ocr_result, PlateOCRQueue
+
+def make_crop(width=120, height=30):
+    return np.full((height, width, 3), 200, np.uint8)
+
+class FakePredictOCR:
+    """PaddleOCR 3.x: predict() takes one image or a list and returns one dict per image"""
+    def __init__(self, fail_batches=False):
+        self.fail_batches = fail_batches
+        self.calls = []
+
+    def predict(self, images):
+        batch = isinstance(images, list)
+        self.calls.append(len(images) if batch else 1)
+        if batch and self.fail_batches:
+            raise RuntimeError("batch too large")
+        images = images if batch else [images]
+        return [{'rec_texts': [f"PLATE{index}"], 'rec_scores': [0.9]} for index in range(len(images))]
+
+    def ocr(self, *args, **kwargs):
+        raise AssertionError("the 3.x API must not fall back to ocr()")
+
+class FakeLegacyOCR:
+    """PaddleOCR 2.x: ocr() in recognition-only mode for batches, with detection for one crop"""
+    def __init__(self, short_batches=False):
+        self.short_batches = short_batches
+        self.calls = []
+
+    def ocr(self, images, det=True, cls=True):
+        if isinstance(images, list):
+            self.calls.append('batch')
+            count = len(images) - 1 if self.short_batches else len(images)
+            return [[(f"BATCH{index}", 0.8) for index in range(count)]]
+        self.calls.append('single')
+        return [[[[0, 0, 10, 0, 10, 5, 0, 5], ("SINGLE", 0.7)]]]
+
+def test_parse_paddleocr_3_pipeline_result():
+    assert parse_ocr_result({'rec_texts': ['KA05MH4821', 'IND'], 'rec_scores': [0.93, 0.5]}) == ('KA05MH4821', 0.93)
+    assert parse_ocr_result({'rec_texts': ['KA05MH4821'], 'rec_scores': []}) == ('KA05MH4821', 0.0)
+
+def test_parse_recognition_only_result():
+    assert parse_ocr_result({'rec_text': 'MH12AB1234', 'rec_score': 0.88}) == ('MH12AB1234', 0.88)
+
+def test_parse_paddleocr_2_results():
+    nested = [[[0, 0], [10, 0], [10, 5], [0, 5]], ('DL3CBJ1384', 0.91)]
+    assert parse_ocr_result([nested]) == ('DL3CBJ1384', 0.91)
+    assert parse_ocr_result([('HR26C06869', 0.77)]) == ('HR26C06869', 0.77)
+
+def test_parse_empty_results():
+    for result in (None, [], {}, {'rec_texts': []}, [None]):
+        assert parse_ocr_result(result) == ("N/A", 0.0)
+
+def test_queue_batches_crops_in_order():
+    ocr = FakePredictOCR()
+    queue = PlateOCRQueue(ocr, target_height=32, max_batch_size=2)
+    for key in ('a', 'b', 'c'):
+        prepared = queue.add(key, make_crop())
+        assert prepared.shape == (32, 128, 3)
+    assert len(queue) == 3
+    texts = queue.flush()
+    assert texts == {'a': ('PLATE0', 0.9), 'b': ('PLATE1', 0.9), 'c': ('PLATE0', 0.9)}
+    assert ocr.calls == [2, 1] and queue.ocr_calls == 2 and len(queue) == 0
+
+def test_failed_batch_falls_back_to_predict_per_crop():
+    ocr = FakePredictOCR(fail_batches=True)
+    queue = PlateOCRQueue(ocr)
+    texts = queue.recognize_all([make_crop(), make_crop()])
+    assert texts == [('PLATE0', 0.9), ('PLATE0', 0.9)]
+    # The failed batch call never completed, so only the two per-crop calls count
+    assert ocr.calls == [2, 1, 1] and queue.ocr_calls == 2
+
+def test_mismatched_legacy_batch_counts_every_call():
+    ocr = FakeLegacyOCR(short_batches=True)
+    queue = PlateOCRQueue(ocr)
+    texts = queue.recognize_all([make_crop(), make_crop()])
+    assert texts == [('SINGLE', 0.7), ('SINGLE', 0.7)]
+    assert ocr.calls == ['batch', 'single', 'single'] and queue.ocr_calls == 3
+
+if __name__ == "__main__":
+    test_parse_paddleocr_3_pipeline_result()
+    test_parse_recognition_only_result()
+    test_parse_paddleocr_2_results()
+    test_parse_empty_results()
+    test_queue_batches_crops_in_order()
+    test_failed_batch_falls_back_to_predict_per_crop()
+    test_mismatched_legacy_batch_counts_every_call()
+    print("All plate OCR tests passed")
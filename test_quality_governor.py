@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for the runtime quality governor
+"""
+
+from pipeline.quality_governor import QualityGovernor, QUALITY_LEVELS, describe_level
+from pipeline.ocr_budget import TrackOCRBudget
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def run_checks(governor, clock, fps, count, latency=None):
+    """count checks of one second each at fps frames/sec read"""
+    frames = governor.frames_at_check
+    for _ in range(count):
+        clock.now += 1.0
+        frames += fps
+        if latency is not None:
+            governor.record_latency(latency)
+        governor.check(frames)
+
+def make_governor(clock, messages, **kwargs):
+    governor = QualityGovernor(check_interval=1.0, degrade_checks=2, recover_checks=3, log=messages.append,
+                               clock=clock, **kwargs)
+    governor.check(0)
+    return governor
+
+def test_degrades_after_consecutive_overloaded_checks():
+    clock, messages = FakeClock(), []
+    governor = make_governor(clock, messages, target_fps=25)
+    run_checks(governor, clock, 20, 1)
+    assert governor.level_index == 0
+    run_checks(governor, clock, 20, 1)
+    assert governor.level_index == 1
+    assert "degraded" in messages[-1] and "20.0 FPS < target 25.0" in messages[-1]
+
+def test_recovers_only_with_headroom():
+    clock, messages = FakeClock(), []
+    governor = make_governor(clock, messages, target_fps=25)
+    run_checks(governor, clock, 10, 4)
+    assert governor.level_index == 2
+    # Meeting the target without margin holds the level
+    run_checks(governor, clock, 26, 5)
+    assert governor.level_index == 2
+    run_checks(governor, clock, 40, 3)
+    assert governor.level_index == 1 and "recovered" in messages[-1]
+    stats = governor.stats()
+    assert stats['degradations'] == 2 and stats['recoveries'] == 1 and stats['level'] == QUALITY_LEVELS[1]['name']
+
+def test_latency_and_queue_targets():
+    clock, messages = FakeClock(), []
+    governor = make_governor(clock, messages, target_latency=0.5)
+    run_checks(governor, clock, 25, 2, latency=0.9)
+    assert governor.level_index == 1 and "p95 latency 900 ms" in messages[-1]
+    governor.evaluate(25, 0.1, 0.9, clock.now)
+    governor.evaluate(25, 0.1, 0.9, clock.now)
+    assert governor.level_index == 2 and "queues 90% full" in messages[-1]
+
+def test_stops_at_last_level_and_thins_frames():
+    clock, messages = FakeClock(), []
+    governor = make_governor(clock, messages, target_fps=25)
+    run_checks(governor, clock, 1, 40)
+    assert governor.level_index == len(QUALITY_LEVELS) - 1
+    stride = governor.level['frame_stride']
+    admitted = sum(governor.admit_frame() for _ in range(stride * 10))
+    assert admitted == 10
+    assert "1 of every" in describe_level(governor.level)
+    assert describe_level(QUALITY_LEVELS[0]) == "full coverage"
+
+def test_budget_without_rereads_skips_stable_tracks():
+    budget = TrackOCRBudget(stable_reads=1, reread_stable=False)
+    budget.should_ocr(7, (0, 0, 100, 20))
+    budget.record(7, "KA05MH4821", (0, 0, 100, 20), 10.0)
+    # A much bigger and sharper plate would normally be read again
+    assert not budget.should_ocr(7, (0, 0, 200, 40), 50.0)
+    budget.reread_stable = True
+    assert budget.should_ocr(7, (0, 0, 200, 40), 50.0)
+
+if __name__ == "__main__":
+    test_degrades_after_consecutive_overloaded_checks()
+    test_recovers_only_with_headroom()
+    test_latency_and_queue_targets()
+    test_stops_at_last_level_and_thins_frames()
+    test_budget_without_rereads_skips_stable_tracks()
+    print("All quality governor tests passed")
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Test script for per-camera regions of interest
+"""
+
+import numpy as np
+from pipeline.roi import RegionOfInterest
+
+def test_crop_covers_polygon_bounding_rectangle():
+    roi = RegionOfInterest([[0.0, 0.5], [1.0, 0.5], [1.0, 1.0], [0.0, 1.0]])
+    frame = np.zeros((600, 1020, 3), np.uint8)
+    crop = roi.apply(frame)
+    assert crop.shape[:2] == (300, 1020)
+    assert abs(roi.pixel_fraction() - 0.5) < 0.01
+
+def test_pixels_outside_polygon_are_blanked():
+    # Triangle over the lower-left half of the frame
+    roi = RegionOfInterest([[0.0, 0.0], [1.0, 1.0], [0.0, 1.0]], fill=(0, 0, 0))
+    frame = np.full((100, 100, 3), 255, np.uint8)
+    crop = roi.apply(frame)
+    assert crop[90, 5].tolist() == [255, 255, 255]
+    assert crop[5, 90].tolist() == [0, 0, 0]
+    # The input frame is left untouched for OCR crops
+    assert frame[5, 90].tolist() == [255, 255, 255]
+
+def test_boxes_map_back_to_frame_coordinates():
+    roi = RegionOfInterest([[0.25, 0.5], [0.75, 0.5], [0.75, 1.0], [0.25, 1.0]])
+    roi.apply(np.zeros((600, 1000, 3), np.uint8))
+    x, y = roi.rect[:2]
+    assert roi.to_frame([10, 20, 110, 60]) == [10 + x, 20 + y, 110 + x, 60 + y]
+
+if __name__ == "__main__":
+    test_crop_covers_polygon_bounding_rectangle()
+    test_pixels_outside_polygon_are_blanked()
+    test_boxes_map_back_to_frame_coordinates()
+    print("ROI tests completed!")
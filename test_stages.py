@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for the staged producer/consumer pipeline every stream runs on
+"""
+
+import itertools
+import threading
+import time
+from pipeline.stages import StagedPipeline
+
+def run_in_thread(pipeline, source, timeout=10):
+    """Run the pipeline and return True if it finished within timeout seconds"""
+    thread = threading.Thread(target=pipeline.run, args=(source,), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return not thread.is_alive()
+
+def test_end_marker_reaches_every_worker_and_stage():
+    collected = []
+    lock = threading.Lock()
+
+    def collect(item):
+        with lock:
+            collected.append(item)
+
+    pipeline = StagedPipeline()
+    pipeline.add_stage("double", lambda item: item * 2, maxsize=2, workers=3)
+    pipeline.add_stage("collect", collect, maxsize=2, workers=2)
+    assert run_in_thread(pipeline, range(50))
+    assert sorted(collected) == [item * 2 for item in range(50)]
+    metrics = pipeline.metrics()
+    assert metrics['double']['processed'] == 50 and metrics['collect']['processed'] == 50
+
+def test_stop_drains_full_queues_without_hanging():
+    stop = threading.Event()
+
+    def slow(item):
+        time.sleep(0.01)
+        return item
+
+    pipeline = StagedPipeline(should_stop=stop.is_set, poll_interval=0.01)
+    pipeline.add_stage("fast", lambda item: item, maxsize=2)
+    pipeline.add_stage("slow", slow, maxsize=2)
+    threading.Timer(0.2, stop.set).start()
+    # An endless source with a slow last stage keeps every queue full until the stop
+    assert run_in_thread(pipeline, itertools.count())
+    # Items still queued at the stop are dropped, not processed
+    assert pipeline.metrics()['slow']['processed'] < pipeline.source_items
+
+def test_drain_on_stop_stage_finishes_its_queue():
+    stop = threading.Event()
+    release = threading.Event()
+    alerted = []
+
+    def alert(item):
+        release.wait(5)
+        alerted.append(item)
+
+    pipeline = StagedPipeline(should_stop=stop.is_set, poll_interval=0.01)
+    pipeline.add_stage("ocr", lambda item: item, maxsize=2)
+    pipeline.add_stage("alert", alert, maxsize=4, drain_on_stop=True)
+    thread = threading.Thread(target=pipeline.run, args=(range(100),), daemon=True)
+    thread.start()
+    alert_queue = pipeline.stages[1].queue
+    deadline = time.time() + 5
+    while not alert_queue.full() and time.time() < deadline:
+        time.sleep(0.01)
+    assert alert_queue.full()
+    # Stop while the alert stage is busy with item 0 and has 1-4 queued
+    stop.set()
+    release.set()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert alerted[:5] == [0, 1, 2, 3, 4]
+    # Upstream items are still discarded
+    assert len(alerted) < 100
+
+def test_handler_errors_are_counted_and_reported():
+    errors = []
+
+    def fail_on_odd(item):
+        if item % 2:
+            raise ValueError(f"odd {item}")
+        return item
+
+    passed = []
+    pipeline = StagedPipeline(on_error=lambda stage, error: errors.append((stage, str(error))))
+    pipeline.add_stage("check", fail_on_odd)
+    pipeline.add_stage("collect", passed.append)
+    assert run_in_thread(pipeline, range(6))
+    assert passed == [0, 2, 4]
+    assert pipeline.metrics()['check']['errors'] == 3
+    assert errors == [("check", "odd 1"), ("check", "odd 3"), ("check", "odd 5")]
+
+def test_source_errors_are_reported():
+    errors = []
+
+    def broken_source():
+        yield 1
+        raise IOError("stream lost")
+
+    pipeline = StagedPipeline(on_error=lambda stage, error: errors.append(stage))
+    pipeline.add_stage("noop", lambda item: item)
+    assert run_in_thread(pipeline, broken_source())
+    assert errors == ["source"]
+
+def test_none_drops_the_item():
+    passed = []
+    pipeline = StagedPipeline()
+    pipeline.add_stage("filter", lambda item: item if item >= 3 else None)
+    pipeline.add_stage("collect", passed.append)
+    assert run_in_thread(pipeline, range(5))
+    assert passed == [3, 4]
+    assert pipeline.metrics()['collect']['processed'] == 2
+
+if __name__ == "__main__":
+    test_end_marker_reaches_every_worker_and_stage()
+    test_stop_drains_full_queues_without_hanging()
+    test_drain_on_stop_stage_finishes_its_queue()
+    test_handler_errors_are_counted_and_reported()
+    test_source_errors_are_reported()
+    test_none_drops_the_item()
+    print("All pipeline stage tests passed")
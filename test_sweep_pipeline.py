@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for the settings sweep's grid parsing and Pareto frontier
+"""
+
+from benchmarks.sweep_pipeline import (parse_grid, grid_settings, pareto_frontier, pick_settings, score_runs,
+                                       sweep_warnings)
+
+def point(name, f1, fps, latency):
+    return {'settings': name, 'f1': f1, 'fps': fps, 'alert_latency_p95_s': latency}
+
+def test_grid_values_and_combinations():
+    grid = parse_grid(["frame_skip=1,3", "frame_size=1020x600,640x360"])
+    assert grid['frame_skip'] == [1, 3]
+    assert grid['frame_size'] == [[1020, 600], [640, 360]]
+    assert len(grid_settings({'frame_skip': [1, 3], 'detection_conf': [0.3, 0.5, 0.7]})) == 6
+    assert parse_grid(["adaptive_sampling=true,False"])['adaptive_sampling'] == [True, False]
+
+def test_frontier_drops_dominated_points():
+    points = [point('accurate', 0.95, 10, 1.0), point('fast', 0.80, 40, 0.5),
+              point('worse', 0.80, 30, 0.6), point('balanced', 0.90, 25, 0.8)]
+    frontier = pareto_frontier(points)
+    assert [p['settings'] for p in frontier] == ['fast', 'balanced', 'accurate']
+
+def test_frontier_ignores_missing_latency():
+    points = [point('quiet', 0.9, 20, None), point('slower', 0.9, 10, 0.5)]
+    assert [p['settings'] for p in pareto_frontier(points)] == ['quiet']
+
+def test_pick_best_f1_meeting_min_fps():
+    frontier = pareto_frontier([point('accurate', 0.95, 10, 1.0), point('fast', 0.80, 40, 0.5),
+                                point('balanced', 0.90, 25, 0.8)])
+    assert pick_settings(frontier, 20)['settings'] == 'balanced'
+    assert pick_settings(frontier, 100)['settings'] == 'fast'
+
+def test_score_runs_sums_clips():
+    runs = [{'plates_read': 3, 'plates_rendered': 4, 'false_plates': ['XX00XX0000'], 'seconds': 1.0,
+             'frames': 50, 'ocr_calls': 10, 'alert_latency_p95_s': 0.4},
+            {'plates_read': 1, 'plates_rendered': 1, 'false_plates': [], 'seconds': 1.0,
+             'frames': 50, 'ocr_calls': 5, 'alert_latency_p95_s': None}]
+    score = score_runs(runs)
+    assert score['precision'] == 0.8 and score['recall'] == 0.8 and score['f1'] == 0.8
+    assert score['fps'] == 50.0 and score['alert_latency_p95_s'] == 0.4
+
+def test_warns_about_unknown_cameras_and_ineffective_frame_skip():
+    camera_keys = ['vid1', 'video4']
+    fixed_rate = [{'adaptive_sampling': False, 'frame_skip': 1}, {'adaptive_sampling': False, 'frame_skip': 3}]
+    assert sweep_warnings({'vid1'}, camera_keys, fixed_rate) == []
+    warnings = sweep_warnings({'vid1', 'synthetic-light'}, camera_keys, fixed_rate)
+    assert len(warnings) == 1 and warnings[0].startswith("camera(s) synthetic-light are")
+    adaptive = [dict(settings, adaptive_sampling=True) for settings in fixed_rate]
+    warnings = sweep_warnings({'vid1'}, camera_keys, adaptive)
+    assert len(warnings) == 1 and 'frame_skip' in warnings[0]
+
+if __name__ == "__main__":
+    test_grid_values_and_combinations()
+    test_frontier_drops_dominated_points()
+    test_frontier_ignores_missing_latency()
+    test_pick_best_f1_meeting_min_fps()
+    test_score_runs_sums_clips()
+    test_warns_about_unknown_cameras_and_ineffective_frame_skip()
+    print("All sweep tests passed")
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Test script for the throttled UI update channel
+"""
+
+import threading
+from pipeline.ui_channel import UIUpdateChannel
+
+def test_only_latest_progress_is_kept():
+    channel = UIUpdateChannel()
+    for frame_count in range(100):
+        channel.set_progress(frame_count=frame_count, total_frames=100)
+    update = channel.drain()
+    assert update['progress'] == {'frame_count': 99, 'total_frames': 100}
+    assert channel.drain()['progress'] is None
+
+def test_lines_from_many_threads_are_batched_in_order_per_thread():
+    channel = UIUpdateChannel(max_pending=10000)
+
+    def worker(name):
+        for index in range(500):
+            channel.add_log(f"{name} {index}")
+
+    threads = [threading.Thread(target=worker, args=(f"t{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logs = channel.drain()['logs']
+    assert len(logs) == 2000
+    assert [line for line in logs if line.startswith("t0 ")] == [f"t0 {index}" for index in range(500)]
+
+def test_backlog_is_capped():
+    channel = UIUpdateChannel(max_pending=3)
+    for index in range(5):
+        channel.add_detection(str(index))
+    update = channel.drain()
+    assert update['detections'] == ['2', '3', '4']
+    assert update['dropped'] == 2
+
+if __name__ == "__main__":
+    test_only_latest_progress_is_kept()
+    test_lines_from_many_threads_are_batched_in_order_per_thread()
+    test_backlog_is_capped()
+    print("All UI channel tests passed")
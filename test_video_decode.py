@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Test script for the video decode backends
+"""
+
+import os
+import tempfile
+import cv2
+import numpy as np
+from utils.video_decode import create_decoder
+
+def write_video(path, frames=20, size=(64, 48)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 10, size)
+    for index in range(frames):
+        writer.write(np.full((size[1], size[0], 3), index * 10, np.uint8))
+    writer.release()
+
+def test_skipped_frames_are_grabbed_but_not_decoded():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'clip.avi')
+        write_video(path)
+        for backend in ('sync', 'threaded'):
+            decoder = create_decoder(path, backend=backend, want_frame=lambda index: index % 4 == 0,
+                                     target_size=(32, 24), ring_size=2)
+            items = list(decoder)
+            decoder.release()
+            assert [index for index, _, _ in items] == [4, 8, 12, 16, 20]
+            assert all(frame.shape == (24, 32, 3) for _, frame, _ in items)
+            stats = decoder.stats()
+            assert stats['frames_grabbed'] == 20
+            assert stats['frames_decoded'] == 5
+
+def test_unknown_backend_is_rejected():
+    try:
+        create_decoder('clip.avi', backend='gpu')
+    except ValueError:
+        return
+    assert False, "expected ValueError"
+
+if __name__ == "__main__":
+    test_skipped_frames_are_grabbed_but_not_decoded()
+    test_unknown_backend_is_rejected()
+    print("All video decode tests passed")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming a video through fixed-size frame windows
+"""
+
+import os
+import tempfile
+import numpy as np
+from utils.video_utils import (iter_video_frames, iter_frame_windows, read_video, save_video, get_video_fps,
+                               VideoStreamWriter)
+
+def make_frame(index):
+    # Each frame is a flat gray level that identifies it even after lossy encoding
+    return np.full((48, 64, 3), 10 + index * 9, np.uint8)
+
+def frame_indexes(frames, reference):
+    """Index of the reference frame each frame is closest to in gray level"""
+    levels = np.array([frame.mean() for frame in reference])
+    return [int(np.abs(levels - frame.mean()).argmin()) for frame in frames]
+
+def test_windows_keep_order_and_the_short_tail():
+    windows = list(iter_frame_windows(range(10), 4))
+    assert windows == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert list(iter_frame_windows([], 4)) == []
+    assert list(iter_frame_windows(range(3), 0)) == [[0], [1], [2]]
+
+def test_video_streamed_in_windows_keeps_every_frame_in_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'source.avi')
+        save_video([make_frame(index) for index in range(25)], source, fps=20)
+        assert get_video_fps(source) == 20
+
+        output = os.path.join(tmp, 'output.avi')
+        window_sizes = []
+        with VideoStreamWriter(output, fps=20) as writer:
+            for window in iter_frame_windows(iter_video_frames(source), 4):
+                window_sizes.append(len(window))
+                for frame in window:
+                    writer.write(frame)
+            assert writer.frames_written == 25
+        assert window_sizes == [4, 4, 4, 4, 4, 4, 1]
+
+        frames = read_video(output)
+        assert len(frames) == 25 and frames[0].shape == (48, 64, 3)
+        assert frame_indexes(frames, read_video(source)) == list(range(25))
+
+def test_writer_without_frames_writes_nothing():
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, 'empty.avi')
+        with VideoStreamWriter(output) as writer:
+            pass
+        assert writer.frames_written == 0 and not os.path.exists(output)
+
+if __name__ == "__main__":
+    test_windows_keep_order_and_the_short_tail()
+    test_video_streamed_in_windows_keeps_every_frame_in_order()
+    test_writer_without_frames_writes_nothing()
+    print("All video utils tests passed")
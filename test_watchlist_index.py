@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for the fuzzy watch-list index
+"""
+
+import random
+import string
+from alerts.watchlist_index import WatchListIndex, edit_distance, normalize_plate
+
+def random_plate(rng):
+    return ''.join(rng.choice(string.ascii_uppercase) for _ in range(2)) + \
+           ''.join(rng.choice(string.digits) for _ in range(2)) + \
+           ''.join(rng.choice(string.ascii_uppercase) for _ in range(2)) + \
+           ''.join(rng.choice(string.digits) for _ in range(4))
+
+def test_exact_and_confusable_matches():
+    index = WatchListIndex(['R183JF', 'DL2CAT4762', 'HR26C06869'])
+    assert index.match('R183JF') == ('R183JF', 0)
+    # O/0, S/5, B/8 style OCR errors normalize to the same key
+    assert index.match('DL2CAT4762'.replace('2', 'Z')) == ('DL2CAT4762', 0)
+    assert index.match('HR26CO6869') == ('HR26C06869', 0)
+    assert index.match('R-183-JF') == ('R183JF', 0)
+
+def test_one_character_ocr_error():
+    index = WatchListIndex(['R183JF', 'N894JV', 'L656XH'], max_distance=1)
+    assert index.match('R183JK') == ('R183JF', 1)
+    assert index.match('N894J') == ('N894JV', 1)
+    assert index.match('X999ZZ') is None
+    assert index.match('R183JK', max_distance=0) is None
+
+def test_exact_index_rejects_other_valid_plates():
+    # The engine's default: only OCR-confusable characters match, never a different plate
+    index = WatchListIndex({'KA05MH4821'}, max_distance=0)
+    assert index.match('KA06MH4821') is None
+    assert index.match('KA05MH4827') is None
+    assert index.match('KAO5MH4821') == ('KA05MH4821', 0)
+
+def test_incremental_add_and_remove():
+    index = WatchListIndex(max_distance=1)
+    index.add('KA01AB1234')
+    assert 'KA01AB1234' in index
+    assert index.match('KA01AB1235') == ('KA01AB1234', 1)
+    index.remove('KA01AB1234')
+    assert 'KA01AB1234' not in index
+    assert index.match('KA01AB1235') is None
+    index.add('KA01AB1234')
+    assert index.match('KA01AB1234') == ('KA01AB1234', 0)
+
+def test_matches_linear_scan_on_large_list():
+    rng = random.Random(7)
+    plates = list({random_plate(rng) for _ in range(2000)})
+    index = WatchListIndex(plates, max_distance=1)
+    for probe in plates[:25] + [random_plate(rng) for _ in range(25)]:
+        expected = sorted(p for p in plates if edit_distance(normalize_plate(probe), normalize_plate(p)) <= 1)
+        assert sorted(p for p, _ in index.candidates(probe)) == expected
+
+if __name__ == "__main__":
+    test_exact_and_confusable_matches()
+    test_one_character_ocr_error()
+    test_exact_index_rejects_other_valid_plates()
+    test_incremental_add_and_remove()
+    test_matches_linear_scan_on_large_list()
+    print("Watch-list index tests completed!")
@@ -0,0 +1,4 @@
+from .video_utils import (read_video, save_video, iter_video_frames, iter_frame_windows,
+                          get_video_fps, VideoStreamWriter)
+from .video_decode import VideoDecoder, ThreadedVideoDecoder, LiveStreamDecoder, create_decoder
+from .live_stream import FakeLiveCapture, is_live_source
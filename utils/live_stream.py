@@ -0,0 +1,82 @@
+#Import All the Required Libraries
+import cv2
+import time
+from urllib.parse import parse_qs
+
+# Source prefixes that are read as live streams rather than files
+LIVE_PREFIXES = ('rtsp://', 'rtsps://', 'rtmp://', 'udp://', 'tcp://', 'http://', 'https://', 'fake://')
+
+def is_live_source(source):
+    """True for stream URLs, camera indices and fake:// test streams"""
+    if isinstance(source, int):
+        return True
+    source = str(source).strip()
+    return source.isdigit() or source.lower().startswith(LIVE_PREFIXES)
+
+class FakeLiveCapture:
+    """VideoCapture look-alike that replays a local file as a live camera
+
+    The file is looped forever and frames are released at the file's frame rate (or fps);
+    a reader that falls behind gets a growing backlog of stale frames, as on a real stream.
+    With fail_after the connection "drops" after that many frames, to exercise reconnects.
+    Sources are opened through open_fake_capture('fake://path/to/video.mp4?fail_after=100').
+    """
+    def __init__(self, path, fps=None, fail_after=None, clock=time.monotonic, sleep=time.sleep):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        self.fps = fps or self.cap.get(cv2.CAP_PROP_FPS) or 25.0
+        self.fail_after = fail_after
+        self.clock = clock
+        self.sleep = sleep
+        self.started = None
+        self.frames_served = 0
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            # Live streams have no length
+            return 0
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        return self.cap.get(prop)
+
+    def grab(self):
+        if self.fail_after is not None and self.frames_served >= self.fail_after:
+            return False
+        if self.started is None:
+            self.started = self.clock()
+        # Like a network buffer, frames a slow reader missed are still served, just late
+        wait = (self.frames_served + 1) / self.fps - (self.clock() - self.started)
+        if wait > 0:
+            self.sleep(wait)
+        if not self._grab_looped():
+            return False
+        self.frames_served += 1
+        return True
+
+    def _grab_looped(self):
+        if self.cap.grab():
+            return True
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return self.cap.grab()
+
+    def retrieve(self):
+        return self.cap.retrieve()
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def release(self):
+        self.cap.release()
+
+def open_fake_capture(url):
+    """Open a fake://path[?fps=N&fail_after=N] URL as a FakeLiveCapture"""
+    path, _, query = url[len('fake://'):].partition('?')
+    options = {key: float(values[-1]) for key, values in parse_qs(query).items()}
+    fail_after = options.get('fail_after')
+    return FakeLiveCapture(path, fps=options.get('fps'),
+                           fail_after=int(fail_after) if fail_after is not None else None)
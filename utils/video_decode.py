@@ -0,0 +1,304 @@
+#Import All the Required Libraries
+import cv2
+import threading
+import time
+from collections import deque
+from utils.live_stream import open_fake_capture
+
+def open_capture(source, hw_accel=False):
+    """Open a VideoCapture, asking FFmpeg for hardware decoding when hw_accel is set and supported
+    
+    Digit strings open the camera with that index; fake:// URLs replay a file as a live stream.
+    """
+    source = str(source)
+    if source.startswith('fake://'):
+        return open_fake_capture(source)
+    if source.isdigit():
+        return cv2.VideoCapture(int(source))
+    if hw_accel and hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+        cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG,
+                               [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+        if cap.isOpened():
+            return cap
+        cap.release()
+    return cv2.VideoCapture(source)
+
+class VideoDecoder:
+    """Decodes a video file or stream in the caller's thread
+
+    Iterating yields (frame_index, frame, decoded_at) for the frames want_frame(frame_index)
+    asks for; decoded_at is the time.time() the frame was decoded. Every other frame is only
+    grabbed (demuxed), never decoded into an image. Frames are resized to target_size, if
+    given, right after decoding. observe(stage, seconds), if given, receives the time of
+    every grab, decode and resize.
+    """
+    def __init__(self, source, want_frame=None, target_size=None, hw_accel=False, observe=None):
+        self.source = source
+        self.want_frame = want_frame or (lambda frame_index: True)
+        self.target_size = target_size
+        self.observe = observe
+        self.cap = open_capture(source, hw_accel)
+        self.frames_grabbed = 0
+        self.frames_decoded = 0
+
+    def is_opened(self):
+        return self.cap.isOpened()
+
+    @property
+    def frame_count(self):
+        """Frames in the file, or 0 for streams that do not report a length"""
+        return max(0, int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+
+    @property
+    def fps(self):
+        return self.cap.get(cv2.CAP_PROP_FPS)
+
+    def start(self):
+        return self
+
+    def next_frame(self):
+        """Return the next wanted (frame_index, frame, decoded_at), or None at the end of the source"""
+        while True:
+            started = time.perf_counter()
+            if not self.cap.grab():
+                return None
+            grabbed = time.perf_counter()
+            self.frames_grabbed += 1
+            frame_index = self.frames_grabbed
+            if not self.want_frame(frame_index):
+                if self.observe is not None:
+                    self.observe('grab', grabbed - started)
+                continue
+            ret, frame = self.cap.retrieve()
+            if not ret:
+                return None
+            self.frames_decoded += 1
+            decoded_at = time.time()
+            decoded = time.perf_counter()
+            if self.target_size is not None:
+                frame = cv2.resize(frame, self.target_size)
+            if self.observe is not None:
+                self.observe('grab', grabbed - started)
+                self.observe('decode', decoded - grabbed)
+                if self.target_size is not None:
+                    self.observe('resize', time.perf_counter() - decoded)
+            return frame_index, frame, decoded_at
+
+    def __iter__(self):
+        while True:
+            item = self.next_frame()
+            if item is None:
+                return
+            yield item
+
+    def release(self):
+        self.cap.release()
+
+    def stats(self):
+        return {
+            'frames_grabbed': self.frames_grabbed,
+            'frames_decoded': self.frames_decoded,
+            'decode_rate': self.frames_decoded / self.frames_grabbed if self.frames_grabbed else 0.0
+        }
+
+class ThreadedVideoDecoder(VideoDecoder):
+    """VideoDecoder running on a background thread that fills a ring buffer of decoded frames
+
+    With drop_oldest the oldest buffered frame is discarded when the buffer is full (live
+    sources, where the newest frame matters); otherwise decoding waits for the consumer.
+    """
+    def __init__(self, source, want_frame=None, target_size=None, hw_accel=False, observe=None, ring_size=16,
+                 drop_oldest=False):
+        super().__init__(source, want_frame=want_frame, target_size=target_size, hw_accel=hw_accel,
+                         observe=observe)
+        self.ring_size = max(1, int(ring_size))
+        self.drop_oldest = drop_oldest
+        self.ring = deque()
+        self.condition = threading.Condition()
+        self.finished = False
+        self.stopped = False
+        self.frames_dropped = 0
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._decode_loop, name="video-decode", daemon=True)
+            self.thread.start()
+        return self
+
+    def _decode_loop(self):
+        try:
+            while not self.stopped:
+                item = self.next_frame()
+                if item is None:
+                    break
+                with self.condition:
+                    while len(self.ring) >= self.ring_size and not self.drop_oldest and not self.stopped:
+                        self.condition.wait(0.1)
+                    if len(self.ring) >= self.ring_size:
+                        self.ring.popleft()
+                        self.frames_dropped += 1
+                    self.ring.append(item)
+                    self.condition.notify_all()
+        finally:
+            with self.condition:
+                self.finished = True
+                self.condition.notify_all()
+
+    def __iter__(self):
+        self.start()
+        while True:
+            with self.condition:
+                while not self.ring and not self.finished:
+                    self.condition.wait(0.1)
+                if not self.ring:
+                    return
+                item = self.ring.popleft()
+                self.condition.notify_all()
+            yield item
+
+    def buffered(self):
+        return len(self.ring)
+
+    def release(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+        self.cap.release()
+
+    def stats(self):
+        stats = super().stats()
+        stats['frames_dropped'] = self.frames_dropped
+        return stats
+
+class LiveStreamDecoder(VideoDecoder):
+    """Decoder for live cameras and stream URLs where only the newest frame matters
+
+    A reader thread keeps grabbing so the capture's buffer never fills with stale frames,
+    and holds just the latest decoded frame; a frame replaced before the consumer took it
+    is counted as dropped. When the stream is lost the capture is reopened, waiting
+    reconnect_delay seconds and doubling up to max_reconnect_delay; with max_reconnects set
+    the stream ends after that many failed attempts in a row. Frame indices keep counting
+    across reconnects.
+    """
+    def __init__(self, source, want_frame=None, target_size=None, hw_accel=False, observe=None,
+                 reconnect_delay=1.0, max_reconnect_delay=30.0, max_reconnects=None, should_stop=None):
+        super().__init__(source, want_frame=want_frame, target_size=target_size, hw_accel=hw_accel,
+                         observe=observe)
+        self.hw_accel = hw_accel
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.max_reconnects = max_reconnects
+        self.should_stop = should_stop or (lambda: False)
+        self.condition = threading.Condition()
+        self.latest = None
+        self.finished = False
+        self.stopped = False
+        self.frames_dropped = 0
+        self.reconnects = 0
+        self.thread = None
+
+    @property
+    def frame_count(self):
+        return 0
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._read_loop, name="live-decode", daemon=True)
+            self.thread.start()
+        return self
+
+    def _is_stopping(self):
+        return self.stopped or self.should_stop()
+
+    def _read_loop(self):
+        try:
+            while not self._is_stopping():
+                item = self.next_frame()
+                if item is None:
+                    if not self._reconnect():
+                        break
+                    continue
+                with self.condition:
+                    if self.latest is not None:
+                        self.frames_dropped += 1
+                    self.latest = item
+                    self.condition.notify_all()
+        finally:
+            with self.condition:
+                self.finished = True
+                self.condition.notify_all()
+
+    def _reconnect(self):
+        """Reopen a lost stream; return False if it should be given up"""
+        delay = self.reconnect_delay
+        failures = 0
+        while not self._is_stopping():
+            self.cap.release()
+            deadline = time.monotonic() + delay
+            while time.monotonic() < deadline and not self._is_stopping():
+                time.sleep(min(0.1, delay))
+            if self._is_stopping():
+                return False
+            self.cap = open_capture(self.source, self.hw_accel)
+            if self.cap.isOpened():
+                self.reconnects += 1
+                return True
+            failures += 1
+            if self.max_reconnects is not None and failures >= self.max_reconnects:
+                return False
+            delay = min(delay * 2, self.max_reconnect_delay)
+        return False
+
+    def __iter__(self):
+        self.start()
+        while True:
+            with self.condition:
+                while self.latest is None and not self.finished and not self._is_stopping():
+                    self.condition.wait(0.1)
+                if self.latest is None:
+                    return
+                item, self.latest = self.latest, None
+            yield item
+
+    def release(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+        self.cap.release()
+
+    def stats(self):
+        stats = super().stats()
+        stats['frames_dropped'] = self.frames_dropped
+        stats['reconnects'] = self.reconnects
+        return stats
+
+# Decode backends selectable by name
+DECODE_BACKENDS = {
+    'sync': VideoDecoder,
+    'threaded': ThreadedVideoDecoder,
+    'live': LiveStreamDecoder
+}
+
+# Options only some backends take
+BACKEND_OPTIONS = {
+    'threaded': ('ring_size', 'drop_oldest'),
+    'live': ('reconnect_delay', 'max_reconnect_delay', 'max_reconnects', 'should_stop')
+}
+
+def create_decoder(source, backend='threaded', **kwargs):
+    """Create a decoder for source with the named backend ('sync', 'threaded' or 'live')
+    
+    Options meant for another backend are ignored, so callers can pass one set of settings.
+    """
+    if backend not in DECODE_BACKENDS:
+        raise ValueError(f"Unknown decode backend '{backend}', expected one of {sorted(DECODE_BACKENDS)}")
+    for other, options in BACKEND_OPTIONS.items():
+        if other != backend:
+            for option in options:
+                kwargs.pop(option, None)
+    return DECODE_BACKENDS[backend](source, **kwargs)
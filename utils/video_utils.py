@@ -0,0 +1,71 @@
+#Import All the Required Libraries
+import cv2
+
+def read_video(video_path):
+    """Read every frame of a video into a list"""
+    return list(iter_video_frames(video_path))
+
+def iter_video_frames(video_path):
+    """Yield the frames of a video one at a time instead of loading them all"""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame
+    finally:
+        cap.release()
+
+def iter_frame_windows(frames, window_size):
+    """Group any frame iterable into lists of at most window_size frames"""
+    window_size = max(1, int(window_size))
+    window = []
+    for frame in frames:
+        window.append(frame)
+        if len(window) == window_size:
+            yield window
+            window = []
+    if window:
+        yield window
+
+def get_video_fps(video_path, default=24):
+    """Return the FPS stored in the video container, or default when unknown"""
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    cap.release()
+    return fps if fps and fps > 0 else default
+
+def save_video(output_video_frames, output_video_path, fps=24):
+    """Write a list of frames to a video file"""
+    with VideoStreamWriter(output_video_path, fps=fps) as writer:
+        for frame in output_video_frames:
+            writer.write(frame)
+
+class VideoStreamWriter:
+    """Incremental video writer; the frame size is taken from the first frame written"""
+    def __init__(self, output_video_path, fps=24, fourcc='XVID'):
+        self.output_video_path = output_video_path
+        self.fps = fps
+        self.fourcc = cv2.VideoWriter_fourcc(*fourcc)
+        self.writer = None
+        self.frames_written = 0
+
+    def write(self, frame):
+        if self.writer is None:
+            height, width = frame.shape[:2]
+            self.writer = cv2.VideoWriter(self.output_video_path, self.fourcc, self.fps, (width, height))
+        self.writer.write(frame)
+        self.frames_written += 1
+
+    def release(self):
+        if self.writer is not None:
+            self.writer.release()
+            self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False